@@ -0,0 +1,26 @@
+import importlib.util
+import os
+import resource
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from monitor.standin_server import LocalServer, refused_url  # noqa: E402,F401
+
+
+def load_script(filename, module_name=None):
+    """Importa um dos scripts da raiz (site-manager.py, fcfs-manager.py...) como módulo."""
+    path = os.path.join(ROOT_DIR, filename)
+    module_name = module_name or os.path.splitext(filename)[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def peak_rss_mb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / 1024 if sys.platform != "darwin" else usage / (1024 * 1024)
@@ -0,0 +1,84 @@
+"""
+Simulação (tempo virtual) de uma hora de checagens: agenda fixa versus
+monitor/adaptive.py. Sites estáveis ficam sempre 200; uma fração alterna
+entre 200 e 500 em momentos aleatórios. Mede checagens feitas e o atraso
+até a mudança de status ser vista (o custo do backoff).
+
+    python benchmarks/bench_adaptive.py --sites 1000 --flapping 0.05
+"""
+import argparse
+import heapq
+import random
+
+from _common import ROOT_DIR  # noqa: F401  (coloca a raiz no sys.path)
+from monitor.adaptive import AdaptiveIntervals
+
+
+def _status_timeline(rng, flapping, duration, mean_flip):
+    """Lista de (instante, status) em que o status do site muda."""
+    changes = [(0.0, 200)]
+    if flapping:
+        t = rng.expovariate(1 / mean_flip)
+        while t < duration:
+            changes.append((t, 500 if changes[-1][1] == 200 else 200))
+            t += rng.expovariate(1 / mean_flip)
+    return changes
+
+
+def _status_at(changes, t):
+    status = changes[0][1]
+    for when, value in changes:
+        if when > t:
+            break
+        status = value
+    return status
+
+
+def simulate(adaptive, sites, args):
+    heap = [(0.0, i) for i in range(len(sites))]
+    heapq.heapify(heap)
+    checks = 0
+    seen = [None] * len(sites)
+    delays = []
+    while heap:
+        t, i = heapq.heappop(heap)
+        if t > args.duration:
+            continue
+        changes = sites[i]
+        status = _status_at(changes, t)
+        checks += 1
+        if seen[i] is not None and status != seen[i]:
+            changed_at = max(when for when, value in changes if when <= t)
+            delays.append(t - changed_at)
+        seen[i] = status
+        interval = adaptive.observe(i, status, 0.05, now=t) if adaptive else args.interval
+        heapq.heappush(heap, (t + interval, i))
+    return checks, delays
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sites", type=int, default=1000)
+    parser.add_argument("--flapping", type=float, default=0.05)
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--max-interval", type=float, default=60.0)
+    parser.add_argument("--duration", type=float, default=3600.0)
+    parser.add_argument("--mean-flip", type=float, default=300.0, help="segundos médios entre mudanças de um site instável")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    flapping = int(args.sites * args.flapping)
+    sites = [_status_timeline(rng, i < flapping, args.duration, args.mean_flip) for i in range(args.sites)]
+
+    print(f"{'agenda':<12} {'checagens':>10} {'mudanças vistas':>16} {'atraso médio(s)':>16} {'atraso máx(s)':>14}")
+    for label, adaptive in (("fixa", None), ("adaptativa", AdaptiveIntervals(args.interval, args.max_interval))):
+        checks, delays = simulate(adaptive, sites, args)
+        avg = sum(delays) / len(delays) if delays else 0.0
+        print(f"{label:<12} {checks:>10} {len(delays):>16} {avg:>16.2f} {max(delays, default=0.0):>14.2f}")
+        if adaptive:
+            stats = adaptive.stats()
+            print(f"economia estimada pelo próprio contador: {stats['saved']:.0f} ({stats['saved_ratio']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
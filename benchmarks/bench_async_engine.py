@@ -0,0 +1,96 @@
+"""
+Compara o ThreadPoolExecutor + requests (check_status) com o motor asyncio
+(check_status_async) do site-manager.py contra um servidor local.
+
+    python benchmarks/bench_async_engine.py --sizes 100,1000,10000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from _common import LocalServer, load_script, peak_rss_mb
+
+
+def _count_results(manager):
+    return sum(q.qsize() for q in (manager.success_queue, manager.warning_queue, manager.error_queue))
+
+
+def _run_once(mode, sites, max_threads, concurrency):
+    os.chdir(tempfile.mkdtemp(prefix="bench-async-"))
+    site_manager = load_script("site-manager.py")
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager = site_manager.SiteManager(sites)
+
+    peak_threads = threading.active_count()
+    sampling = threading.Event()
+
+    def sample_threads():
+        nonlocal peak_threads
+        while not sampling.is_set():
+            peak_threads = max(peak_threads, threading.active_count())
+            time.sleep(0.01)
+
+    sampler = threading.Thread(target=sample_threads, daemon=True)
+    sampler.start()
+
+    t_wall = time.perf_counter()
+    t_cpu = time.process_time()
+    if mode == "threads":
+        with ThreadPoolExecutor(max_workers=min(len(sites), max_threads)) as executor:
+            wait([executor.submit(manager.check_status, site) for site in sites])
+    else:
+        engine = site_manager.AsyncCheckEngine(max_concurrency=concurrency)
+        engine.start()
+        try:
+            wait([engine.submit(manager.check_status_async, site) for site in sites])
+        finally:
+            engine.stop()
+    wall = time.perf_counter() - t_wall
+    cpu = time.process_time() - t_cpu
+
+    sampling.set()
+    sampler.join()
+    errors = manager.error_queue.qsize()
+    return {
+        "mode": mode,
+        "sites": len(sites),
+        "results": _count_results(manager),
+        "errors": errors,
+        "wall": wall,
+        "cpu": cpu,
+        "checks_per_sec": len(sites) / wall if wall else 0.0,
+        "peak_threads": peak_threads - 1,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--delay", type=float, default=0.05, help="latência simulada por checagem (s)")
+    parser.add_argument("--max-threads", type=int, default=1000, help="teto de threads do modo threads")
+    parser.add_argument("--concurrency", type=int, default=1000, help="checagens simultâneas no modo asyncio")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    with LocalServer() as server:
+        print(f"{'modo':<8} {'sites':>6} {'ok':>6} {'erros':>6} {'tempo(s)':>9} {'checks/s':>9} {'cpu(s)':>7} {'threads':>8} {'rss(MB)':>8}")
+        for size in sizes:
+            sites = [server.url(f"/delay/{args.delay}?i={i}") for i in range(size)]
+            for mode in ("threads", "asyncio"):
+                with ProcessPoolExecutor(max_workers=1) as runner:
+                    r = runner.submit(_run_once, mode, sites, args.max_threads, args.concurrency).result()
+                print(
+                    f"{r['mode']:<8} {r['sites']:>6} {r['results'] - r['errors']:>6} {r['errors']:>6} "
+                    f"{r['wall']:>9.2f} {r['checks_per_sec']:>9.0f} {r['cpu']:>7.2f} "
+                    f"{r['peak_threads']:>8} {r['peak_rss_mb']:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Tamanho em disco e vazão de parse do formato texto (LogEntry.from_file_str)
+versus o formato binário de monitor/binlog.py.
+
+    python benchmarks/bench_binlog.py --records 200000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from _common import load_script
+from monitor.binlog import BinaryLogEncoder, iter_binary_file
+
+
+def _records(count, sites=500, seed=7):
+    rng = random.Random(seed)
+    base = time.time()
+    for i in range(count):
+        site = f"https://httpbin.org/status/{rng.choice((200, 404, 500))}?site={i % sites}"
+        roll = rng.random()
+        if roll < 0.7:
+            status, message = 200, f"Online - {rng.uniform(0.01, 3):.3f}s"
+        elif roll < 0.85:
+            status, message = 404, f"Client Error (404) - {rng.uniform(0.01, 1):.3f}s"
+        elif roll < 0.95:
+            status, message = 503, f"Server Error (503) - {rng.uniform(0.01, 1):.3f}s"
+        else:
+            status, message = "Conn Error", "Connection Error"
+        yield base + i * 0.001, status, site, message
+
+
+def _throughput(label, count, seconds, size=None):
+    size_str = f"{size / 1024 / 1024:>9.2f}" if size is not None else f"{'':>9}"
+    print(f"{label:<30} {size_str} {count / seconds:>14,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-binlog-")
+    os.chdir(workdir)
+    site_manager = load_script("site-manager.py")
+    text_path = os.path.join(workdir, "status.log")
+    binary_path = os.path.join(workdir, "status.bin")
+
+    encoder = BinaryLogEncoder()
+    with open(text_path, "w") as ftext, open(binary_path, "wb") as fbin:
+        for timestamp, status, site, message in _records(args.records):
+            ftext.write(f"{timestamp}|{status}|{site}|{message}\n")
+            fbin.write(encoder.encode(timestamp, status, site, message))
+    text_size = os.path.getsize(text_path)
+    binary_size = os.path.getsize(binary_path)
+
+    print(f"{'formato':<30} {'MB':>9} {'registros/s':>14}")
+
+    t0 = time.perf_counter()
+    with open(text_path) as f:
+        count = sum(1 for line in f if site_manager.LogEntry.from_file_str(line))
+    _throughput("texto -> LogEntry", count, time.perf_counter() - t0, text_size)
+
+    t0 = time.perf_counter()
+    count = sum(1 for _ in map(site_manager.LogEntry.from_record, iter_binary_file(binary_path)))
+    _throughput("binário -> LogEntry", count, time.perf_counter() - t0, binary_size)
+
+    t0 = time.perf_counter()
+    count = sum(1 for _ in iter_binary_file(binary_path))
+    _throughput("binário -> tuplas", count, time.perf_counter() - t0)
+
+    print(f"Tamanho binário/texto: {binary_size / text_size:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Ciclos de checagens pelo SessionPool sem cache de DNS (ttl 0) e com o DnsCache
+de monitor/dns_cache.py. Os hosts site-N.test apontam para o servidor local e
+os nx-N.test não existem (NXDOMAIN); o resolver simulado soma --resolve-ms a
+cada consulta, como um resolver de rede. Conta as consultas feitas ao
+resolver e o tempo total dos ciclos.
+
+    python benchmarks/bench_dns_cache.py --hosts 20 --nxdomain 5 --cycles 10
+"""
+import argparse
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+from _common import LocalServer
+from monitor.dns_cache import DnsCache
+from monitor.http_pool import SessionPool
+
+
+def _fake_resolver(delay, calls):
+    def getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+        calls.append(host)
+        time.sleep(delay)
+        if host.startswith("nx-"):
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return socket.getaddrinfo("127.0.0.1", port, family, type, proto, flags)
+    return getaddrinfo
+
+
+def run(label, cache, calls, urls, args):
+    # novas conexões a cada ciclo, como sites com keep-alive expirado
+    t_start = time.perf_counter()
+    for _ in range(args.cycles):
+        if args.prefetch:
+            cache.prefetch(urls)
+        pool = SessionPool(pool_size=args.threads, dns_cache=cache)
+
+        def one(url):
+            try:
+                pool.probe(url, timeout=5)
+            except requests.exceptions.RequestException:
+                pass
+
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            list(executor.map(one, urls))
+        pool.close()
+    wall = time.perf_counter() - t_start
+    print(f"{label:<18} {wall:>9.2f} {len(calls):>12} {wall / (args.cycles * len(urls)) * 1000:>12.2f}")
+    print(f"  {cache.format_stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--nxdomain", type=int, default=5)
+    parser.add_argument("--urls-per-host", type=int, default=4)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--resolve-ms", type=float, default=20.0)
+    parser.add_argument("--prefetch", action="store_true", help="pré-resolve os hosts antes de cada ciclo")
+    args = parser.parse_args()
+
+    with LocalServer() as server:
+        port = urlsplit(server.url("/")).port
+        urls = [
+            f"http://site-{h}.test:{port}/status/200?u={u}"
+            for h in range(args.hosts) for u in range(args.urls_per_host)
+        ] + [f"http://nx-{h}.test:{port}/" for h in range(args.nxdomain)]
+
+        print(f"{'modo':<18} {'tempo(s)':>9} {'consultas DNS':>12} {'ms/checagem':>12}")
+        for label, ttl, negative_ttl in (("sem cache", 0, 0), ("cache", 300, 30)):
+            calls = []
+            cache = DnsCache(ttl=ttl, negative_ttl=negative_ttl, resolver=_fake_resolver(args.resolve_ms / 1000, calls))
+            run(label, cache, calls, urls, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Custo de um ciclo do agendador prioritário do site-manager.py e tempo máximo
+com lock, lendo/truncando os arquivos de log ("files") versus consumindo os
+segmentos em memória ("segments"), para volumes crescentes por ciclo.
+
+    python benchmarks/bench_handoff.py --volumes 1000,10000,100000
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+
+from _common import load_script
+
+CATEGORIES = ("success", "warning", "error")
+
+
+def run_cycle(site_manager, mode, volume):
+    site_manager.HANDOFF_MODE = mode
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager = site_manager.SiteManager([])
+
+    now = datetime.datetime.now()
+    files = {
+        "success": site_manager.SUCCESS_LOG_FILE,
+        "warning": site_manager.WARNING_LOG_FILE,
+        "error": site_manager.ERROR_LOG_FILE,
+    }
+    per_category = volume // len(CATEGORIES)
+    for category in CATEGORIES:
+        entries = [
+            site_manager.LogEntry(f"https://site-{i % 500}.example", 200, "Online - 0.120s", now)
+            for i in range(per_category)
+        ]
+        if mode == "segments":
+            manager.handoffs[category].append_many(entries)
+        else:
+            with open(files[category], "a") as f:
+                f.writelines(entry.to_file_str() + "\n" for entry in entries)
+
+    manager._priority_cycle()
+    return manager.priority_cycle_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--volumes", default="1000,10000,100000")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench-handoff-"))
+    site_manager = load_script("site-manager.py")
+    print(f"{'modo':<9} {'entradas':>9} {'ciclo(ms)':>10} {'us/entrada':>11} {'lock(ms)':>10}")
+    for volume in (int(v) for v in args.volumes.split(",")):
+        for mode in ("files", "segments"):
+            stats = run_cycle(site_manager, mode, volume)
+            entries = stats["entries"] or 1
+            print(
+                f"{mode:<9} {stats['entries']:>9} {stats['cycle_seconds'] * 1000:>10.1f} "
+                f"{stats['cycle_seconds'] / entries * 1e6:>11.2f} {stats['lock_hold_seconds'] * 1000:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Histórico em SQLite (monitor/history.py): vazão de gravação com três threads
+entregando lotes como as escritoras do site-manager.py (resultados por
+minuto, com os rollups de 1m/1h atualizados na mesma transação), quanto um
+add_many() segura a thread escritora e o tempo das consultas por site e
+intervalo: resultados brutos de 1 hora pelo índice (site_id, ts) contra a
+mesma consulta varrendo a tabela, e rollups de 1 minuto e de 1 hora.
+
+    python benchmarks/bench_history.py --sites 1000 --results 600000
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from _common import ROOT_DIR  # noqa: F401  (coloca a raiz no sys.path)
+from monitor.history import CATEGORIES, HistoryStore
+from monitor.latency import QuantileSketch, format_summary
+
+STATUSES = {"success": 200, "warning": 404, "error": 500}
+
+
+def _writer(store, sites, count, batch_size, span, seed, add_times):
+    rng = random.Random(seed)
+    now = time.time()
+    sent = 0
+    while sent < count:
+        batch = []
+        for _ in range(min(batch_size, count - sent)):
+            category = rng.choice(CATEGORIES)
+            batch.append((rng.choice(sites), now - rng.random() * span, STATUSES[category], rng.random(), category))
+        started = time.perf_counter()
+        store.add_many(batch)
+        add_times.add(time.perf_counter() - started)
+        sent += len(batch)
+
+
+def _time_queries(run, sites, repeats, rng):
+    sketch = QuantileSketch()
+    rows = 0
+    for _ in range(repeats):
+        site = rng.choice(sites)
+        started = time.perf_counter()
+        rows += len(run(site))
+        sketch.add(time.perf_counter() - started)
+    return f"{format_summary(sketch.summary())} | ~{rows / repeats:.0f} linhas"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sites", type=int, default=1000)
+    parser.add_argument("--results", type=int, default=600000)
+    parser.add_argument("--batch", type=int, default=256, help="entradas por add_many (lote de uma escritora)")
+    parser.add_argument("--hours", type=float, default=6.0, help="intervalo coberto pelos resultados")
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-history-"), "history.db")
+    sites = [f"https://site-{i}.example/status" for i in range(args.sites)]
+    store = HistoryStore(path)
+    add_times = QuantileSketch()
+    per_thread = args.results // 3
+    threads = [
+        threading.Thread(target=_writer, args=(store, sites, per_thread, args.batch, args.hours * 3600, seed, add_times))
+        for seed in range(3)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.flush()
+    elapsed = time.perf_counter() - started
+    written = store.results_written
+    print(f"Gravação: {written} resultados em {elapsed:.1f}s = {written / elapsed * 60:,.0f} resultados/min "
+          f"({store.transactions} transações, {os.path.getsize(path) / 2**20:.0f} MiB)")
+    print(f"  add_many na thread escritora: {format_summary(add_times.summary())}")
+
+    rng = random.Random(7)
+    now = time.time()
+    hour = (now - 3 * 3600, now - 2 * 3600)
+    scan = store._reader()
+    span = (now - args.hours * 3600, now)
+    print("Consultas por site:")
+    queries = [
+        ("brutos, 1h (índice)", lambda site: store.query(site, *hour), args.queries),
+        ("brutos, 1h (varredura)", lambda site: scan.execute(
+            "SELECT ts, status FROM results NOT INDEXED WHERE site_id = (SELECT id FROM sites WHERE name = ?) "
+            "AND ts >= ? AND ts < ?", (site, *hour)
+        ).fetchall(), max(1, args.queries // 10)),
+        (f"rollup 1m, {args.hours:g}h", lambda site: store.rollup(site, *span, "1m"), args.queries),
+        (f"rollup 1h, {args.hours:g}h", lambda site: store.rollup(site, *span, "1h"), args.queries),
+    ]
+    for label, run, repeats in queries:
+        print(f"  {label:<24}: {_time_queries(run, sites, repeats, rng)}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Um ciclo que dispara todos os sites de uma vez (como as variantes fazem)
+versus o HostDispatcher de monitor/host_dispatch.py. Um host concentra
+vários sites (como httpbin.org) e limita a vazão: acima de --throttle-at
+conexões simultâneas, cada conexão extra soma --penalty à latência de todas.
+A checagem é simulada com sleep. Mede o pico de conexões no host cheio, a
+latência medida por grupo de hosts e a duração dos ciclos.
+
+    python benchmarks/bench_host_dispatch.py --heavy-sites 12 --light-hosts 12 --cycles 5
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from _common import ROOT_DIR  # noqa: F401  (coloca a raiz no sys.path)
+from monitor.host_dispatch import HostDispatcher, pass_through_submit
+from monitor.latency import QuantileSketch, format_summary
+
+
+class _ThrottledHosts:
+    def __init__(self, args):
+        self.args = args
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+        self.latency = {"cheio": QuantileSketch(), "outros": QuantileSketch()}
+
+    def check(self, site):
+        host = site.split("/")[2]
+        with self.lock:
+            active = self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), active)
+        excess = max(0, active - self.args.throttle_at)
+        elapsed = self.args.check_ms / 1000 * (1 + self.args.penalty * excess)
+        time.sleep(elapsed)
+        with self.lock:
+            self.active[host] -= 1
+            self.latency["cheio" if host == "heavy.test" else "outros"].add(elapsed)
+
+
+def run(label, limit, sites, args):
+    hosts = _ThrottledHosts(args)
+    done = threading.Semaphore(0)
+
+    def check(site):
+        try:
+            hosts.check(site)
+        finally:
+            done.release()
+
+    cycle_seconds = []
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        dispatcher = HostDispatcher(pass_through_submit(executor.submit), limit) if limit else None
+        for _ in range(args.cycles):
+            t_start = time.perf_counter()
+            futures = []
+            for site in sites:
+                if dispatcher is None:
+                    futures.append(executor.submit(check, site))
+                else:
+                    dispatcher.submit(site, check, site)
+            if dispatcher is None:
+                wait(futures)
+            else:
+                for _ in sites:
+                    done.acquire()
+            cycle_seconds.append(time.perf_counter() - t_start)
+
+    print(f"--- {label}: pico no host cheio {hosts.peak['heavy.test']}, ciclo médio {sum(cycle_seconds) / len(cycle_seconds):.2f}s")
+    for group, sketch in hosts.latency.items():
+        print(f"  latência medida ({group}): {format_summary(sketch.summary())}")
+    if dispatcher is not None:
+        print(f"  {dispatcher.format_stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--heavy-sites", type=int, default=12)
+    parser.add_argument("--light-hosts", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--max-per-host", type=int, default=4)
+    parser.add_argument("--throttle-at", type=int, default=4)
+    parser.add_argument("--penalty", type=float, default=0.5)
+    parser.add_argument("--check-ms", type=float, default=100)
+    parser.add_argument("--cycles", type=int, default=5)
+    args = parser.parse_args()
+
+    sites = [f"https://heavy.test/status/{i}" for i in range(args.heavy_sites)]
+    sites += [f"https://light-{i}.test/" for i in range(args.light_hosts)]
+    run("tudo junto", 0, sites, args)
+    run(f"até {args.max_per_host} por host", args.max_per_host, sites, args)
+
+
+if __name__ == "__main__":
+    main()
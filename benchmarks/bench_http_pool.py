@@ -0,0 +1,64 @@
+"""
+Compara requests.get (conexão nova a cada checagem) com o SessionPool
+(keep-alive compartilhado entre threads) em latência média e CPU.
+
+    python benchmarks/bench_http_pool.py --checks 2000 --threads 16
+    python benchmarks/bench_http_pool.py --url https://httpbin.org/status/200
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from _common import LocalServer
+from monitor.http_pool import SessionPool
+
+
+def _run(label, get, urls, threads):
+    latencies = []
+
+    def one(url):
+        t_start = time.perf_counter()
+        try:
+            get(url, timeout=10)
+        except requests.exceptions.RequestException:
+            pass
+        latencies.append(time.perf_counter() - t_start)
+
+    t_wall = time.perf_counter()
+    t_cpu = time.process_time()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(one, urls))
+    wall = time.perf_counter() - t_wall
+    cpu = time.process_time() - t_cpu
+    avg_ms = sum(latencies) / len(latencies) * 1000
+    print(f"{label:<8} {len(urls):>7} {wall:>9.2f} {len(urls) / wall:>9.0f} {avg_ms:>10.2f} {cpu:>8.2f} {cpu / len(urls) * 1e6:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--checks", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--pool-size", type=int, default=16)
+    parser.add_argument("--url", help="URL externa (ex.: https) em vez do servidor local")
+    args = parser.parse_args()
+
+    def bench(base_urls):
+        urls = [base_urls[i % len(base_urls)] for i in range(args.checks)]
+        print(f"{'modo':<8} {'checks':>7} {'tempo(s)':>9} {'checks/s':>9} {'lat.(ms)':>10} {'cpu(s)':>8} {'cpu/chk(us)':>10}")
+        _run("fresh", requests.get, urls, args.threads)
+        pool = SessionPool(pool_size=args.pool_size)
+        _run("pooled", pool.get, urls, args.threads)
+        print(pool.format_stats())
+        pool.close()
+
+    if args.url:
+        bench([args.url])
+    else:
+        with LocalServer() as server:
+            bench([server.url(f"/status/{code}") for code in (200, 204, 404, 500)])
+
+
+if __name__ == "__main__":
+    main()
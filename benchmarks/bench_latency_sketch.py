@@ -0,0 +1,47 @@
+"""
+Custo por amostra e erro dos percentis de monitor/latency.py comparados ao
+cálculo exato (lista ordenada), para latências log-normais.
+
+    python benchmarks/bench_latency_sketch.py --samples 1000000
+"""
+import argparse
+import random
+import time
+
+from _common import ROOT_DIR  # noqa: F401  (coloca a raiz no sys.path)
+from monitor.latency import QUANTILES, LatencyStats, QuantileSketch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--sites", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    samples = [rng.lognormvariate(-2.0, 0.8) for _ in range(args.samples)]
+
+    sketch = QuantileSketch()
+    t0 = time.perf_counter()
+    for value in samples:
+        sketch.add(value)
+    add_seconds = time.perf_counter() - t0
+
+    stats = LatencyStats()
+    t0 = time.perf_counter()
+    for i, value in enumerate(samples):
+        stats.record("http", value, site=i % args.sites, category="success")
+    record_seconds = time.perf_counter() - t0
+
+    exact = sorted(samples)
+    print(f"QuantileSketch.add: {add_seconds / args.samples * 1e9:.0f}ns/amostra, {len(sketch.buckets)} baldes")
+    print(f"LatencyStats.record (site + categoria): {record_seconds / args.samples * 1e9:.0f}ns/amostra")
+    print(f"{'quantil':<8} {'exato(ms)':>10} {'sketch(ms)':>11} {'erro':>7}")
+    for q in QUANTILES + (1.0,):
+        true_value = exact[int(q * (len(exact) - 1))]
+        estimate = sketch.quantile(q)
+        print(f"p{q * 100:<7g} {true_value * 1000:>10.2f} {estimate * 1000:>11.2f} {abs(estimate - true_value) / true_value:>7.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Bytes por LogEntry com 1M entradas paradas em uma queue.Queue: a classe
+original (__dict__, datetime e cópia da URL por entrada) versus o LogEntry
+atual do site-manager.py (__slots__, id de site internado, timestamp float
+e mensagem como modelo + valor).
+
+    python benchmarks/bench_log_entry_memory.py --entries 1000000
+"""
+import argparse
+import contextlib
+import datetime
+import gc
+import io
+import os
+import queue
+import tempfile
+import time
+import tracemalloc
+
+from _common import load_script
+
+
+class LegacyLogEntry:
+    def __init__(self, site, status, message, arrival_time):
+        self.site = site
+        self.status = status
+        self.message = message
+        self.arrival_time = arrival_time
+
+        self.priority_process_time = None
+
+
+def _measure(label, build, entries):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    buffered = queue.Queue()
+    for i in range(entries):
+        buffered.put(build(i))
+    elapsed = time.perf_counter() - t0
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{label:<10} {entries:>10} {used / 1024 / 1024:>10.1f} {used / entries:>12.1f} {elapsed:>9.2f}")
+    return buffered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--sites", type=int, default=500)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench-entry-mem-"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        site_manager = load_script("site-manager.py")
+    base = time.time()
+    sites = [f"https://httpbin.org/status/200?site={i}" for i in range(args.sites)]
+    for site in sites:
+        site_manager.SITE_REGISTRY.intern(site)
+
+    def legacy(i):
+        return LegacyLogEntry(
+            "".join(sites[i % args.sites]),
+            200,
+            f"Online - {(i % 997) / 331:.3f}s",
+            datetime.datetime.fromtimestamp(base + i * 0.001),
+        )
+
+    def compact(i):
+        return site_manager.LogEntry(
+            sites[i % args.sites], 200, "Online - {0:.3f}s", base + i * 0.001, value=(i % 997) / 331
+        )
+
+    print(f"{'classe':<10} {'entradas':>10} {'MB':>10} {'bytes/entr.':>12} {'tempo(s)':>9}")
+    held = _measure("original", legacy, args.entries)
+    del held
+    held = _measure("compacta", compact, args.entries)
+    del held
+
+
+if __name__ == "__main__":
+    main()
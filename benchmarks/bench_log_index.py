@@ -0,0 +1,109 @@
+"""
+Índice esparso do general.log (monitor/log_index.py) contra a varredura do
+arquivo inteiro, para arquivos de tamanhos crescentes: gera um general.log no
+formato do site-manager.py (com o índice montado durante a escrita, como no
+agendador prioritário) e mede consultas de um site em 5 minutos, de um site em
+1 hora e de todos os sites em 1 minuto. Com o índice o tempo depende do que a
+consulta devolve, não do tamanho do arquivo; as duas formas devolvem as
+mesmas linhas.
+
+    python benchmarks/bench_log_index.py --mb 64 256 --sites 1000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from _common import ROOT_DIR  # noqa: F401  (coloca a raiz no sys.path)
+from monitor.log_index import LogIndex, LogIndexWriter, format_time, scan
+
+STATUSES = ((200, "Online - {0:.3f}s"), (404, "Client Error (404) - {0:.3f}s"), (500, "Server Error (500) - {0:.3f}s"))
+BATCH = 500
+
+
+def _generate(path, megabytes, sites, lines_per_second):
+    """Escreve o log em lotes (como o agendador prioritário) e indexa; devolve (início, fim, linhas, s de índice)."""
+    rng = random.Random(1)
+    writer = LogIndexWriter(path)
+    target = megabytes * 2**20
+    start = now = time.time() - target / 150 / lines_per_second
+    size = lines = 0
+    index_seconds = 0.0
+    with open(path, "ab") as f:
+        while size < target:
+            batch = []
+            for _ in range(BATCH):
+                now += rng.expovariate(lines_per_second)
+                status, template = rng.choice(STATUSES)
+                site = rng.choice(sites)
+                process = now + rng.random() * 5
+                line = (
+                    f"Arrival: {format_time(now)} | Priority_Process: {format_time(process)} | Status: {status} | "
+                    f"Site: {site} | Message: {template.format(rng.random())}\n"
+                ).encode("utf-8")
+                batch.append((now, site, line))
+            # o agendador grava erros antes de avisos e sucessos: a ordem no arquivo não é a de chegada
+            batch.sort(key=lambda item: -int(item[2].split(b"Status: ")[1][:3]))
+            for _, _, line in batch:
+                size += f.write(line)
+            started = time.perf_counter()
+            for ts, site, line in batch:
+                writer.add(ts, site, len(line))
+            index_seconds += time.perf_counter() - started
+            lines += len(batch)
+    writer.close()
+    return start, now, lines, index_seconds
+
+
+def _timed(run, *args):
+    started = time.perf_counter()
+    lines = sum(1 for _ in run(*args))
+    return time.perf_counter() - started, lines
+
+
+def _indexed(path, site, start, end, indexes):
+    """Consulta pelo índice contando também a leitura do .idx."""
+    index = LogIndex(path)
+    indexes.append(index)
+    return index.query(site, start, end)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--sites", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=200.0, help="linhas por segundo no log simulado")
+    args = parser.parse_args()
+
+    sites = [f"https://site-{i}.example/status" for i in range(args.sites)]
+    directory = tempfile.mkdtemp(prefix="bench-log-index-")
+    for megabytes in args.mb:
+        path = os.path.join(directory, f"general-{megabytes}.log")
+        first, last, lines, index_seconds = _generate(path, megabytes, sites, args.rate)
+        index = LogIndex(path)
+        print(f"{megabytes} MiB, {(last - first) / 3600:.1f}h de log: índice com {len(index.blocks)} blocos "
+              f"({os.path.getsize(index.index_path) / 1024:.0f} KiB), custo na escrita "
+              f"{index_seconds / lines * 1e6:.1f}µs por linha")
+
+        middle = (first + last) / 2
+        site = sites[len(sites) // 2]
+        queries = [
+            ("1 site, 5 min", site, middle, middle + 300),
+            ("1 site, 1 h", site, middle, middle + 3600),
+            ("todos, 1 min", None, middle, middle + 60),
+        ]
+        for label, query_site, start, end in queries:
+            indexes = []
+            indexed, indexed_lines = _timed(_indexed, path, query_site, start, end, indexes)
+            index = indexes[0]
+            scanned, scanned_lines = _timed(scan, path, query_site, start, end)
+            assert indexed_lines == scanned_lines, (label, indexed_lines, scanned_lines)
+            print(f"  {label:<14}: índice {indexed * 1000:7.1f}ms ({index.blocks_read}/{len(index.blocks)} blocos) | "
+                  f"varredura {scanned * 1000:7.0f}ms | {indexed_lines} linhas")
+        os.remove(path)
+        os.remove(index.index_path)
+
+
+if __name__ == "__main__":
+    main()
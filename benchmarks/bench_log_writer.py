@@ -0,0 +1,70 @@
+"""
+Vazão (entradas/s) dos escritores de log do site-manager.py durante uma
+rajada de erros: escritor FCFS (open/write/close por entrada) versus o
+escritor em lote com arquivo aberto, com e sem fsync.
+
+    python benchmarks/bench_log_writer.py --entries 50000
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+import threading
+import time
+
+from _common import load_script
+
+VARIANTS = (
+    ("fcfs", {"LOG_WRITER_MODE": "fcfs"}),
+    ("lote", {"LOG_WRITER_MODE": "batched", "LOG_FSYNC": "never"}),
+    ("lote+fsync", {"LOG_WRITER_MODE": "batched", "LOG_FSYNC": "flush"}),
+)
+
+
+def run_burst(site_manager, settings, entries):
+    for name, value in settings.items():
+        setattr(site_manager, name, value)
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager = site_manager.SiteManager([])
+
+    now = datetime.datetime.now()
+    for i in range(entries):
+        manager.error_queue.put(
+            site_manager.LogEntry(f"https://site-{i % 500}.example", 503, "Server Error (503) - 0.120s", now)
+        )
+
+    target = manager._batched_log_writer if settings["LOG_WRITER_MODE"] == "batched" else manager._fcfs_log_writer
+    writer = threading.Thread(
+        target=target,
+        args=(manager.error_queue, site_manager.ERROR_LOG_FILE, manager.error_lock, "Error"),
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        t_start = time.perf_counter()
+        writer.start()
+        manager.error_queue.join()
+        manager._stop_event.set()
+        writer.join()
+        elapsed = time.perf_counter() - t_start
+
+    with open(site_manager.ERROR_LOG_FILE) as f:
+        written = sum(1 for _ in f)
+    return elapsed, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=50000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench-log-writer-"))
+    site_manager = load_script("site-manager.py")
+    print(f"{'escritor':<12} {'entradas':>9} {'tempo(s)':>9} {'entradas/s':>11}")
+    for label, settings in VARIANTS:
+        elapsed, written = run_burst(site_manager, settings, args.entries)
+        print(f"{label:<12} {written:>9} {elapsed:>9.2f} {written / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
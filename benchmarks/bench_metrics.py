@@ -0,0 +1,96 @@
+"""
+Endpoint Prometheus do site-manager.py (monitor/metrics.py): tempo de um
+scrape de /metrics servindo o instantâneo montado em segundo plano versus
+montando o texto a cada requisição, para números crescentes de sites, junto
+com o tempo de montagem do instantâneo e o tamanho da resposta.
+
+Os sites não são checados: a tabela de status e as estatísticas de latência
+do SiteManager são preenchidas com resultados sintéticos.
+
+    python benchmarks/bench_metrics.py --sites 100 1000 10000 --scrapes 50
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import urllib.request
+
+from _common import load_script
+from monitor.latency import QuantileSketch, format_summary
+from monitor.metrics import MetricsEndpoint, MetricsText
+from monitor.phases import PHASES
+
+STATUSES = (200, 200, 200, 301, 404, 500, "Timeout", "Conn Error")
+
+
+class _OnDemandEndpoint(MetricsEndpoint):
+    """Monta o texto dentro de cada requisição (o que o instantâneo evita)."""
+
+    def _render(self):
+        out = MetricsText()
+        self.collect(out)
+        return out.render()
+
+    body = property(_render, lambda self, value: None)
+
+
+def _fill(manager, sites, samples):
+    rng = random.Random(1)
+    for site in sites:
+        status = rng.choice(STATUSES)
+        category = "success" if status == 200 else "warning" if status in (301, 404) else "error"
+        latency = rng.lognormvariate(-2.5, 0.8)
+        manager.status_table.set(site, status, "", latency=latency if isinstance(status, int) else None, checked_at=time.time())
+        for _ in range(samples):
+            value = rng.lognormvariate(-2.5, 0.8)
+            manager.latency.record("http", value, site=site, category=category)
+            manager.latency.record("wait", value / 10, site=site, category=category)
+            for phase in PHASES:
+                manager.latency.record(phase, value / 5, site=site, category=category)
+
+
+def _scrape(endpoint, scrapes):
+    sketch = QuantileSketch()
+    for _ in range(scrapes):
+        started = time.perf_counter()
+        with urllib.request.urlopen(endpoint.url) as response:
+            response.read()
+        sketch.add(time.perf_counter() - started)
+    return sketch.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sites", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--samples", type=int, default=5, help="amostras de latência por site")
+    parser.add_argument("--scrapes", type=int, default=50)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench-metrics-"))
+    module = load_script("site-manager.py")
+    for count in args.sites:
+        sites = [f"https://site-{i}.example/status" for i in range(count)]
+        manager = module.SiteManager(sites)
+        _fill(manager, sites, args.samples)
+
+        endpoint = MetricsEndpoint(manager._collect_metrics, port=0, refresh=3600)
+        endpoint.start()
+        snapshot = _scrape(endpoint, args.scrapes)
+        endpoint.stop()
+
+        on_demand = _OnDemandEndpoint(manager._collect_metrics, port=0, refresh=3600)
+        on_demand.start()
+        direct = _scrape(on_demand, max(1, args.scrapes // 5))
+        on_demand.stop()
+
+        lines = endpoint.body.count(b"\n")
+        print(f"{count} sites: instantâneo montado em {endpoint.last_build_seconds * 1000:.0f}ms "
+              f"({len(endpoint.body) / 1024:.0f} KiB, {lines} linhas)")
+        print(f"  scrape do instantâneo : {format_summary(snapshot)}")
+        print(f"  scrape montando na hora: {format_summary(direct)}")
+        manager.status_table.close()
+
+
+if __name__ == "__main__":
+    main()
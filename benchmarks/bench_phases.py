@@ -0,0 +1,90 @@
+"""
+Fases das checagens (monitor/phases.py) em cenários que o tempo total não
+distingue: servidor lento (/delay), corpo grande (/bytes), porta recusada e
+servidor que nunca responde (/blackhole, falha por timeout). Para cada
+cenário e motor (SessionPool e async_engine) mostra o p50 de cada fase e onde
+as checagens falharam.
+
+    python benchmarks/bench_phases.py --checks 20
+"""
+import argparse
+import asyncio
+from collections import Counter
+
+from _common import LocalServer, refused_url
+from monitor import async_engine
+from monitor.dns_cache import DnsCache
+from monitor.http_pool import SessionPool
+from monitor.latency import LatencyStats
+from monitor.phases import PHASE_LABELS, PHASES, PhaseTimer, record_phases
+
+
+def _report(label, stats, failures):
+    parts = []
+    for phase in PHASES:
+        summary = stats.summary(phase, category=label)
+        if summary is not None:
+            parts.append(f"{PHASE_LABELS[phase]} {summary['p50'] * 1000:.1f}ms")
+    failed = ", ".join(f"{PHASE_LABELS[phase]} ({count})" for phase, count in failures.items())
+    print(f"  {label:<14} {' | '.join(parts)}" + (f" | falhas em: {failed}" if failed else ""))
+
+
+def run_threads(scenarios, args, dns):
+    pool = SessionPool(dns_cache=dns)
+    print("SessionPool (threads):")
+    for label, url in scenarios:
+        stats, failures = LatencyStats(), Counter()
+        for _ in range(args.checks):
+            timer = PhaseTimer()
+            try:
+                pool.probe(url, args.method, timeout=args.timeout, timing=timer)
+            except Exception:
+                pass
+            result = timer.result()
+            record_phases(stats, result, category=label)
+            if result.failed:
+                failures[result.failed] += 1
+        _report(label, stats, failures)
+    pool.close()
+
+
+async def run_async(scenarios, args, dns):
+    print("async_engine:")
+    for label, url in scenarios:
+        stats, failures = LatencyStats(), Counter()
+        for _ in range(args.checks):
+            timer = PhaseTimer()
+            try:
+                await async_engine.probe(url, args.method, timeout=args.timeout, dns_cache=dns, timing=timer)
+            except async_engine.CheckError:
+                pass
+            result = timer.result()
+            record_phases(stats, result, category=label)
+            if result.failed:
+                failures[result.failed] += 1
+        _report(label, stats, failures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=20)
+    parser.add_argument("--method", choices=("stream", "head", "get"), default="get")
+    parser.add_argument("--timeout", type=float, default=0.5)
+    args = parser.parse_args()
+
+    dns = DnsCache()
+    with LocalServer() as server:
+        local = server.url("/").rstrip("/").replace("127.0.0.1", "localhost")
+        scenarios = [
+            ("rápido", f"{local}/status/200"),
+            ("servidor lento", f"{local}/delay/0.2"),
+            ("corpo 2MB", f"{local}/bytes/2000000"),
+            ("recusado", refused_url()),
+            ("sem resposta", f"{local}/blackhole"),
+        ]
+        run_threads(scenarios, args, dns)
+        asyncio.run(run_async(scenarios, args, dns))
+
+
+if __name__ == "__main__":
+    main()
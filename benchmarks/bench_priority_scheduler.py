@@ -0,0 +1,98 @@
+"""
+Espera na fila por nível com o WorkerPool sobrecarregado: níveis fixos pelo
+último status (como o priority-manager.py fazia) versus o AgingPriorityScheduler
+de monitor/priority_scheduler.py. Parte dos sites falha sempre; a checagem é
+simulada com sleep, então a demanda passa da capacidade dos workers.
+
+    python benchmarks/bench_priority_scheduler.py --sites 200 --failing 0.6 --seconds 12
+"""
+import argparse
+import time
+
+from _common import ROOT_DIR  # noqa: F401  (coloca a raiz no sys.path)
+from monitor.latency import QuantileSketch, format_summary
+from monitor.priority_scheduler import LEVEL_NAMES, AgingPriorityScheduler
+from monitor.worker_pool import WorkerPool
+
+
+def _fixed_level(status):
+    if status is None:
+        return 1
+    if status < 0 or 500 <= status < 600:
+        return 0
+    if 400 <= status < 500:
+        return 1
+    return 2
+
+
+def run(mode, sites, failing, args):
+    pool = WorkerPool(args.workers, ordering="priority")
+    scheduler = AgingPriorityScheduler(interval=args.period, max_wait=args.max_wait)
+    waits = {level: QuantileSketch() for level in LEVEL_NAMES}
+    last_status = {}
+    queued = {}
+    served = {site: 0 for site in sites}
+    pool_pending = set()
+
+    def check(site):
+        started = time.time()
+        queued_at, level = queued[site]
+        waits[level].add(started - queued_at)
+        scheduler.record_start(site, started)
+        time.sleep(args.check_ms / 1000)
+        status = 500 if site in failing else 200
+        last_status[site] = status
+        served[site] += 1
+        scheduler.record_result(site, status, args.check_ms / 1000)
+        pool_pending.discard(site)
+
+    pool.start()
+    deadline = time.time() + args.seconds
+    while time.time() < deadline:
+        now = time.time()
+        for site in sites:
+            if mode == "fixo":
+                level = _fixed_level(last_status.get(site))
+                key = level
+            else:
+                key, level = scheduler.priority(site, now)
+            if site in pool_pending:
+                continue
+            queued[site] = (now, level)
+            scheduler.mark_queued(site, now, level)
+            pool_pending.add(site)
+            if not pool.submit(site, check, site, priority=key):
+                pool_pending.discard(site)
+        time.sleep(args.period)
+    served_in_run = dict(served)
+    pool.shutdown()
+
+    healthy_checks = sum(count for site, count in served_in_run.items() if site not in failing)
+    print(
+        f"--- {mode}: {sum(served_in_run.values())} checagens, "
+        f"{healthy_checks} de sites saudáveis ({len(sites) - len(failing)} sites)"
+    )
+    print("  espera na fila até o início da checagem (inclui a drenagem da fila no fim):")
+    for level in sorted(waits):
+        print(f"  P{level} {LEVEL_NAMES[level]:<9}: {format_summary(waits[level].summary())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sites", type=int, default=200)
+    parser.add_argument("--failing", type=float, default=0.6)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--check-ms", type=float, default=30)
+    parser.add_argument("--period", type=float, default=1.0)
+    parser.add_argument("--max-wait", type=float, default=2.0)
+    parser.add_argument("--seconds", type=float, default=12)
+    args = parser.parse_args()
+
+    sites = [f"site-{i}" for i in range(args.sites)]
+    failing = set(sites[: int(args.sites * args.failing)])
+    for mode in ("fixo", "aging"):
+        run(mode, sites, failing, args)
+
+
+if __name__ == "__main__":
+    main()
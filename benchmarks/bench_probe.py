@@ -0,0 +1,103 @@
+"""
+Checagem de páginas pesadas com GET completo versus as sondagens de
+SessionPool.probe ("head" e "stream", que fecha a conexão após os cabeçalhos)
+e do motor asyncio. Mede tempo até o resultado, CPU e bytes de corpo lidos.
+
+    python benchmarks/bench_probe.py --size 2000000 --checks 200 --threads 8
+    python benchmarks/bench_probe.py --url https://www.amazon.com --checks 10
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from _common import LocalServer
+from monitor.async_engine import CheckError, probe
+from monitor.http_pool import SessionPool
+
+
+def _report(label, checks, wall, cpu, latencies, body_bytes):
+    avg_ms = sum(latencies) / len(latencies) * 1000
+    print(
+        f"{label:<14} {checks:>7} {wall:>9.2f} {avg_ms:>10.2f} {cpu:>8.2f} "
+        f"{body_bytes / checks / 1024:>12.1f}"
+    )
+
+
+def _run_threads(method, url, args):
+    pool = SessionPool(pool_size=args.threads)
+    latencies = []
+
+    def one(_):
+        t_start = time.perf_counter()
+        try:
+            pool.probe(url, method, timeout=10, max_bytes=args.max_bytes)
+        except requests.exceptions.RequestException:
+            pass
+        latencies.append(time.perf_counter() - t_start)
+
+    t_wall = time.perf_counter()
+    t_cpu = time.process_time()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        list(executor.map(one, range(args.checks)))
+    _report(
+        f"threads/{method}", args.checks, time.perf_counter() - t_wall, time.process_time() - t_cpu,
+        latencies, pool.stats.snapshot()["body_bytes"],
+    )
+    pool.close()
+
+
+def _run_async(method, url, args):
+    latencies = []
+    body_bytes = 0
+
+    async def main():
+        nonlocal body_bytes
+        semaphore = asyncio.Semaphore(args.threads)
+
+        async def one():
+            nonlocal body_bytes
+            async with semaphore:
+                t_start = time.perf_counter()
+                try:
+                    response = await probe(url, method, timeout=10, max_bytes=args.max_bytes)
+                    body_bytes += len(response.content)
+                except CheckError:
+                    pass
+                latencies.append(time.perf_counter() - t_start)
+
+        await asyncio.gather(*(one() for _ in range(args.checks)))
+
+    t_wall = time.perf_counter()
+    t_cpu = time.process_time()
+    asyncio.run(main())
+    _report(f"asyncio/{method}", args.checks, time.perf_counter() - t_wall, time.process_time() - t_cpu, latencies, body_bytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=2_000_000, help="bytes do corpo no servidor local")
+    parser.add_argument("--checks", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--max-bytes", type=int, default=0)
+    parser.add_argument("--url", help="URL externa em vez do servidor local")
+    args = parser.parse_args()
+
+    def bench(url):
+        print(f"{'modo':<14} {'checks':>7} {'tempo(s)':>9} {'lat.(ms)':>10} {'cpu(s)':>8} {'corpo/chk(KB)':>12}")
+        for method in ("get", "head", "stream"):
+            _run_threads(method, url, args)
+        for method in ("get", "head", "stream"):
+            _run_async(method, url, args)
+
+    if args.url:
+        bench(args.url)
+    else:
+        with LocalServer() as server:
+            bench(server.url(f"/bytes/{args.size}"))
+
+
+if __name__ == "__main__":
+    main()
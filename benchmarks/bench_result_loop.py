@@ -0,0 +1,139 @@
+"""
+Loop de consumo de resultados de fcfs-manager.py, priority-manager.py,
+with-lock.py e without-lock.py: quanto tempo um resultado posto em
+self.results leva para aparecer na tela (put -> update_screen que o mostra) e
+quanto o processo gasta parado, depois que todas as checagens terminaram e
+antes do próximo ciclo (CPU e trocas de contexto voluntárias por segundo,
+que contam as vezes que o loop acordou).
+
+Os sites respondem com atrasos variados (/delay/S) para os resultados
+chegarem espalhados no tempo. Cada variante roda em um processo próprio com
+a saída de tela descartada.
+
+    python benchmarks/bench_result_loop.py --sites 40 --duration 10 --idle 5
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import resource
+import tempfile
+import threading
+import time
+import types
+
+from _common import LocalServer, load_script
+from monitor.latency import QuantileSketch, format_summary
+
+VARIANTS = {
+    "fcfs-manager": "fcfs-manager.py",
+    "priority-manager": "priority-manager.py",
+    "with-lock": "with-lock.py",
+    "without-lock": "without-lock.py",
+}
+
+
+class _TimedQueue(queue.Queue):
+    """Fila que anota quando cada resultado (tupla) entrou e quando saiu para o loop."""
+
+    drained = []
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self.stamps = []
+
+    def _put(self, item):
+        super()._put(item)
+        self.stamps.append(time.perf_counter() if isinstance(item, tuple) else None)
+
+    def _get(self):
+        stamp = self.stamps.pop(0)
+        if stamp is not None:
+            _TimedQueue.drained.append(stamp)
+        return super()._get()
+
+
+def _child(name, sites, args, idle, results):
+    os.chdir(tempfile.mkdtemp(prefix=f"bench-loop-{name}-"))
+    os.makedirs("logs")  # priority-manager.py não cria o diretório sozinho
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+
+    module = load_script(VARIANTS[name])
+    module.queue = types.SimpleNamespace(Queue=_TimedQueue, Empty=queue.Empty)
+    if hasattr(module, "ADAPTIVE_INTERVALS"):
+        module.ADAPTIVE_INTERVALS = False
+    manager = module.SiteManager(sites)
+    sketch = QuantileSketch()
+    update_screen = manager.update_screen
+
+    def timed_update_screen():
+        now = time.perf_counter()
+        for stamp in _TimedQueue.drained:
+            sketch.add(now - stamp)
+        _TimedQueue.drained.clear()
+        update_screen()
+
+    manager.update_screen = timed_update_screen
+    if name in ("fcfs-manager", "priority-manager"):
+        period = 3600 if idle else args.recheck
+        run = lambda: manager.run_checks(screen_update_interval=args.screen_interval, site_recheck_period=period)
+    else:
+        run = lambda: manager.run_checks(num_threads=len(sites), update_interval=args.screen_interval)
+
+    threading.Thread(target=run, daemon=True).start()
+    if idle:
+        # espera as checagens do primeiro ciclo terminarem; daí em diante o loop só espera
+        time.sleep(args.idle_warmup)
+        usage0, t0 = resource.getrusage(resource.RUSAGE_SELF), time.perf_counter()
+        time.sleep(args.idle)
+        usage1, t1 = resource.getrusage(resource.RUSAGE_SELF), time.perf_counter()
+        cpu = (usage1.ru_utime + usage1.ru_stime) - (usage0.ru_utime + usage0.ru_stime)
+        results.put({
+            "cpu_ms_per_s": cpu / (t1 - t0) * 1000,
+            "wakeups_per_s": (usage1.ru_nvcsw - usage0.ru_nvcsw) / (t1 - t0),
+        })
+    else:
+        time.sleep(args.duration)
+        results.put({"latency": sketch.summary()})
+    results.close()
+    results.join_thread()
+    os._exit(0)
+
+
+def _run(name, sites, args, idle):
+    results = multiprocessing.Queue()
+    child = multiprocessing.Process(target=_child, args=(name, sites, args, idle, results))
+    child.start()
+    result = results.get(timeout=args.duration + args.idle + args.idle_warmup + 60)
+    child.join(10)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", default=",".join(VARIANTS))
+    parser.add_argument("--sites", type=int, default=40)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--recheck", type=float, default=2.0, help="site_recheck_period de fcfs/priority")
+    parser.add_argument("--screen-interval", type=float, default=1.0)
+    parser.add_argument("--idle", type=float, default=5.0, help="segundos medidos sem checagens em andamento")
+    parser.add_argument("--idle-warmup", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with LocalServer() as server:
+        busy_sites = [server.url(f"/delay/{(i * 37 % 100) / 100:.2f}?i={i}") for i in range(args.sites)]
+        idle_sites = [server.url(f"/status/200?i={i}") for i in range(args.sites)]
+        print(f"{'variante':<18} {'CPU parado(ms/s)':>17} {'acordadas/s':>12}  resultado -> tela")
+        for name in args.variants.split(","):
+            busy = _run(name, busy_sites, args, idle=False)
+            idle = _run(name, idle_sites, args, idle=True)
+            print(
+                f"{name:<18} {idle['cpu_ms_per_s']:>17.2f} {idle['wakeups_per_s']:>12.1f}  "
+                f"{format_summary(busy['latency'])}"
+            )
+
+
+if __name__ == "__main__":
+    main()
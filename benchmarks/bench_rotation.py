@@ -0,0 +1,81 @@
+"""
+Rotação de logs (monitor/rotation.py): latência de cada logging.info() na
+thread escritora, como nos logs do fcfs-manager.py e do priority-manager.py,
+sem rotação, com rotação e compressão em segundo plano e com rotação
+comprimindo o segmento na própria thread escritora (o que a thread de fundo
+evita). Mostra também quantos segmentos ficaram e o espaço ocupado.
+
+    python benchmarks/bench_rotation.py --mb 32 --segment-mb 4 --compression gzip
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from _common import ROOT_DIR  # noqa: F401  (coloca a raiz no sys.path)
+from monitor import rotation
+from monitor.latency import QuantileSketch
+from monitor.rotation import COMPRESSOR, LogRotator, RotatingLogHandler
+
+
+class _InlineRotator(LogRotator):
+    """Comprime e aplica a retenção dentro de note_write, na thread escritora."""
+
+    def _compress_later(self, segment):
+        if self.compression is not None:
+            rotation._compress(segment, self.compression)
+            self.compressed += 1
+        self.apply_retention()
+
+
+def _run(label, rotator_class, args, compression):
+    directory = tempfile.mkdtemp(prefix="bench-rotation-")
+    path = os.path.join(directory, "bench.log")
+    max_bytes = int(args.segment_mb * 2**20) if rotator_class is not None else 0
+    rotator = (rotator_class or LogRotator)(path, max_bytes=max_bytes, keep=args.keep, compression=compression, settle=0)
+    handler = RotatingLogHandler(rotator, mode="w")
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(threadName)s - %(levelname)s - %(message)s"))
+    logger = logging.getLogger(f"bench-rotation-{label}")
+    logger.propagate = False
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    sketch = QuantileSketch(min_value=1e-7)
+    slow = 0
+    target = args.mb * 2**20
+    written = 0
+    started = time.perf_counter()
+    while written < target:
+        message = f"[Check-{written % 8}] Site https://httpbin.org/status/{written % 600}: 200 - Online - 0.123s"
+        t0 = time.perf_counter()
+        logger.info(message)
+        elapsed_emit = time.perf_counter() - t0
+        sketch.add(elapsed_emit)
+        slow += elapsed_emit > 0.001
+        written += len(message) + 60
+    elapsed = time.perf_counter() - started
+    COMPRESSOR.wait()
+    handler.close()
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    latency = " | ".join(f"p{q * 100:g} {sketch.quantile(q) * 1e6:.0f}µs" for q in (0.5, 0.99, 0.999))
+    print(f"{label:<26} {latency} | máx {sketch.max * 1000:.1f}ms | {slow} acima de 1ms ({sketch.count})")
+    print(f"{'':<26} {elapsed:.1f}s, {rotator.rotations} rotações, {len(rotator.segments())} segmentos guardados, "
+          f"{size / 2**20:.1f} MiB em disco")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=int, default=32, help="MiB escritos em cada modo")
+    parser.add_argument("--segment-mb", type=float, default=4.0)
+    parser.add_argument("--keep", type=int, default=5)
+    parser.add_argument("--compression", choices=("gzip", "zstd"), default="gzip")
+    args = parser.parse_args()
+
+    _run("sem rotação", None, args, None)
+    _run(f"{args.compression} em segundo plano", LogRotator, args, args.compression)
+    _run(f"{args.compression} na escritora", _InlineRotator, args, args.compression)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Custo por quadro da tela: os.system("clear") + um print por site (como era o
+update_screen) versus monitor/screen.py, que reescreve só as linhas alteradas
+em uma escrita. A saída vai para /dev/null; a cada quadro --churn dos sites
+mudam de status.
+
+    python benchmarks/bench_screen.py --sites 100,1000,10000 --frames 50
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from _common import ROOT_DIR  # noqa: F401  (coloca a raiz no sys.path)
+from monitor.screen import ScreenRenderer
+
+
+class _TTY:
+    def __init__(self, stream):
+        self._stream = stream
+
+    def isatty(self):
+        return True
+
+    def write(self, data):
+        return self._stream.write(data)
+
+    def flush(self):
+        self._stream.flush()
+
+
+def _row(site, status):
+    color = "92" if status == 200 else "91"
+    return f"- {site:<35}: \033[{color}m{status}\033[0m{'':<9} (Online - 0.123s)"
+
+
+def _mutate(statuses, rng, churn):
+    for _ in range(max(1, int(len(statuses) * churn))):
+        i = rng.randrange(len(statuses))
+        statuses[i] = 500 if statuses[i] == 200 else 200
+
+
+def _legacy(sites, frames, churn, devnull):
+    rng = random.Random(1)
+    statuses = [200] * len(sites)
+    times = []
+    with contextlib.redirect_stdout(devnull):
+        for _ in range(frames):
+            _mutate(statuses, rng, churn)
+            t0 = time.perf_counter()
+            os.system("clear > /dev/null")
+            for site, status in zip(sites, statuses):
+                print(_row(site, status))
+            times.append(time.perf_counter() - t0)
+    return times
+
+
+def _diff(sites, frames, churn, devnull, overflow):
+    rng = random.Random(1)
+    statuses = [200] * len(sites)
+    screen = ScreenRenderer(stream=_TTY(devnull), overflow=overflow, frame_budget_ms=1000)
+    items = list(zip(sites, statuses))
+    times = []
+    for _ in range(frames):
+        _mutate(statuses, rng, churn)
+        items = list(zip(sites, statuses))
+        screen.begin_frame()
+        visible, extra = screen.select_rows(
+            items, screen.rows_available(3), category=lambda item: "ok" if item[1] == 200 else "erro"
+        )
+        lines = ["-" * 70, "Status dos Sites:"] + [_row(site, status) for site, status in visible]
+        if extra:
+            lines.append(extra)
+        screen.render(lines + ["-" * 70])
+        times.append(screen.last_frame_seconds)
+    return times, screen
+
+
+def _report(label, sites, times, extra=""):
+    times = sorted(times)
+    avg = sum(times) / len(times)
+    print(f"{label:<26} {sites:>7} {avg * 1000:>9.2f} {times[-1] * 1000:>9.2f} {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sites", default="100,1000,10000")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--churn", type=float, default=0.01)
+    parser.add_argument("--lines", type=int, default=50, help="altura simulada do terminal")
+    args = parser.parse_args()
+
+    os.environ["COLUMNS"] = "160"
+    print(f"{'modo':<26} {'sites':>7} {'médio(ms)':>9} {'máx(ms)':>9}")
+    with open(os.devnull, "w") as devnull:
+        for count in (int(n) for n in args.sites.split(",")):
+            sites = [f"https://example{i}.test/status/200" for i in range(count)]
+            _report("clear + print", count, _legacy(sites, args.frames, args.churn, devnull))
+
+            os.environ["LINES"] = str(count + 10)
+            times, screen = _diff(sites, args.frames, args.churn, devnull, "paginate")
+            _report("diff (tela inteira)", count, times, f"{screen.last_lines_written} linhas/quadro")
+
+            os.environ["LINES"] = str(args.lines)
+            for overflow in ("paginate", "summary"):
+                times, screen = _diff(sites, args.frames, args.churn, devnull, overflow)
+                _report(f"diff ({overflow}, {args.lines} lin.)", count, times, f"{screen.last_lines_written} linhas/quadro")
+
+
+if __name__ == "__main__":
+    main()
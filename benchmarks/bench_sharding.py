@@ -0,0 +1,92 @@
+"""
+Escalabilidade do site-manager.py com CHECK_PROCESSES de 1 a N: cada
+configuração roda em um processo próprio contra o servidor local, sem
+intervalo entre checagens (CHECK_INTERVAL = 0) e sem intervalos adaptativos,
+e mede quantos resultados o processo pai publica por segundo e a CPU total
+(pai + shards).
+
+    python benchmarks/bench_sharding.py --processes 1,2,4 --sites 400 --duration 10
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from _common import LocalServer, load_script
+
+
+def _child(processes, sites, args, results):
+    os.chdir(tempfile.mkdtemp(prefix=f"bench-shard-{processes}-"))
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+
+    module = load_script("site-manager.py")
+    module.CHECK_INTERVAL = 0.0
+    module.ADAPTIVE_INTERVALS = False
+    module.MAX_CHECKS_PER_HOST = None
+    manager = module.SiteManager(sites)
+    published = []
+    apply_result = manager._apply_result
+
+    def counted(*item):
+        published.append(time.perf_counter())
+        return apply_result(*item)
+
+    manager._apply_result = counted
+    run = threading.Thread(
+        target=manager.run_checks,
+        kwargs={"num_threads": args.threads * processes, "engine": args.engine, "processes": processes},
+        daemon=True,
+    )
+    run.start()
+
+    time.sleep(args.warmup)
+    times0 = os.times()
+    t0 = time.perf_counter()
+    time.sleep(args.duration)
+    t1 = time.perf_counter()
+    manager.stop()
+    run.join(10)
+    times1 = os.times()
+
+    # os.times() só soma a CPU dos filhos depois que eles terminam (stop faz o join)
+    cpu = sum(times1[:4]) - sum(times0[:4])
+    checks = sum(1 for t in published if t0 <= t < t1)
+    results.put({"processes": processes, "checks_per_second": checks / (t1 - t0), "cpu_seconds": cpu})
+    results.close()
+    results.join_thread()
+    os._exit(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", default=",".join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)) or "1")
+    parser.add_argument("--sites", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=16, help="threads de checagem por processo")
+    parser.add_argument("--engine", choices=("threads", "asyncio"), default="threads")
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"núcleos disponíveis: {os.cpu_count()}")
+    print(f"{'processos':>9} {'chec/s':>9} {'speedup':>8} {'CPU(s)':>8} {'CPU/chec(ms)':>13}")
+    baseline = None
+    with LocalServer() as server:
+        sites = [server.url(f"/status/200?i={i}") for i in range(args.sites)]
+        for processes in (int(n) for n in args.processes.split(",")):
+            results = multiprocessing.Queue()
+            child = multiprocessing.Process(target=_child, args=(processes, sites, args, results))
+            child.start()
+            result = results.get(timeout=args.warmup + args.duration + 60)
+            child.join(10)
+            rate = result["checks_per_second"]
+            baseline = baseline or rate
+            per_check = result["cpu_seconds"] / (rate * args.duration) * 1000 if rate else 0.0
+            print(f"{processes:>9} {rate:>9.0f} {rate / baseline:>7.2f}x {result['cpu_seconds']:>8.2f} {per_check:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
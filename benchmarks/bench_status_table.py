@@ -0,0 +1,129 @@
+"""
+status_dict (dicionário de dicionários, como o site-manager.py usava) versus
+a StatusTable de monitor/status_table.py: escritas por segundo, tempo de um
+instantâneo de todos os sites para a tela, memória por site e, com uma thread
+escrevendo sem parar, quantas releituras o seqlock precisa e se algum
+instantâneo sai rasgado (status de uma escrita com latência de outra).
+
+    python benchmarks/bench_status_table.py --sites 10000 --writes 200000
+"""
+import argparse
+import random
+import threading
+import time
+import tracemalloc
+
+from _common import ROOT_DIR  # noqa: F401  (coloca a raiz no sys.path)
+from monitor.status_table import StatusTable
+
+STATUSES = (200, 301, 404, 500, "Timeout", "Conn Error")
+
+
+def _dict_table(sites):
+    return {site: {"status": "Pending", "message": ""} for site in sites}
+
+
+def _dict_set(table, lock, site, status, message, latency):
+    with lock:
+        table[site] = {"status": status, "message": message, "latency": latency, "checked_at": time.time()}
+
+
+def _dict_snapshot(table, lock):
+    with lock:
+        return [(site, dict(row)) for site, row in table.items()]
+
+
+def _memory(build):
+    tracemalloc.start()
+    table = build()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return table, current
+
+
+def _time_writes(set_row, sites, writes):
+    picks = [(random.choice(sites), STATUSES[i % len(STATUSES)]) for i in range(writes)]
+    t0 = time.perf_counter()
+    for i, (site, status) in enumerate(picks):
+        set_row(site, status, "OK", i * 1e-6)
+    return writes / (time.perf_counter() - t0)
+
+
+def _time_snapshots(snapshot, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        snapshot()
+    return (time.perf_counter() - t0) / rounds * 1000
+
+
+def _torn_reads(table, sites, duration):
+    # status e latência sempre gravados juntos: status = i % 1000, latência = i
+    stop = threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            table.set(sites[i % len(sites)], i % 1000, latency=float(i))
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    snapshots = torn = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        for _, row in table.snapshot():
+            if row.seq and row.status != int(row.latency) % 1000:
+                torn += 1
+        snapshots += 1
+    stop.set()
+    thread.join()
+    return snapshots, torn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sites", type=int, default=10000)
+    parser.add_argument("--writes", type=int, default=200000)
+    parser.add_argument("--snapshots", type=int, default=20)
+    parser.add_argument("--contention", type=float, default=3.0, help="segundos de leitura com escritor concorrente")
+    args = parser.parse_args()
+
+    sites = [f"https://site-{i}.test/" for i in range(args.sites)]
+    lock = threading.Lock()
+
+    def filled_dict():
+        table = _dict_table(sites)
+        for site in sites:
+            _dict_set(table, lock, site, 200, "OK", 0.1)
+        return table
+
+    def filled_table():
+        table = StatusTable(sites)
+        for site in sites:
+            table.set(site, 200, "OK", latency=0.1, checked_at=time.time())
+        return table
+
+    dict_table, dict_bytes = _memory(filled_dict)
+    table, table_bytes = _memory(filled_table)
+
+    print(f"{args.sites} sites, {args.writes} escritas")
+    print(f"{'':<14} {'escritas/s':>11} {'instantâneo(ms)':>16} {'bytes/site':>11}")
+    rate = _time_writes(lambda s, st, m, lat: _dict_set(dict_table, lock, s, st, m, lat), sites, args.writes)
+    snap = _time_snapshots(lambda: _dict_snapshot(dict_table, lock), args.snapshots)
+    print(f"{'status_dict':<14} {rate:>11.0f} {snap:>16.2f} {dict_bytes / args.sites:>11.0f}")
+    rate = _time_writes(lambda s, st, m, lat: table.set(s, st, m, latency=lat), sites, args.writes)
+    snap = _time_snapshots(table.snapshot, args.snapshots)
+    print(f"{'StatusTable':<14} {rate:>11.0f} {snap:>16.2f} {table_bytes / args.sites:>11.0f}")
+    print(f"  arrays de largura fixa: {table.stats()['bytes'] / args.sites:.0f} bytes/site")
+
+    contended = StatusTable(sites)
+    snapshots, torn = _torn_reads(contended, sites, args.contention)
+    stats = contended.stats()
+    print(
+        f"com escritor concorrente: {snapshots} instantâneos, {stats['writes']} escritas, "
+        f"{stats['read_retries']} releituras do seqlock, {torn} linhas rasgadas"
+    )
+
+
+if __name__ == "__main__":
+    main()
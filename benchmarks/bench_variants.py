@@ -0,0 +1,169 @@
+"""
+Roda as variantes (site-manager.py com threads e com asyncio, fcfs-manager.py,
+priority-manager.py, with-lock.py, without-lock.py) contra o servidor local de
+monitor/standin_server.py com a mesma carga e mede checagens/s, latência do
+resultado (duração da checagem no worker, p50/p99), CPU e pico de RSS.
+
+Cada variante roda em um processo próprio, em um diretório temporário e com
+a saída de tela descartada. Carga: a cada 20 sites, 14 /status/200, 2
+/status/404, 2 /status/500, 1 /delay/0.5 e 1 porta recusada; --blackhole
+acrescenta sites que nunca respondem.
+
+    python benchmarks/bench_variants.py --sites 200 --duration 20
+    python benchmarks/bench_variants.py --variants fcfs-manager,priority-manager
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import tempfile
+import threading
+import time
+
+from _common import LocalServer, load_script, peak_rss_mb, refused_url
+
+VARIANTS = {
+    "site-manager": "site-manager.py",
+    "site-manager-asyncio": "site-manager.py",
+    "fcfs-manager": "fcfs-manager.py",
+    "priority-manager": "priority-manager.py",
+    "with-lock": "with-lock.py",
+    "without-lock": "without-lock.py",
+}
+
+MIX = ["/status/200"] * 14 + ["/status/404"] * 2 + ["/status/500"] * 2 + ["/delay/0.5", None]
+
+
+def build_workload(server, count, blackhole=0):
+    refused = refused_url()
+    sites = []
+    for i in range(count):
+        path = MIX[i % len(MIX)]
+        sites.append(f"{refused}?i={i}" if path is None else server.url(f"{path}?i={i}"))
+    sites.extend(server.url(f"/blackhole?i={i}") for i in range(blackhole))
+    return sites
+
+
+def _setup(name, module, sites, args):
+    """Instancia o SiteManager da variante; devolve (manager, atributo da checagem, função que roda o loop)."""
+    if hasattr(module, "MAX_CHECKS_PER_HOST"):
+        # todos os sites estão no mesmo host local, que faz o papel de muitos hosts
+        module.MAX_CHECKS_PER_HOST = args.max_per_host
+    if hasattr(module, "ADAPTIVE_INTERVALS"):
+        # a comparação é de vazão com a mesma agenda: sites estáveis não podem ser pulados
+        module.ADAPTIVE_INTERVALS = False
+    if name.startswith("site-manager"):
+        module.CHECK_INTERVAL = args.interval
+        engine = "asyncio" if name.endswith("asyncio") else "threads"
+        manager = module.SiteManager(sites)
+        attr = "check_status_async" if engine == "asyncio" else "check_status"
+        return manager, attr, lambda: manager.run_checks(num_threads=args.workers, engine=engine)
+    if name in ("fcfs-manager", "priority-manager"):
+        module.MAX_CHECK_WORKERS = args.workers
+        manager = module.SiteManager(sites)
+        return manager, "check_status_thread_target", lambda: manager.run_checks(
+            screen_update_interval=1, site_recheck_period=args.interval
+        )
+    manager = module.SiteManager(sites)
+    return manager, "check_status", lambda: manager.run_checks(num_threads=args.workers, update_interval=1)
+
+
+def _instrument(manager, attr, samples):
+    original = getattr(manager, attr)
+
+    if asyncio.iscoroutinefunction(original):
+        async def timed(*a, **kw):
+            t0 = time.perf_counter()
+            try:
+                return await original(*a, **kw)
+            finally:
+                end = time.perf_counter()
+                samples.append((end, end - t0))
+    else:
+        def timed(*a, **kw):
+            t0 = time.perf_counter()
+            try:
+                return original(*a, **kw)
+            finally:
+                end = time.perf_counter()
+                samples.append((end, end - t0))
+
+    setattr(manager, attr, timed)
+
+
+def _child(name, sites, args, results):
+    os.chdir(tempfile.mkdtemp(prefix=f"bench-{name}-"))
+    os.makedirs("logs")  # priority-manager.py não cria o diretório sozinho
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+
+    module = load_script(VARIANTS[name], module_name=name.replace("-", "_"))
+    manager, attr, run = _setup(name, module, sites, args)
+    samples = []
+    _instrument(manager, attr, samples)
+    threading.Thread(target=run, daemon=True).start()
+
+    time.sleep(args.warmup)
+    usage0 = resource.getrusage(resource.RUSAGE_SELF)
+    t0 = time.perf_counter()
+    time.sleep(args.duration)
+    t1 = time.perf_counter()
+    usage1 = resource.getrusage(resource.RUSAGE_SELF)
+
+    window = sorted(duration for end, duration in list(samples) if t0 <= end < t1)
+    cpu = (usage1.ru_utime - usage0.ru_utime) + (usage1.ru_stime - usage0.ru_stime)
+    results.put({
+        "variant": name,
+        "checks": len(window),
+        "checks_per_second": len(window) / (t1 - t0),
+        "p50": window[len(window) // 2] if window else None,
+        "p99": window[min(len(window) - 1, int(len(window) * 0.99))] if window else None,
+        "cpu_seconds": cpu,
+        "threads": threading.active_count(),
+        "peak_rss_mb": peak_rss_mb(),
+    })
+    results.close()
+    results.join_thread()
+    os._exit(0)
+
+
+def _ms(value):
+    return f"{value * 1000:>8.1f}" if value is not None else f"{'-':>8}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", default=",".join(VARIANTS))
+    parser.add_argument("--sites", type=int, default=200)
+    parser.add_argument("--blackhole", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--interval", type=float, default=2.0, help="intervalo de rechecagem onde a variante permite")
+    parser.add_argument("--max-per-host", type=int, default=None, help="limite por host das variantes (padrão: sem limite)")
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'variante':<22} {'chec/s':>8} {'p50(ms)':>8} {'p99(ms)':>8} "
+        f"{'CPU%':>6} {'CPU/chec(ms)':>12} {'threads':>8} {'RSS(MB)':>8}"
+    )
+    with LocalServer() as server:
+        sites = build_workload(server, args.sites, args.blackhole)
+        for name in args.variants.split(","):
+            results = multiprocessing.Queue()
+            child = multiprocessing.Process(target=_child, args=(name, sites, args, results))
+            child.start()
+            result = results.get(timeout=args.warmup + args.duration + 60)
+            child.join(10)
+            per_check = result["cpu_seconds"] / result["checks"] if result["checks"] else None
+            print(
+                f"{name:<22} {result['checks_per_second']:>8.1f} {_ms(result['p50'])} {_ms(result['p99'])} "
+                f"{result['cpu_seconds'] / args.duration:>6.0%} {_ms(per_check):>12} "
+                f"{result['threads']:>8} {result['peak_rss_mb']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Thread por checagem por ciclo (modelo antigo do fcfs/priority-manager) versus
+WorkerPool limitado. As checagens são simuladas com sleep, e uma fração dos
+sites demora mais que o período de rechecagem, como httpbin.org/delay/N.
+
+    python benchmarks/bench_worker_pool.py --sites 200 --cycles 10 --period 0.5
+"""
+import argparse
+import random
+import threading
+import time
+
+from _common import ROOT_DIR  # noqa: F401  (coloca a raiz no sys.path)
+from monitor.worker_pool import WorkerPool
+
+
+class _Sampler:
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._done.is_set():
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(0.005)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
+
+
+def _latencies(sites, slow_fraction, period, seed=42):
+    rng = random.Random(seed)
+    return {
+        site: period * rng.uniform(2.0, 4.0) if rng.random() < slow_fraction else rng.uniform(0.005, 0.05)
+        for site in range(sites)
+    }
+
+
+def run_thread_per_check(latencies, cycles, period):
+    created = 0
+    create_seconds = 0.0
+    with _Sampler() as sampler:
+        for _ in range(cycles):
+            cycle_start = time.perf_counter()
+            for site, latency in latencies.items():
+                t0 = time.perf_counter()
+                thread = threading.Thread(target=time.sleep, args=(latency,), name=f"Check-{site}")
+                thread.start()
+                create_seconds += time.perf_counter() - t0
+                created += 1
+            time.sleep(max(0.0, period - (time.perf_counter() - cycle_start)))
+        while threading.active_count() > 2:
+            time.sleep(0.01)
+    return created, create_seconds, sampler.peak - 2, 0
+
+
+def run_worker_pool(latencies, cycles, period, workers):
+    pool = WorkerPool(max_workers=workers, name_prefix="Check")
+    create_seconds = 0.0
+    with _Sampler() as sampler:
+        t0 = time.perf_counter()
+        pool.start()
+        create_seconds += time.perf_counter() - t0
+        for _ in range(cycles):
+            cycle_start = time.perf_counter()
+            for site, latency in latencies.items():
+                t0 = time.perf_counter()
+                pool.submit(site, time.sleep, latency)
+                create_seconds += time.perf_counter() - t0
+            time.sleep(max(0.0, period - (time.perf_counter() - cycle_start)))
+        while pool.queue_depth() or pool.stats()["active"]:
+            time.sleep(0.01)
+        stats = pool.stats()
+        pool.shutdown()
+    return stats["threads_created"], create_seconds, sampler.peak - 2, stats["skipped_in_flight"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sites", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--period", type=float, default=0.5)
+    parser.add_argument("--slow-fraction", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    latencies = _latencies(args.sites, args.slow_fraction, args.period)
+    print(f"{'modelo':<18} {'threads criadas':>15} {'overhead(ms)':>13} {'pico threads':>13} {'reenvios evitados':>18}")
+    for label, runner in (
+        ("thread-por-check", lambda: run_thread_per_check(latencies, args.cycles, args.period)),
+        ("worker-pool", lambda: run_worker_pool(latencies, args.cycles, args.period, args.workers)),
+    ):
+        created, overhead, peak, skipped = runner()
+        print(f"{label:<18} {created:>15} {overhead * 1000:>13.1f} {peak:>13} {skipped:>18}")
+
+
+if __name__ == "__main__":
+    main()
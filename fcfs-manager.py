@@ -4,16 +4,57 @@ import queue
 import time
 import os
 import logging
-import copy
+
+from monitor.adaptive import AdaptiveIntervals
+from monitor.dns_cache import DnsCache
+from monitor.host_dispatch import HostDispatcher
+from monitor.http_pool import SessionPool
+from monitor.latency import LatencyStats, format_compact, format_summary
+from monitor.phases import PhaseTimer, format_phase_breakdown, record_phases
+from monitor.result_loop import drain_results, next_deadline
+from monitor.rotation import LogRotator, RotatingLogHandler
+from monitor.screen import ScreenRenderer
+from monitor.windowed import SlidingWindowStats, format_windows
+from monitor.worker_pool import WorkerPool
 
 LOG_FILENAME = "logs/fcfs-sitemanager.log"
 LOG_DIR = os.path.dirname(LOG_FILENAME)
 if LOG_DIR and not os.path.exists(LOG_DIR):
     os.makedirs(LOG_DIR, exist_ok=True)
 
+HTTP_POOL_SIZE = 10
+HTTP_POOL_IDLE_TIMEOUT = 30.0
+MAX_CHECKS_PER_HOST = 4
+PROBE_METHOD = "stream"
+PROBE_MAX_BYTES = 0
+PROBE_METHODS = {}
+DNS_CACHE_TTL = 300.0
+DNS_NEGATIVE_TTL = 30.0
+MAX_CHECK_WORKERS = 8
+FCFS_RECHECK_PERIOD = 10
+SCREEN_OVERFLOW = "paginate"
+SCREEN_FRAME_BUDGET_MS = 50
+STATS_BUCKET_SECONDS = 1.0
+STATS_WINDOWS = (60, 300, 900)
+ADAPTIVE_INTERVALS = True
+ADAPTIVE_MAX_INTERVAL = 120.0
+LOG_ROTATE_MAX_BYTES = 64 * 1024 * 1024
+LOG_ROTATE_MAX_AGE = None
+LOG_ROTATE_KEEP = 10
+LOG_ROTATE_MAX_TOTAL_BYTES = None
+LOG_ROTATE_COMPRESSION = "gzip"
+
+LOG_ROTATOR = LogRotator(
+    LOG_FILENAME,
+    max_bytes=LOG_ROTATE_MAX_BYTES,
+    max_age=LOG_ROTATE_MAX_AGE,
+    keep=LOG_ROTATE_KEEP,
+    max_total_bytes=LOG_ROTATE_MAX_TOTAL_BYTES,
+    compression=LOG_ROTATE_COMPRESSION,
+)
+
 logging.basicConfig(
-    filename=LOG_FILENAME,
-    filemode="w",
+    handlers=[RotatingLogHandler(LOG_ROTATOR, mode="w")],
     level=logging.INFO,
     format="%(asctime)s - %(threadName)s - %(levelname)s - %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
@@ -27,6 +68,22 @@ class SiteManager:
         self.lock = threading.Lock()
         self.status_dict = {}
         self.last_update = 0
+        self.dns = DnsCache(ttl=DNS_CACHE_TTL, negative_ttl=DNS_NEGATIVE_TTL)
+        self.http = SessionPool(
+            pool_size=HTTP_POOL_SIZE, idle_timeout=HTTP_POOL_IDLE_TIMEOUT, dns_cache=self.dns
+        )
+        self.pool = WorkerPool(
+            max_workers=min(MAX_CHECK_WORKERS, max(1, len(sites))),
+            ordering="fifo",
+            name_prefix="Check",
+        )
+        self.dispatcher = HostDispatcher(self.pool.submit, MAX_CHECKS_PER_HOST)
+        self.latency = LatencyStats()
+        self.site_recheck_period = FCFS_RECHECK_PERIOD
+        self.adaptive = AdaptiveIntervals(FCFS_RECHECK_PERIOD, ADAPTIVE_MAX_INTERVAL)
+        self.screen = ScreenRenderer(
+            overflow=SCREEN_OVERFLOW, frame_budget_ms=SCREEN_FRAME_BUDGET_MS
+        )
 
         self.timing_data = {
             "Success": {"count": 0, "total_time": 0.0},
@@ -34,18 +91,11 @@ class SiteManager:
             "Error": {"count": 0, "total_time": 0.0},
         }
 
-        self.current_cycle_category_timing = {
-            "Success": {"count": 0, "total_time": 0.0},
-            "Warning": {"count": 0, "total_time": 0.0},
-            "Error": {"count": 0, "total_time": 0.0},
-        }
-        self.last_cycle_category_timing_snapshot = {
-            "Success": {"count": 0, "total_time": 0.0},
-            "Warning": {"count": 0, "total_time": 0.0},
-            "Error": {"count": 0, "total_time": 0.0},
-        }
-        self.last_cycle_overall_avg_proc_log_time = None
-        self.last_cycle_overall_proc_log_count = 0
+        # tempos de processamento+log em baldes de 1s, por categoria ("Total"
+        # soma todas) e por site (chave ("site", url)); consultados em janelas
+        self.window_stats = SlidingWindowStats(
+            bucket_seconds=STATS_BUCKET_SECONDS, horizon_seconds=max(STATS_WINDOWS)
+        )
 
         for site in self.sites:
             self.status_dict[site] = {
@@ -55,15 +105,25 @@ class SiteManager:
         logging.info(f"SiteManager (FCFS) inicializado com {len(sites)} sites.")
         print(f"TERMINAL: SiteManager (FCFS) inicializado com {len(sites)} sites.")
 
-    def check_status_thread_target(self, site):
+    @staticmethod
+    def _probe_method(site):
+        if "uuidtools.com/api/generate/" in site:
+            return "get"
+        return PROBE_METHODS.get(site, PROBE_METHOD)
+
+    def check_status_thread_target(self, site, dispatched_at=None):
         thread_name = threading.current_thread().name
         logging.info(f"[{thread_name}] Iniciando checagem para o site: {site}")
         t_start_check_process = time.time()
         status_code_or_custom = "Erro Desconhecido"
         message = "Não foi possível obter o status."
         http_response_time_info = ""
+        elapsed_http_time = None
+        timer = PhaseTimer()
         try:
-            response = requests.get(site, timeout=10)
+            response = self.http.probe(
+                site, self._probe_method(site), timeout=10, max_bytes=PROBE_MAX_BYTES, timing=timer
+            )
             status_code_or_custom = response.status_code
             elapsed_http_time = response.elapsed.total_seconds()
             http_response_time_info = f"{elapsed_http_time:.2f}s HTTP"
@@ -100,22 +160,46 @@ class SiteManager:
             status_code_or_custom = -3
             message = f"Erro req: {type(e).__name__}"
             logging.error(f"[{thread_name}] ReqException {site}: {e}")
+        phases = timer.result()
+        self._record_latency(site, status_code_or_custom, elapsed_http_time, t_start_check_process, dispatched_at, phases)
+        if ADAPTIVE_INTERVALS:
+            self.adaptive.observe(
+                site,
+                status_code_or_custom,
+                elapsed_http_time,
+                now=dispatched_at,
+                base=self.site_recheck_period,
+            )
         final_log_message = f"[{thread_name}] Concluído {site}: Status {status_code_or_custom}, Msg: {message}"
         logging.info(final_log_message)
         t_end_log_process = time.time()
         duration_proc_and_log = t_end_log_process - t_start_check_process
         with self.lock:
             self.results.put(
-                (site, status_code_or_custom, message, duration_proc_and_log)
+                (site, status_code_or_custom, message, duration_proc_and_log, phases)
             )
 
-    def run_checks(self, screen_update_interval=1, site_recheck_period=10):
+    def _record_latency(self, site, status_val, elapsed_http_time, t_start, dispatched_at, phases=None):
+        if isinstance(status_val, int) and 200 <= status_val < 300:
+            category = "Success"
+        elif isinstance(status_val, int) and 400 <= status_val < 500:
+            category = "Warning"
+        else:
+            category = "Error"
+        if elapsed_http_time is not None:
+            self.latency.record("http", elapsed_http_time, site=site, category=category)
+        if dispatched_at is not None:
+            self.latency.record("wait", t_start - dispatched_at, site=site, category=category)
+        record_phases(self.latency, phases, site=site, category=category)
+
+    def run_checks(self, screen_update_interval=1, site_recheck_period=FCFS_RECHECK_PERIOD):
         if not self.sites:
             msg = "Nenhum site para checar. Encerrando run_checks."
             print(f"TERMINAL: {msg}")
             logging.info(msg)
             return
 
+        self.site_recheck_period = site_recheck_period
         logging.info(
             f"run_checks (FCFS) iniciado. Tela: {screen_update_interval}s. Rechecagem: {site_recheck_period}s."
         )
@@ -123,76 +207,59 @@ class SiteManager:
             f"TERMINAL: run_checks (FCFS). Tela: {screen_update_interval}s. Rechecagem: {site_recheck_period}s."
         )
 
+        self.pool.start()
+        logging.info(f"Pool de checagem com {self.pool.max_workers} workers iniciado.")
+        self.dns.prefetch(self.sites, wait=True)
         next_full_recheck_time = time.time()
-        active_threads_this_cycle = []
 
+        screen_dirty = True
         while True:
             current_time = time.time()
-            made_updates_to_status_dict = False
 
             if current_time >= next_full_recheck_time:
-                overall_total_duration_completed_cycle = 0
-                overall_item_count_completed_cycle = 0
-                for category_data in self.current_cycle_category_timing.values():
-                    overall_total_duration_completed_cycle += category_data[
-                        "total_time"
-                    ]
-                    overall_item_count_completed_cycle += category_data["count"]
-
-                if overall_item_count_completed_cycle > 0:
-                    self.last_cycle_overall_avg_proc_log_time = (
-                        overall_total_duration_completed_cycle
-                        / overall_item_count_completed_cycle
-                    )
-                    self.last_cycle_overall_proc_log_count = (
-                        overall_item_count_completed_cycle
-                    )
+                self.dns.prefetch(self.sites)
+                cycle_count, cycle_total = self.window_stats.window(
+                    "Total", site_recheck_period, now=current_time
+                )
+                if cycle_count > 0:
                     logging.info(
-                        f"Fim ciclo (FCFS). Geral Ciclo (Proc+Log): {self.last_cycle_overall_avg_proc_log_time:.3f}s ({self.last_cycle_overall_proc_log_count} itens)"
+                        f"Fim ciclo (FCFS). Últimos {site_recheck_period}s (Proc+Log): {cycle_total / cycle_count:.3f}s ({cycle_count} itens)"
                     )
                 else:
-                    self.last_cycle_overall_avg_proc_log_time = None
-                    self.last_cycle_overall_proc_log_count = 0
                     logging.info(
-                        "Fim ciclo (FCFS). Nenhum item com tempo no ciclo anterior (geral)."
+                        f"Fim ciclo (FCFS). Nenhum item com tempo nos últimos {site_recheck_period}s."
                     )
 
-                self.last_cycle_category_timing_snapshot = copy.deepcopy(
-                    self.current_cycle_category_timing
-                )
-                for category_key in self.current_cycle_category_timing:
-                    self.current_cycle_category_timing[category_key]["count"] = 0
-                    self.current_cycle_category_timing[category_key]["total_time"] = 0.0
-
                 logging.info(
                     f"--- Iniciando ciclo FCFS {len(self.sites)} sites às {time.strftime('%H:%M:%S')} ---"
                 )
-                print(
-                    f"TERMINAL: --- Novo ciclo FCFS {len(self.sites)} sites às {time.strftime('%H:%M:%S')} ---"
-                )
                 fcfs_dispatch_queue_for_cycle = queue.Queue()
                 for site_url in self.sites:
+                    # tolerância de 1s: o despacho do ciclo anterior começou um pouco depois de current_time
+                    if ADAPTIVE_INTERVALS and not self.adaptive.is_due(site_url, current_time + 1.0):
+                        continue
                     fcfs_dispatch_queue_for_cycle.put(site_url)
-                logging.info(f"Todos os {len(self.sites)} sites na fila FCFS.")
+                logging.info(
+                    f"{fcfs_dispatch_queue_for_cycle.qsize()} de {len(self.sites)} sites na fila FCFS."
+                )
                 with self.lock:
-                    self.results = queue.Queue()
-                active_threads_this_cycle.clear()
+                    stale, self.results = self.results, queue.Queue()
+                if self._apply_results(drain_results(stale, 0)):
+                    screen_dirty = True
                 while not fcfs_dispatch_queue_for_cycle.empty():
                     try:
                         site_to_check = fcfs_dispatch_queue_for_cycle.get_nowait()
-                        logging.info(f"FCFS: Despachando {site_to_check}")
-                        site_name_for_thread = (
-                            site_to_check.split("//")[-1]
-                            .replace(".", "-")
-                            .replace(":", "-")[:30]
-                        )
-                        thread = threading.Thread(
-                            target=self.check_status_thread_target,
-                            args=(site_to_check,),
-                            name=f"Check-{site_name_for_thread}",
-                        )
-                        active_threads_this_cycle.append(thread)
-                        thread.start()
+                        if self.dispatcher.submit(
+                            site_to_check,
+                            self.check_status_thread_target,
+                            site_to_check,
+                            time.time(),
+                        ):
+                            logging.info(f"FCFS: Despachando {site_to_check}")
+                        else:
+                            logging.info(
+                                f"FCFS: {site_to_check} ainda em andamento, não reenviado"
+                            )
                         fcfs_dispatch_queue_for_cycle.task_done()
                     except queue.Empty:
                         break
@@ -201,139 +268,159 @@ class SiteManager:
                     f"Checagens FCFS despachadas. Próximo ciclo ~{time.strftime('%H:%M:%S', time.localtime(next_full_recheck_time))}."
                 )
 
-            with self.lock:
-                while not self.results.empty():
-                    try:
-                        site, status_val, message_str, proc_log_duration_val = (
-                            self.results.get_nowait()
-                        )
-                        self.status_dict[site] = {
-                            "status": status_val,
-                            "message": message_str,
-                        }
-                        made_updates_to_status_dict = True
-
-                        if proc_log_duration_val is not None:
-                            category_for_timing = None
-                            if isinstance(status_val, int):
-                                if 200 <= status_val < 300:
-                                    category_for_timing = "Success"
-                                elif 400 <= status_val < 500:
-                                    category_for_timing = "Warning"
-                                elif 500 <= status_val < 600:
-                                    category_for_timing = "Error"
-
-                            if category_for_timing:
-                                self.timing_data[category_for_timing]["count"] += 1
-                                self.timing_data[category_for_timing][
-                                    "total_time"
-                                ] += proc_log_duration_val
-
-                                self.current_cycle_category_timing[category_for_timing][
-                                    "count"
-                                ] += 1
-                                self.current_cycle_category_timing[category_for_timing][
-                                    "total_time"
-                                ] += proc_log_duration_val
-                        self.results.task_done()
-                    except queue.Empty:
-                        break
-
-            if current_time - self.last_update >= screen_update_interval:
-                if made_updates_to_status_dict or self.last_update == 0:
-                    self.update_screen()
-                    self.last_update = current_time
+            deadline = next_deadline(
+                next_full_recheck_time, self.last_update, screen_update_interval, screen_dirty
+            )
+            if self._apply_results(drain_results(self.results, deadline)):
+                screen_dirty = True
 
-            time.sleep(0.1)
+            if screen_dirty and time.time() - self.last_update >= screen_update_interval:
+                self.update_screen()
+                self.last_update = time.time()
+                screen_dirty = False
 
-    def update_screen(self):
-        os.system("cls" if os.name == "nt" else "clear")
-        print("-" * 70)
-        print("          Site Manager (FCFS - Thread per Check)")
-        print("-" * 70)
+    def _apply_results(self, items):
+        """Aplica os resultados drenados de self.results; devolve quantos foram."""
+        for site, status_val, message_str, proc_log_duration_val, phases in items:
+            self.status_dict[site] = {
+                "status": status_val,
+                "message": message_str,
+                "phases": phases,
+            }
 
-        if not self.status_dict:
-            print("Nenhum site para exibir.")
-        else:
-            for site_url_disp, data_disp in self.status_dict.items():
-                status_val, message = data_disp["status"], data_disp["message"]
-                status_str = ""
+            if proc_log_duration_val is not None:
+                category_for_timing = None
                 if isinstance(status_val, int):
                     if 200 <= status_val < 300:
-                        status_str = f"\033[92m{status_val}\033[0m"
-                    elif status_val == -1:
-                        status_str = f"\033[91mErroConex\033[0m"
-                    elif status_val == -2:
-                        status_str = f"\033[91mTimeout\033[0m"
-                    elif status_val == -3:
-                        status_str = f"\033[91mReqError\033[0m"
+                        category_for_timing = "Success"
                     elif 400 <= status_val < 500:
-                        status_str = f"\033[93m{status_val}\033[0m"
+                        category_for_timing = "Warning"
                     elif 500 <= status_val < 600:
-                        status_str = f"\033[91m{status_val}\033[0m"
-                    else:
-                        status_str = str(status_val)
-                else:
-                    status_str = str(status_val)
-                display_site = (
-                    site_url_disp[:38] + "..."
-                    if len(site_url_disp) > 41
-                    else site_url_disp
-                )
-                print(f"- {display_site:<42}: {status_str:<18} ({message})")
+                        category_for_timing = "Error"
+
+                if category_for_timing:
+                    self.timing_data[category_for_timing]["count"] += 1
+                    self.timing_data[category_for_timing][
+                        "total_time"
+                    ] += proc_log_duration_val
 
-        print("-" * 70)
-        print("Tempo Médio de Processamento e Log do Status (Geral Acumulado):")
+                    self.window_stats.add(category_for_timing, proc_log_duration_val)
+                    self.window_stats.add("Total", proc_log_duration_val)
+                self.window_stats.add(("site", site), proc_log_duration_val)
+        return len(items)
+
+    @staticmethod
+    def _site_category(item):
+        status_val = item[1]["status"]
+        if isinstance(status_val, int):
+            if 200 <= status_val < 300:
+                return "ok"
+            if 400 <= status_val < 500:
+                return "aviso"
+            return "erro"
+        return "pendente"
+
+    def _status_str(self, status_val):
+        if isinstance(status_val, int):
+            if 200 <= status_val < 300:
+                return f"\033[92m{status_val}\033[0m"
+            elif status_val == -1:
+                return f"\033[91mErroConex\033[0m"
+            elif status_val == -2:
+                return f"\033[91mTimeout\033[0m"
+            elif status_val == -3:
+                return f"\033[91mReqError\033[0m"
+            elif 400 <= status_val < 500:
+                return f"\033[93m{status_val}\033[0m"
+            elif 500 <= status_val < 600:
+                return f"\033[91m{status_val}\033[0m"
+        return str(status_val)
+
+    def _format_site_row(self, item):
+        site_url_disp, data_disp = item
+        display_site = (
+            site_url_disp[:38] + "..."
+            if len(site_url_disp) > 41
+            else site_url_disp
+        )
+        return f"- {display_site:<42}: {self._status_str(data_disp['status']):<18} ({data_disp['message']}) {format_compact(self.latency.summary('http', site=site_url_disp))}"
+
+    def update_screen(self):
+        self.screen.begin_frame()
+        header = [
+            "-" * 70,
+            "          Site Manager (FCFS - Bounded Worker Pool)",
+            "-" * 70,
+        ]
+        items = list(self.status_dict.items())
+
+        footer = ["-" * 70]
+        footer.append("Tempo Médio de Processamento e Log do Status (Geral Acumulado):")
         for category, data in self.timing_data.items():
             if data["count"] > 0:
                 avg_time = data["total_time"] / data["count"]
-                print(f"  - {category:<10}: {avg_time:.3f}s ({data['count']} amostras)")
+                footer.append(f"  - {category:<10}: {avg_time:.3f}s ({data['count']} amostras)")
             else:
-                print(f"  - {category:<10}: N/A (0 amostras)")
+                footer.append(f"  - {category:<10}: N/A (0 amostras)")
 
-        print("-" * 70)
-        print(
-            "Tempo Médio de Processamento e Log do Status (Ciclo Anterior por Status):"
+        # estatísticas por subsistema, da mais útil para a menos: só entram as que cabem no terminal
+        details = ["-" * 70]
+        details.append(
+            "Tempo Médio de Processamento e Log do Status (Janelas Deslizantes):"
         )
-        if self.last_cycle_category_timing_snapshot:
-            data_found_in_cycle_snapshot = False
-            for category, data in self.last_cycle_category_timing_snapshot.items():
-                if data["count"] > 0:
-                    avg_time = data["total_time"] / data["count"]
-                    print(
-                        f"  - {category:<10}: {avg_time:.3f}s ({data['count']} itens no ciclo)"
-                    )
-                    data_found_in_cycle_snapshot = True
-                else:
-                    print(f"  - {category:<10}: N/A (0 itens no ciclo)")
-
-            if self.last_cycle_overall_avg_proc_log_time is not None:
-                print(
-                    f"  - Total Ciclo: {self.last_cycle_overall_avg_proc_log_time:.3f}s ({self.last_cycle_overall_proc_log_count} itens no ciclo)"
-                )
-            elif not data_found_in_cycle_snapshot:
-                print(f"  - Total Ciclo: N/A (sem itens com tempo no ciclo anterior)")
-        else:
-            print(
-                "  (Aguardando conclusão do primeiro ciclo para estatísticas por status)"
+        for category in list(self.timing_data) + ["Total"]:
+            details.append(
+                f"  - {category:<10}: {format_windows(self.window_stats, category, STATS_WINDOWS)}"
             )
 
-        print("-" * 70)
-        print(
+        details.append("-" * 70)
+        details.append("Percentis (HTTP | espera na fila do pool):")
+        for category in self.timing_data:
+            details.append(f"  - {category:<10}: HTTP {format_summary(self.latency.summary('http', category=category))}")
+            details.append(f"    {'':<10}  Espera {format_summary(self.latency.summary('wait', category=category))}")
+            details.append(f"    {'':<10}  {format_phase_breakdown(self.latency, category)}")
+
+        details.append("-" * 70)
+        details.append(self.pool.format_stats())
+        details.append(self.dispatcher.format_stats())
+        if ADAPTIVE_INTERVALS:
+            details.append(self.adaptive.format_stats())
+        details.append(self.http.format_stats())
+        details.append(self.dns.format_stats())
+        details.append(self.screen.format_stats())
+        if LOG_ROTATOR.rotations:
+            details.append(LOG_ROTATOR.format_stats())
+
+        tail = ["-" * 70]
+        tail.append(
             f"Última atualização da tela: {time.strftime('%H:%M:%S', time.localtime(self.last_update if self.last_update else time.time()))}"
         )
         try:
             log_mtime = os.path.getmtime(LOG_FILENAME)
-            print(
+            tail.append(
                 f"Última escrita no log:      {time.strftime('%H:%M:%S', time.localtime(log_mtime))}"
             )
         except FileNotFoundError:
-            print(
+            tail.append(
                 f"Última escrita no log:      (arquivo '{LOG_FILENAME}' não encontrado)"
             )
         except Exception as e:
-            print(f"Última escrita no log:      (erro ao ler: {e})")
-        print("Pressione Ctrl+C para sair.")
+            tail.append(f"Última escrita no log:      (erro ao ler: {e})")
+        tail.append("Pressione Ctrl+C para sair.")
+        footer += self.screen.fit_details(len(header) + len(footer) + len(tail), details) + tail
+
+        if not items:
+            lines = header + ["Nenhum site para exibir."]
+        else:
+            visible, overflow_line = self.screen.select_rows(
+                items,
+                self.screen.rows_available(len(header) + len(footer)),
+                category=self._site_category,
+            )
+            lines = header + [self._format_site_row(item) for item in visible]
+            if overflow_line:
+                lines.append(overflow_line)
+        self.screen.render(lines + footer, pinned=len(tail))
 
 
 if __name__ == "__main__":
@@ -357,7 +444,7 @@ if __name__ == "__main__":
     ]
     manager = SiteManager(sites_to_check)
     try:
-        manager.run_checks(screen_update_interval=1, site_recheck_period=10)
+        manager.run_checks(screen_update_interval=1, site_recheck_period=FCFS_RECHECK_PERIOD)
     except KeyboardInterrupt:
         print("\nTERMINAL: Saindo...")
         logging.info("Execução interrompida (Ctrl+C).")
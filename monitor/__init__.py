@@ -0,0 +1 @@
+"""Componentes compartilhados entre as variantes do Site Manager."""
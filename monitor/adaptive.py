@@ -0,0 +1,142 @@
+import threading
+import time
+
+
+class _SiteInterval:
+    __slots__ = ("interval", "base", "last_status", "stable", "samples", "mean", "deviation", "next_due")
+
+    def __init__(self, base):
+        self.interval = base
+        self.base = base
+        self.last_status = None
+        self.stable = 0
+        self.samples = 0
+        self.mean = 0.0
+        self.deviation = 0.0
+        self.next_due = 0.0
+
+
+class AdaptiveIntervals:
+    """
+    Intervalo de checagem por site que cresce exponencialmente (backoff) a cada
+    stable_after checagens estáveis seguidas, até max_interval, e volta ao
+    intervalo base em qualquer mudança de status ou anomalia de latência
+    (acima da média móvel + anomaly_sigmas desvios e anomaly_factor vezes a
+    média). Conta quantas checagens o agendamento fixo teria feito no mesmo
+    período para medir a economia.
+    """
+
+    def __init__(
+        self,
+        base_interval,
+        max_interval,
+        backoff=2.0,
+        stable_after=3,
+        anomaly_factor=2.0,
+        anomaly_sigmas=4.0,
+        min_anomaly_delta=0.05,
+        alpha=0.2,
+        clock=time.time,
+    ):
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.stable_after = stable_after
+        self.anomaly_factor = anomaly_factor
+        self.anomaly_sigmas = anomaly_sigmas
+        self.min_anomaly_delta = min_anomaly_delta
+        self.alpha = alpha
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._sites = {}
+
+        self.checks = 0
+        self.fixed_equivalent = 0.0
+        self.snapbacks = 0
+        self.anomalies = 0
+
+    def _state(self, site, base=None):
+        state = self._sites.get(site)
+        if state is None:
+            state = self._sites[site] = _SiteInterval(base or self.base_interval)
+        elif base is not None:
+            state.base = base
+        return state
+
+    def _is_anomaly(self, state, latency):
+        if state.samples < self.stable_after:
+            return False
+        excess = latency - state.mean
+        return (
+            excess > self.min_anomaly_delta
+            and excess > self.anomaly_sigmas * state.deviation
+            and latency > self.anomaly_factor * state.mean
+        )
+
+    def observe(self, site, status, latency=None, now=None, base=None):
+        """Registra o resultado de uma checagem e devolve o próximo intervalo do site."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            state = self._state(site, base)
+            # a checagem que acabou cobriu state.interval segundos de agenda fixa
+            self.checks += 1
+            self.fixed_equivalent += state.interval / state.base
+
+            changed = state.last_status is not None and status != state.last_status
+            anomaly = latency is not None and self._is_anomaly(state, latency)
+            if anomaly:
+                self.anomalies += 1
+            if latency is not None:
+                if state.samples == 0:
+                    state.mean = latency
+                else:
+                    state.deviation += self.alpha * (abs(latency - state.mean) - state.deviation)
+                    state.mean += self.alpha * (latency - state.mean)
+                state.samples += 1
+            state.last_status = status
+
+            if changed or anomaly:
+                if state.interval > state.base:
+                    self.snapbacks += 1
+                state.interval = state.base
+                state.stable = 0
+            else:
+                state.stable += 1
+                if state.stable >= self.stable_after:
+                    state.interval = min(state.interval * self.backoff, max(self.max_interval, state.base))
+                    state.stable = 0
+            state.next_due = now + state.interval
+            return state.interval
+
+    def interval_for(self, site):
+        with self._lock:
+            state = self._sites.get(site)
+            return state.interval if state is not None else self.base_interval
+
+    def is_due(self, site, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            state = self._sites.get(site)
+            return state is None or state.next_due <= now
+
+    def stats(self):
+        with self._lock:
+            saved = max(0.0, self.fixed_equivalent - self.checks)
+            return {
+                "checks": self.checks,
+                "fixed_equivalent": self.fixed_equivalent,
+                "saved": saved,
+                "saved_ratio": saved / self.fixed_equivalent if self.fixed_equivalent else 0.0,
+                "snapbacks": self.snapbacks,
+                "anomalies": self.anomalies,
+                "at_max": sum(1 for s in self._sites.values() if s.interval >= max(self.max_interval, s.base)),
+                "sites": len(self._sites),
+            }
+
+    def format_stats(self):
+        s = self.stats()
+        return (
+            f"Intervalos adaptativos: {s['checks']} checagens, ~{s['saved']:.0f} economizadas vs. agenda fixa "
+            f"({s['saved_ratio']:.0%}) | {s['at_max']}/{s['sites']} sites no intervalo máximo | "
+            f"{s['snapbacks']} retornos ao intervalo base ({s['anomalies']} anomalias de latência)"
+        )
@@ -0,0 +1,307 @@
+import asyncio
+import ssl
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+
+from monitor.phases import PhaseTimer
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_CONCURRENCY = 1000
+MAX_REDIRECTS = 30
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+USER_AGENT = "site-manager-async/1.0"
+
+
+class CheckError(Exception):
+    def __init__(self, kind, detail=""):
+        super().__init__(f"{kind}: {detail}" if detail else kind)
+        self.kind = kind
+
+
+class CheckTimeout(CheckError):
+    pass
+
+
+class CheckConnectionError(CheckError):
+    pass
+
+
+class CheckRequestError(CheckError):
+    pass
+
+
+class AsyncResponse:
+    __slots__ = ("url", "status_code", "elapsed", "headers", "content", "timing")
+
+    def __init__(self, url, status_code, elapsed, headers, content, timing=None):
+        self.url = url
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.headers = headers
+        self.content = content
+        self.timing = timing
+
+
+_ssl_context = None
+
+
+def _get_ssl_context():
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+def _split_target(url):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise CheckRequestError("InvalidURL", url)
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError:
+        raise CheckRequestError("InvalidURL", url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{port}"
+    return parts.scheme, parts.hostname, port, path, host_header
+
+
+async def _read_body(reader, headers):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            try:
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise CheckRequestError("ChunkedEncodingError")
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        return b"".join(chunks)
+    if "content-length" in headers:
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            raise CheckRequestError("InvalidHeader", "content-length")
+        return await reader.readexactly(length)
+    return await reader.read()
+
+
+async def _read_prefix(reader, headers, max_bytes):
+    """Primeiros max_bytes do corpo (sem decodificar chunked), para sondagens."""
+    if not max_bytes:
+        return b""
+    length = headers.get("content-length", "")
+    if length.isdigit():
+        return await reader.readexactly(min(int(length), max_bytes))
+    return await reader.read(max_bytes)
+
+
+async def _open_connection(host, port, ssl_context, dns_cache, timer):
+    # TCP e TLS em dois passos (start_tls) para medir cada fase em separado
+    if dns_cache is None:
+        # sem cache, a resolução acontece dentro da conexão e entra nela
+        timer.begin("connect")
+        reader, writer = await asyncio.open_connection(host, port, limit=2**20)
+    else:
+        timer.begin("dns")
+        addresses = dns_cache.cached(host)
+        if addresses is None:
+            addresses = await asyncio.get_running_loop().run_in_executor(None, dns_cache.resolve, host)
+        timer.begin("connect")
+        error = OSError(f"sem endereços para {host}")
+        for address in addresses:
+            try:
+                reader, writer = await asyncio.open_connection(address, port, limit=2**20)
+                break
+            except OSError as e:
+                error = e
+        else:
+            raise error
+    if ssl_context is not None:
+        timer.begin("tls")
+        try:
+            await writer.start_tls(ssl_context, server_hostname=host)
+        except BaseException:
+            writer.close()
+            raise
+    timer.end()
+    return reader, writer
+
+
+async def _request_once(url, method, max_bytes=None, dns_cache=None, timer=None):
+    scheme, host, port, path, host_header = _split_target(url)
+    timer = timer if timer is not None else PhaseTimer()
+    t_start = time.perf_counter()
+    ssl_context = _get_ssl_context() if scheme == "https" else None
+    reader, writer = await _open_connection(host, port, ssl_context, dns_cache, timer)
+    try:
+        timer.begin("ttfb")
+        writer.write(
+            (
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {host_header}\r\n"
+                f"User-Agent: {USER_AGENT}\r\n"
+                "Accept: */*\r\n"
+                "Accept-Encoding: identity\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+        )
+        await writer.drain()
+
+        head = await reader.readuntil(b"\r\n\r\n")
+        elapsed = time.perf_counter() - t_start
+        timer.begin("body")
+        lines = head.decode("latin-1").split("\r\n")
+        status_parts = lines[0].split(" ", 2)
+        if len(status_parts) < 2 or not status_parts[0].startswith("HTTP/"):
+            raise CheckRequestError("InvalidResponse", lines[0])
+        try:
+            status_code = int(status_parts[1])
+        except ValueError:
+            raise CheckRequestError("InvalidResponse", lines[0])
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if method == "HEAD" or status_code in (204, 304) or 100 <= status_code < 200:
+            content = b""
+        elif max_bytes is not None and status_code not in REDIRECT_CODES:
+            content = await _read_prefix(reader, headers, max_bytes)
+        else:
+            content = await _read_body(reader, headers)
+        timer.end()
+        return AsyncResponse(url, status_code, elapsed, headers, content)
+    finally:
+        writer.close()
+
+
+async def _follow_redirects(url, method, max_bytes=None, dns_cache=None, timer=None):
+    for _ in range(MAX_REDIRECTS + 1):
+        response = await _request_once(url, method, max_bytes, dns_cache, timer)
+        location = response.headers.get("location")
+        if response.status_code not in REDIRECT_CODES or not location:
+            return response
+        url = urljoin(url, location)
+        if response.status_code == 303:
+            method = "GET"
+    raise CheckRequestError("TooManyRedirects", url)
+
+
+async def fetch(url, timeout=DEFAULT_TIMEOUT, method="GET", max_bytes=None, dns_cache=None, timing=None):
+    """
+    Equivalente assíncrono de requests.get para as checagens de status.
+    Segue redirecionamentos como o requests e traduz as falhas para
+    CheckTimeout / CheckConnectionError / CheckRequestError. Com max_bytes,
+    lê só os primeiros max_bytes do corpo (0: nenhum) e fecha a conexão. Com
+    dns_cache (monitor/dns_cache.py), o host é resolvido pelo cache. As fases
+    vão para `timing` (PhaseTimer, preenchido também nas falhas) e ficam em
+    response.timing.
+    """
+    timer = timing if timing is not None else PhaseTimer()
+    try:
+        response = await _fetch(url, timeout, method, max_bytes, dns_cache, timer)
+        response.timing = timer.result()
+        return response
+    except BaseException:
+        timer.fail()
+        raise
+
+
+async def _fetch(url, timeout, method, max_bytes, dns_cache, timer):
+    try:
+        return await asyncio.wait_for(_follow_redirects(url, method, max_bytes, dns_cache, timer), timeout)
+    except asyncio.TimeoutError:
+        raise CheckTimeout("Timeout", url)
+    except CheckError:
+        raise
+    except asyncio.IncompleteReadError as e:
+        raise CheckRequestError("ChunkedEncodingError", str(e))
+    except asyncio.LimitOverrunError as e:
+        raise CheckRequestError("InvalidResponse", str(e))
+    except (OSError, ssl.SSLError) as e:
+        raise CheckConnectionError(type(e).__name__, str(e))
+
+
+async def probe(url, method="stream", timeout=DEFAULT_TIMEOUT, max_bytes=0, dns_cache=None, timing=None):
+    """Mesmos métodos (e `timing`) de SessionPool.probe: "get", "head" ou "stream"."""
+    if method == "get":
+        return await fetch(url, timeout, dns_cache=dns_cache, timing=timing)
+    if method == "head":
+        response = await fetch(url, timeout, method="HEAD", dns_cache=dns_cache, timing=timing)
+        if response.status_code not in (405, 501):
+            return response
+    elif method != "stream":
+        raise ValueError(f"método de sondagem desconhecido: {method!r}")
+    return await fetch(url, timeout, max_bytes=max_bytes, dns_cache=dns_cache, timing=timing)
+
+
+class AsyncCheckEngine:
+    """
+    Executa corrotinas de checagem em um único event loop rodando em uma
+    thread dedicada, limitando o número de checagens simultâneas.
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self.loop = None
+        self._thread = None
+        self._semaphore = None
+        self._ready = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="AsyncCheckEngine", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._ready.set()
+        self.loop.run_forever()
+
+    async def _guarded(self, coro_fn, args):
+        async with self._semaphore:
+            return await coro_fn(*args)
+
+    def submit(self, coro_fn, *args):
+        """Agenda coro_fn(*args) no loop e retorna um concurrent.futures.Future."""
+        if self.loop is None:
+            raise RuntimeError("AsyncCheckEngine não foi iniciado")
+        return asyncio.run_coroutine_threadsafe(self._guarded(coro_fn, args), self.loop)
+
+    def stop(self, timeout=5):
+        if self.loop is None:
+            return
+        loop = self.loop
+
+        async def _cancel_pending():
+            current = asyncio.current_task()
+            pending = [t for t in asyncio.all_tasks() if t is not current]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+        self.loop = None
+        self._thread = None
+        self._ready.clear()
@@ -0,0 +1,206 @@
+"""
+Formato binário de registros de log (alternativa ao texto de LogEntry.to_file_str).
+
+O arquivo começa com MAGIC e é uma sequência de registros com tag:
+  b"S" id:u32 tamanho:u16 utf-8   -> define o site de id
+  b"M" id:u32 tamanho:u16 utf-8   -> define o modelo de mensagem de id
+  b"R" timestamp:f64 status:i16 site:u32 mensagem:u32 valor:f64
+
+Sites e mensagens são internados em tabelas laterais e definidos uma única vez,
+antes do primeiro registro que os usa. O tempo HTTP que aparece nas mensagens
+("Online - 0.123s") vira o campo valor e a mensagem guarda só o modelo
+("Online - {0:.3f}s"), então a tabela de mensagens fica pequena.
+
+Conversão:
+    python -m monitor.binlog to-bin logs/error.log logs/error.bin
+    python -m monitor.binlog to-text logs/error.bin logs/error.txt
+"""
+import argparse
+import math
+import re
+import struct
+import sys
+
+from monitor.status_codes import decode_status, encode_status
+
+MAGIC = b"SMLB\x01"
+RECORD = struct.Struct("<dhIId")
+DEFINITION = struct.Struct("<IH")
+TAG_RECORD = b"R"[0]
+TAG_SITE = b"S"[0]
+TAG_MESSAGE = b"M"[0]
+RECORD_SIZE = 1 + RECORD.size
+MAX_TEXT = 0xFFFF
+
+_ELAPSED_RE = re.compile(r"(\d+)\.(\d+)s")
+
+
+def split_message(message):
+    """'Online - 0.123s' -> ('Online - {0:.3f}s', 0.123); sem tempo -> (mensagem escapada, nan)."""
+    matches = list(_ELAPSED_RE.finditer(message))
+    if not matches:
+        return message.replace("{", "{{").replace("}", "}}"), math.nan
+    match = matches[-1]
+    prefix = message[:match.start()].replace("{", "{{").replace("}", "}}")
+    suffix = message[match.end():].replace("{", "{{").replace("}", "}}")
+    template = f"{prefix}{{0:.{len(match.group(2))}f}}s{suffix}"
+    value = float(f"{match.group(1)}.{match.group(2)}")
+    if template.format(value) != message:
+        return message.replace("{", "{{").replace("}", "}}"), math.nan
+    return template, value
+
+
+def join_message(template, value):
+    return template.format(value) if not math.isnan(value) else template.format()
+
+
+class BinaryLogEncoder:
+    def __init__(self):
+        self._sites = {}
+        self._messages = {}
+        self._header_written = False
+
+    def _intern(self, table, tag, text, out):
+        ident = table.get(text)
+        if ident is None:
+            ident = len(table)
+            table[text] = ident
+            data = text.encode("utf-8")
+            if len(data) > MAX_TEXT:
+                # corta em um limite de caractere para o decodificador não falhar no UTF-8 partido
+                data = data[:MAX_TEXT].decode("utf-8", "ignore").encode("utf-8")
+            out.append(bytes((tag,)) + DEFINITION.pack(ident, len(data)) + data)
+        return ident
+
+    def encode(self, timestamp, status, site, message):
+        out = []
+        if not self._header_written:
+            out.append(MAGIC)
+            self._header_written = True
+        template, value = split_message(message)
+        site_id = self._intern(self._sites, TAG_SITE, site, out)
+        message_id = self._intern(self._messages, TAG_MESSAGE, template, out)
+        out.append(bytes((TAG_RECORD,)) + RECORD.pack(timestamp, encode_status(status), site_id, message_id, value))
+        return b"".join(out)
+
+
+class BinaryLogDecoder:
+    """Decodificador incremental: feed() aceita blocos arbitrários e devolve os registros completos."""
+
+    def __init__(self):
+        self._sites = []
+        self._messages = []
+        self._formatters = []
+        self._buffer = b""
+        self._header_checked = False
+
+    def feed(self, data):
+        buffer = self._buffer + data if self._buffer else data
+        pos = 0
+        if not self._header_checked:
+            if len(buffer) < len(MAGIC):
+                self._buffer = buffer
+                return []
+            if buffer[:len(MAGIC)] != MAGIC:
+                raise ValueError("Arquivo não está no formato binário de log")
+            pos = len(MAGIC)
+            self._header_checked = True
+
+        records = []
+        size = len(buffer)
+        sites, formatters = self._sites, self._formatters
+        unpack_record = RECORD.unpack_from
+        isnan = math.isnan
+        while pos < size:
+            tag = buffer[pos]
+            if tag == TAG_RECORD:
+                if pos + RECORD_SIZE > size:
+                    break
+                timestamp, status, site_id, message_id, value = unpack_record(buffer, pos + 1)
+                message = formatters[message_id]() if isnan(value) else formatters[message_id](value)
+                records.append((timestamp, status if status < 1000 else decode_status(status), sites[site_id], message))
+                pos += RECORD_SIZE
+            elif tag == TAG_SITE or tag == TAG_MESSAGE:
+                if pos + 1 + DEFINITION.size > size:
+                    break
+                ident, length = DEFINITION.unpack_from(buffer, pos + 1)
+                end = pos + 1 + DEFINITION.size + length
+                if end > size:
+                    break
+                table = sites if tag == TAG_SITE else self._messages
+                text = buffer[end - length:end].decode("utf-8")
+                if ident != len(table):
+                    raise ValueError(f"Definição fora de ordem (id {ident}) na posição {pos}")
+                table.append(text)
+                if tag == TAG_MESSAGE:
+                    formatters.append(text.format)
+                pos = end
+            else:
+                raise ValueError(f"Tag desconhecida {tag!r} na posição {pos}")
+        self._buffer = buffer[pos:]
+        return records
+
+
+def iter_binary_file(path, chunk_size=1 << 16):
+    decoder = BinaryLogDecoder()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield from decoder.feed(chunk)
+
+
+def parse_text_line(line):
+    parts = line.rstrip("\n").split("|", 3)
+    if len(parts) != 4:
+        return None
+    timestamp, status, site, message = parts
+    try:
+        timestamp = float(timestamp)
+    except ValueError:
+        return None
+    try:
+        status = int(status)
+    except ValueError:
+        pass
+    return timestamp, status, site, message
+
+
+def text_to_binary(src, dst):
+    encoder = BinaryLogEncoder()
+    count = 0
+    with open(src, "r", encoding="utf-8") as fin, open(dst, "wb") as fout:
+        for line in fin:
+            record = parse_text_line(line)
+            if record is None:
+                continue
+            fout.write(encoder.encode(*record))
+            count += 1
+        if count == 0:
+            fout.write(MAGIC)
+    return count
+
+
+def binary_to_text(src, dst):
+    count = 0
+    with open(dst, "w", encoding="utf-8") as fout:
+        for timestamp, status, site, message in iter_binary_file(src):
+            fout.write(f"{timestamp}|{status}|{site}|{message}\n")
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converte logs de status entre texto e binário.")
+    parser.add_argument("direction", choices=("to-bin", "to-text"))
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    args = parser.parse_args(argv)
+    convert = text_to_binary if args.direction == "to-bin" else binary_to_text
+    count = convert(args.src, args.dst)
+    print(f"{count} registros convertidos: {args.src} -> {args.dst}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
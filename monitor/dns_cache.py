@@ -0,0 +1,224 @@
+import ipaddress
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_TTL = 300.0
+DEFAULT_NEGATIVE_TTL = 30.0
+DEFAULT_REFRESH_AHEAD = 10.0
+
+# erros que significam "o nome não existe"; falhas temporárias (EAI_AGAIN)
+# não entram no cache negativo
+_NEGATIVE_ERRNOS = {
+    getattr(socket, name) for name in ("EAI_NONAME", "EAI_NODATA") if hasattr(socket, name)
+}
+
+
+class _Entry:
+    __slots__ = ("addresses", "error", "expires")
+
+    def __init__(self, addresses, error, expires):
+        self.addresses = addresses
+        self.error = error
+        self.expires = expires
+
+
+def _is_ip(host):
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+def host_of(url):
+    return urlsplit(url).hostname
+
+
+class DnsCache:
+    """
+    Cache de resolução de nomes compartilhado pelo processo (SessionPool e motor
+    asyncio). getaddrinfo não informa o TTL dos registros, então cada entrada
+    vale ttl segundos; NXDOMAIN fica negative_ttl segundos no cache negativo.
+    Consultas simultâneas ao mesmo host esperam uma única resolução, e
+    prefetch() renova em segundo plano as entradas que vencem em menos de
+    refresh_ahead segundos, para que a checagem não pague a consulta.
+    """
+
+    def __init__(
+        self,
+        ttl=DEFAULT_TTL,
+        negative_ttl=DEFAULT_NEGATIVE_TTL,
+        refresh_ahead=DEFAULT_REFRESH_AHEAD,
+        family=socket.AF_UNSPEC,
+        resolver=socket.getaddrinfo,
+        clock=time.monotonic,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.refresh_ahead = refresh_ahead
+        self.family = family
+        self._resolver = resolver
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._in_flight = {}
+        self._prefetching = False
+
+        self.lookups = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.resolutions = 0
+        self.resolve_seconds = 0.0
+
+    def _resolve(self, host):
+        """Consulta o resolver e grava a entrada; devolve a _Entry."""
+        t_start = time.perf_counter()
+        try:
+            infos = self._resolver(host, None, self.family, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            addresses, error = None, e
+            ttl = self.negative_ttl if e.errno in _NEGATIVE_ERRNOS else None
+        else:
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            error, ttl = None, self.ttl
+        seconds = time.perf_counter() - t_start
+        entry = _Entry(addresses, error, self._clock() + (ttl or 0.0))
+        with self._lock:
+            self.resolutions += 1
+            self.resolve_seconds += seconds
+            if ttl:
+                self._entries[host] = entry
+        return entry
+
+    @staticmethod
+    def _result(entry):
+        if entry.error is not None:
+            raise socket.gaierror(entry.error.errno, entry.error.strerror)
+        return entry.addresses
+
+    def cached(self, host):
+        """Endereços do cache sem bloquear: lista, None (não está no cache) ou gaierror (NXDOMAIN)."""
+        if _is_ip(host):
+            return [host]
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None or entry.expires <= self._clock():
+                return None
+            self.lookups += 1
+            if entry.error is not None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+        return self._result(entry)
+
+    def _resolve_shared(self, host):
+        """Resolve host uma única vez mesmo com várias threads pedindo ao mesmo tempo."""
+        with self._lock:
+            waiter = self._in_flight.get(host)
+            if waiter is None:
+                done = self._in_flight[host] = threading.Event()
+        if waiter is not None:
+            waiter.wait()
+            with self._lock:
+                return self._entries.get(host), False
+        try:
+            return self._resolve(host), True
+        finally:
+            with self._lock:
+                self._in_flight.pop(host, None)
+            done.set()
+
+    def resolve(self, host):
+        """Lista de endereços IP de host; levanta socket.gaierror como getaddrinfo."""
+        if _is_ip(host):
+            return [host]
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get(host)
+            if entry is not None and entry.expires > self._clock():
+                if entry.error is not None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                return self._result(entry)
+        entry, resolved_here = self._resolve_shared(host)
+        if entry is None:
+            # a resolução de outra thread falhou sem entrar no cache (erro temporário)
+            entry, resolved_here = self._resolve(host), True
+        with self._lock:
+            if resolved_here:
+                self.misses += 1
+            elif entry.error is not None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+        return self._result(entry)
+
+    def stale_hosts(self, hosts, now=None):
+        now = self._clock() if now is None else now
+        limit = now + self.refresh_ahead
+        with self._lock:
+            return [
+                host for host in dict.fromkeys(hosts)
+                if host and not _is_ip(host) and host not in self._in_flight
+                and (host not in self._entries or self._entries[host].expires <= limit)
+            ]
+
+    def prefetch(self, urls, wait=False):
+        """
+        Resolve em uma thread de fundo os hosts das URLs que não estão no cache
+        ou vencem em breve. Chamado antes de cada ciclo de checagens; com
+        wait=True resolve na thread atual.
+        """
+        stale = self.stale_hosts(host_of(url) for url in urls)
+        if not stale:
+            return 0
+        with self._lock:
+            if self._prefetching:
+                return 0
+            self._prefetching = True
+
+        def run():
+            try:
+                for host in stale:
+                    _, resolved_here = self._resolve_shared(host)
+                    if resolved_here:
+                        with self._lock:
+                            self.prefetched += 1
+            finally:
+                with self._lock:
+                    self._prefetching = False
+
+        if wait:
+            run()
+        else:
+            threading.Thread(target=run, name="DnsPrefetch", daemon=True).start()
+        return len(stale)
+
+    def stats(self):
+        with self._lock:
+            avoided = self.hits + self.negative_hits
+            avg = self.resolve_seconds / self.resolutions if self.resolutions else 0.0
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "avoided": avoided,
+                "prefetched": self.prefetched,
+                "hosts": len(self._entries),
+                "avg_resolve": avg,
+                "saved_seconds": avoided * avg,
+            }
+
+    def format_stats(self):
+        s = self.stats()
+        return (
+            f"DNS: {s['avoided']}/{s['lookups']} consultas evitadas ({s['negative_hits']} negativas) | "
+            f"~{s['saved_seconds']:.3f}s economizados (média {s['avg_resolve'] * 1000:.1f}ms/consulta) | "
+            f"{s['prefetched']} pré-carregadas, {s['hosts']} hosts no cache"
+        )
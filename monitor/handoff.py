@@ -0,0 +1,72 @@
+import collections
+import threading
+import time
+
+DEFAULT_SEGMENT_SIZE = 4096
+
+
+class SegmentLog:
+    """
+    Log em memória, append-only, dividido em segmentos de tamanho fixo, que
+    passa os registros (objetos, sem texto) dos escritores para um único
+    consumidor. O consumidor guarda o offset do último registro lido e só
+    recebe o que chegou depois dele; segmentos já consumidos são descartados.
+
+    O lock protege apenas a lista de segmentos e o offset final: append é O(1)
+    e a leitura copia só as referências dos segmentos pendentes, fatiando-os
+    fora do lock.
+    """
+
+    def __init__(self, segment_size=DEFAULT_SEGMENT_SIZE):
+        self.segment_size = segment_size
+        self._segments = collections.deque()
+        self._base_offset = 0
+        self._end_offset = 0
+        self._lock = threading.Lock()
+
+        self.max_lock_hold = 0.0
+        self.last_read_lock_hold = 0.0
+
+    def append_many(self, records):
+        t_start = time.perf_counter()
+        with self._lock:
+            for record in records:
+                if not self._segments or len(self._segments[-1]) >= self.segment_size:
+                    self._segments.append([])
+                self._segments[-1].append(record)
+            self._end_offset += len(records)
+            held = time.perf_counter() - t_start
+            if held > self.max_lock_hold:
+                self.max_lock_hold = held
+
+    def append(self, record):
+        self.append_many((record,))
+
+    @property
+    def end_offset(self):
+        return self._end_offset
+
+    def read_since(self, offset):
+        """Retorna (registros após offset, novo offset)."""
+        t_start = time.perf_counter()
+        with self._lock:
+            end = self._end_offset
+            while len(self._segments) > 1 and self._base_offset + len(self._segments[0]) <= offset:
+                self._base_offset += len(self._segments.popleft())
+            base = self._base_offset
+            segments = list(self._segments)
+            held = time.perf_counter() - t_start
+            self.last_read_lock_hold = held
+            if held > self.max_lock_hold:
+                self.max_lock_hold = held
+
+        records = []
+        position = base
+        for segment in segments:
+            segment_end = min(position + len(segment), end)
+            if segment_end > offset:
+                records.extend(segment[max(0, offset - position):segment_end - position])
+            position += len(segment)
+            if position >= end:
+                break
+        return records, end
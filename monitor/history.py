@@ -0,0 +1,277 @@
+"""
+Histórico durável dos resultados em SQLite (modo WAL), que sobrevive ao
+reinício do monitor e ao truncamento dos logs por categoria.
+
+As threads escritoras entregam lotes com add_many() (só um put numa fila); uma
+thread própria grava tudo o que estiver na fila em uma única transação e, na
+mesma transação, soma o lote aos rollups de 1 minuto e de 1 hora (contagem por
+categoria e soma/máximo da latência). De tempos em tempos apaga o que passou
+da retenção de cada nível. As consultas por site e intervalo usam o índice
+(site_id, ts) e rodam em conexões de leitura próprias, que o WAL não bloqueia:
+
+    python -m monitor.history logs/history.db [site] [--since 3600] [--resolution raw|1m|1h]
+"""
+import argparse
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from monitor.result_loop import drain_results
+
+CATEGORIES = ("success", "warning", "error")
+RESOLUTIONS = {"1m": 60, "1h": 3600}
+DEFAULT_RETENTION = {"raw": 24 * 3600, "1m": 7 * 24 * 3600, "1h": 365 * 24 * 3600}
+
+HistoryRow = namedtuple("HistoryRow", ("ts", "status", "latency", "category"))
+RollupRow = namedtuple("RollupRow", ("start", "count", "success", "warning", "error", "latency_mean", "latency_max"))
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS sites (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS results "
+    "(site_id INTEGER NOT NULL, ts REAL NOT NULL, status, latency REAL, category INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS results_site_ts ON results (site_id, ts)",
+    "CREATE INDEX IF NOT EXISTS results_ts ON results (ts)",
+]
+for _resolution in RESOLUTIONS:
+    _SCHEMA += [
+        f"CREATE TABLE IF NOT EXISTS rollup_{_resolution} (site_id INTEGER NOT NULL, bucket INTEGER NOT NULL, "
+        "count INTEGER NOT NULL, success INTEGER NOT NULL, warning INTEGER NOT NULL, error INTEGER NOT NULL, "
+        "latency_count INTEGER NOT NULL, latency_sum REAL NOT NULL, latency_max REAL, "
+        "PRIMARY KEY (site_id, bucket)) WITHOUT ROWID",
+        f"CREATE INDEX IF NOT EXISTS rollup_{_resolution}_bucket ON rollup_{_resolution} (bucket)",
+    ]
+
+_UPSERT = (
+    "INSERT INTO rollup_{0} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (site_id, bucket) DO UPDATE SET "
+    "count = count + excluded.count, success = success + excluded.success, "
+    "warning = warning + excluded.warning, error = error + excluded.error, "
+    "latency_count = latency_count + excluded.latency_count, latency_sum = latency_sum + excluded.latency_sum, "
+    "latency_max = max(coalesce(latency_max, excluded.latency_max), coalesce(excluded.latency_max, latency_max))"
+)
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class HistoryReader:
+    """Consultas por site e intervalo; cada thread usa a sua conexão."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.path)
+        return conn
+
+    def sites(self):
+        """{site: total de resultados brutos guardados}."""
+        rows = self._reader().execute(
+            "SELECT name, (SELECT count(*) FROM results WHERE site_id = sites.id) FROM sites ORDER BY name"
+        )
+        return dict(rows)
+
+    def query(self, site, start, end):
+        """Resultados brutos de um site com start <= ts < end, em ordem de tempo."""
+        rows = self._reader().execute(
+            "SELECT ts, status, latency, category FROM results WHERE site_id = "
+            "(SELECT id FROM sites WHERE name = ?) AND ts >= ? AND ts < ? ORDER BY ts",
+            (site, start, end),
+        )
+        return [HistoryRow(ts, status, latency, CATEGORIES[category]) for ts, status, latency, category in rows]
+
+    def rollup(self, site, start, end, resolution="1m"):
+        """Rollups de um site (resolution "1m" ou "1h") cujo início está em [start, end)."""
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Resolução inválida: {resolution}")
+        rows = self._reader().execute(
+            f"SELECT bucket, count, success, warning, error, latency_count, latency_sum, latency_max "
+            f"FROM rollup_{resolution} WHERE site_id = (SELECT id FROM sites WHERE name = ?) "
+            f"AND bucket >= ? AND bucket < ? ORDER BY bucket",
+            (site, int(start // RESOLUTIONS[resolution]) * RESOLUTIONS[resolution], end),
+        )
+        return [
+            RollupRow(bucket, count, success, warning, error, latency_sum / latency_count if latency_count else None, latency_max)
+            for bucket, count, success, warning, error, latency_count, latency_sum, latency_max in rows
+        ]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class HistoryStore(HistoryReader):
+    """
+    Gravação em lote do histórico. add_many() recebe tuplas
+    (site, ts, status, latência ou None, categoria) e não espera o disco;
+    close() grava o que falta e encerra a thread.
+    """
+
+    def __init__(self, path, retention=None, prune_every=60.0):
+        super().__init__(path)
+        self.retention = {**DEFAULT_RETENTION, **(retention or {})}
+        self.prune_every = prune_every
+        self._queue = queue.Queue()
+        self._site_ids = {}
+        self._closed = False
+
+        self.results_written = 0
+        self.transactions = 0
+        self.last_commit_seconds = 0.0
+        self.pruned = 0
+
+        conn = _connect(path)
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        self._thread = threading.Thread(target=self._run, args=(conn,), daemon=True)
+        self._thread.start()
+
+    def add_many(self, rows):
+        if rows and not self._closed:
+            self._queue.put(rows)
+
+    def _run(self, conn):
+        next_prune = time.time()
+        try:
+            while True:
+                batches = drain_results(self._queue, next_prune)
+                stop = None in batches
+                flushed = [batch for batch in batches if isinstance(batch, threading.Event)]
+                rows = [row for batch in batches if isinstance(batch, list) for row in batch]
+                if rows:
+                    try:
+                        self._write(conn, rows)
+                    except sqlite3.Error as e:
+                        self._site_ids.clear()  # ids de uma transação desfeita
+                        print(f"Erro ao gravar o histórico em {self.path}: {e}")
+                if time.time() >= next_prune:
+                    try:
+                        self._prune(conn)
+                    except sqlite3.Error as e:
+                        print(f"Erro ao aplicar a retenção do histórico: {e}")
+                    next_prune = time.time() + self.prune_every
+                for event in flushed:
+                    event.set()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _ids(self, conn, names):
+        missing = [name for name in names if name not in self._site_ids]
+        if missing:
+            conn.executemany("INSERT OR IGNORE INTO sites (name) VALUES (?)", [(name,) for name in missing])
+            for name in missing:
+                self._site_ids[name] = conn.execute("SELECT id FROM sites WHERE name = ?", (name,)).fetchone()[0]
+        return self._site_ids
+
+    def _write(self, conn, rows):
+        started = time.perf_counter()
+        with conn:
+            ids = self._ids(conn, {row[0] for row in rows})
+            records = []
+            rollups = {resolution: {} for resolution in RESOLUTIONS}
+            for site, ts, status, latency, category in rows:
+                site_id = ids[site]
+                code = CATEGORIES.index(category)
+                records.append((site_id, ts, status, latency, code))
+                for resolution, width in RESOLUTIONS.items():
+                    key = (site_id, int(ts // width) * width)
+                    agg = rollups[resolution].get(key)
+                    if agg is None:
+                        agg = rollups[resolution][key] = [0, 0, 0, 0, 0, 0.0, None]
+                    agg[0] += 1
+                    agg[1 + code] += 1
+                    if latency is not None:
+                        agg[4] += 1
+                        agg[5] += latency
+                        agg[6] = latency if agg[6] is None else max(agg[6], latency)
+            conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?)", records)
+            for resolution, aggs in rollups.items():
+                conn.executemany(_UPSERT.format(resolution), [(*key, *agg) for key, agg in aggs.items()])
+        self.results_written += len(rows)
+        self.transactions += 1
+        self.last_commit_seconds = time.perf_counter() - started
+
+    def _prune(self, conn):
+        """Apaga resultados brutos e rollups mais antigos que a retenção de cada nível."""
+        now = time.time()
+        with conn:
+            deleted = conn.execute("DELETE FROM results WHERE ts < ?", (now - self.retention["raw"],)).rowcount
+            for resolution in RESOLUTIONS:
+                deleted += conn.execute(
+                    f"DELETE FROM rollup_{resolution} WHERE bucket < ?", (now - self.retention[resolution],)
+                ).rowcount
+        self.pruned += deleted
+
+    def flush(self, timeout=None):
+        """Espera gravar tudo o que já foi entregue; False se o prazo venceu."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=10.0):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        super().close()
+
+    def format_stats(self):
+        return (
+            f"Histórico ({self.path}): {self.results_written} resultados em {self.transactions} transações "
+            f"(último commit {self.last_commit_seconds * 1000:.1f}ms) | {self._queue.qsize()} lotes na fila"
+        )
+
+
+def _format_status(row):
+    latency = f"{row.latency:.3f}s" if row.latency is not None else "-"
+    return f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(row.ts))} {row.status!s:<12} {latency:>9} {row.category}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consulta o histórico de resultados (SQLite).")
+    parser.add_argument("path")
+    parser.add_argument("site", nargs="?", help="sem site, lista os sites guardados")
+    parser.add_argument("--since", type=float, default=3600.0, help="segundos atrás (padrão: 1h)")
+    parser.add_argument("--until", type=float, default=0.0, help="segundos atrás (padrão: agora)")
+    parser.add_argument("--resolution", choices=("raw",) + tuple(RESOLUTIONS), default="raw")
+    args = parser.parse_args(argv)
+
+    reader = HistoryReader(args.path)
+    try:
+        if args.site is None:
+            for site, count in reader.sites().items():
+                print(f"{site:<50} {count:>10}")
+            return
+        now = time.time()
+        start, end = now - args.since, now - args.until
+        if args.resolution == "raw":
+            for row in reader.query(args.site, start, end):
+                print(_format_status(row))
+        else:
+            for row in reader.rollup(args.site, start, end, args.resolution):
+                mean = f"{row.latency_mean:.3f}s" if row.latency_mean is not None else "-"
+                print(
+                    f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(row.start))} {row.count:>6} "
+                    f"ok {row.success:>5} aviso {row.warning:>5} erro {row.error:>5} média {mean} "
+                    f"máx {f'{row.latency_max:.3f}s' if row.latency_max is not None else '-'}"
+                )
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+from collections import deque
+
+from monitor.dns_cache import host_of
+
+DEFAULT_MAX_PER_HOST = 4
+
+
+class HostDispatcher:
+    """
+    Fica na frente do executor / WorkerPool e limita a max_per_host as
+    checagens em andamento (ou já na fila do executor) de um mesmo host. O
+    excedente espera em uma fila por host (ordenada por prioridade e ordem de
+    chegada) e, quando uma checagem termina, os hosts com espera são atendidos
+    em rodízio, um site por host a cada volta. max_per_host=None só faz o
+    rodízio, sem limite.
+
+    submit chama o despacho de baixo como submit(key, fn, *args, priority=...),
+    a assinatura do WorkerPool; use pass_through_submit para executores no
+    estilo executor.submit(fn, *args).
+    """
+
+    def __init__(self, submit, max_per_host=DEFAULT_MAX_PER_HOST, host_key=host_of):
+        self._submit = submit
+        self.max_per_host = max_per_host
+        self._host_key = host_key
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._waiting = {}
+        self._ring = deque()
+        self._in_flight = {}
+        self._pending_keys = set()
+
+        self.dispatched = 0
+        self.deferred = 0
+        self.skipped_in_flight = 0
+        self.peak_per_host = 0
+        self.peak_waiting = 0
+        self.waiting_count = 0
+
+    def submit(self, key, fn, *args, priority=0):
+        """Enfileira fn(*args) para o host de key; False se key já está na fila ou rodando."""
+        host = self._host_key(key) or key
+        with self._lock:
+            if key in self._pending_keys:
+                self.skipped_in_flight += 1
+                return False
+            self._pending_keys.add(key)
+            heap = self._waiting.get(host)
+            if heap is None:
+                heap = self._waiting[host] = []
+                self._ring.append(host)
+            heapq.heappush(heap, (priority, next(self._seq), key, fn, args))
+            self.waiting_count += 1
+            if self._limited(host):
+                self.deferred += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting_count)
+        self._pump(raise_errors=True)
+        return True
+
+    def submit_call(self, fn, site, *args):
+        """Estilo executor.submit(fn, site, ...), com site como chave (usado pelo SiteScheduler); False como submit."""
+        return self.submit(site, fn, site, *args)
+
+    def _limited(self, host):
+        return self.max_per_host is not None and self._in_flight.get(host, 0) >= self.max_per_host
+
+    def _next_batch(self):
+        """Uma volta do rodízio por vez: cada host com espera e vaga libera um site."""
+        batch = []
+        progress = True
+        while progress and self._ring:
+            progress = False
+            for _ in range(len(self._ring)):
+                host = self._ring[0]
+                self._ring.rotate(-1)
+                if self._limited(host):
+                    continue
+                heap = self._waiting[host]
+                priority, _, key, fn, args = heapq.heappop(heap)
+                self.waiting_count -= 1
+                if not heap:
+                    del self._waiting[host]
+                    self._ring.remove(host)
+                in_flight = self._in_flight[host] = self._in_flight.get(host, 0) + 1
+                self.peak_per_host = max(self.peak_per_host, in_flight)
+                self.dispatched += 1
+                batch.append((host, priority, key, fn, args))
+                progress = True
+        return batch
+
+    def _pump(self, raise_errors=False):
+        with self._lock:
+            batch = self._next_batch()
+        for host, priority, key, fn, args in batch:
+            try:
+                accepted = self._submit(key, self._wrap(host, key, fn), *args, priority=priority)
+            except RuntimeError:
+                # executor já desligado
+                self._release(host, key, pump=False)
+                if raise_errors:
+                    raise
+                logging.debug(f"Despacho de {key} descartado: executor encerrado")
+                continue
+            if accepted is False:
+                self._release(host, key)
+
+    def _release(self, host, key, pump=True):
+        with self._lock:
+            remaining = self._in_flight.get(host, 1) - 1
+            if remaining:
+                self._in_flight[host] = remaining
+            else:
+                self._in_flight.pop(host, None)
+            self._pending_keys.discard(key)
+        if pump:
+            self._pump()
+
+    def _wrap(self, host, key, fn):
+        if asyncio.iscoroutinefunction(fn):
+            async def run_async(*args):
+                try:
+                    return await fn(*args)
+                finally:
+                    self._release(host, key)
+            return run_async
+
+        def run(*args):
+            try:
+                return fn(*args)
+            finally:
+                self._release(host, key)
+        return run
+
+    def in_flight(self, host=None):
+        with self._lock:
+            if host is not None:
+                return self._in_flight.get(host, 0)
+            return sum(self._in_flight.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_per_host": self.max_per_host,
+                "dispatched": self.dispatched,
+                "deferred": self.deferred,
+                "skipped_in_flight": self.skipped_in_flight,
+                "waiting": self.waiting_count,
+                "waiting_hosts": len(self._ring),
+                "peak_waiting": self.peak_waiting,
+                "peak_per_host": self.peak_per_host,
+                "active_hosts": len(self._in_flight),
+            }
+
+    def format_stats(self):
+        s = self.stats()
+        limit = s["max_per_host"] if s["max_per_host"] is not None else "sem limite"
+        return (
+            f"Por host: até {limit} simultâneas (pico {s['peak_per_host']}) | "
+            f"{s['deferred']} checagens adiadas | aguardando {s['waiting']} em {s['waiting_hosts']} hosts "
+            f"(pico {s['peak_waiting']})"
+        )
+
+
+def pass_through_submit(submit):
+    """Adapta executor.submit(fn, *args) à assinatura submit(key, fn, *args, priority=...)."""
+    def adapter(key, fn, *args, priority=0):
+        return submit(fn, *args)
+    return adapter
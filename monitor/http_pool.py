@@ -0,0 +1,344 @@
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+
+from monitor.phases import PhaseTimer
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_HOSTS = 32
+DEFAULT_IDLE_TIMEOUT = 30.0
+# Corpos com Content-Length até este tamanho são lidos por inteiro mesmo nas
+# sondagens: sai mais barato que fechar a conexão e perder o keep-alive.
+PROBE_DRAIN_LIMIT = 16 * 1024
+PROBE_METHODS = ("get", "head", "stream")
+
+# PhaseTimer da checagem em andamento na thread, preenchido pelas conexões
+_current = threading.local()
+
+
+def _phase(name):
+    timer = getattr(_current, "timer", None)
+    if timer is not None:
+        timer.begin(name)
+
+
+class PoolStats:
+    """Contadores de conexões novas/reutilizadas e do tempo gasto em handshakes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.reused_requests = 0
+        self.new_connections = 0
+        self.connect_seconds = 0.0
+        self.checks = 0
+        self.check_seconds = 0.0
+        self.evicted_pools = 0
+        self.body_bytes = 0
+        self.probes = 0
+        self.bodies_skipped = 0
+        self.head_fallbacks = 0
+
+    def record_connect(self, seconds):
+        with self._lock:
+            self.new_connections += 1
+            self.connect_seconds += seconds
+
+    def record_request(self, reused):
+        with self._lock:
+            self.requests += 1
+            if reused:
+                self.reused_requests += 1
+
+    def record_check(self, seconds):
+        with self._lock:
+            self.checks += 1
+            self.check_seconds += seconds
+
+    def record_eviction(self, count):
+        with self._lock:
+            self.evicted_pools += count
+
+    def record_body(self, size, probe=False, skipped=False):
+        with self._lock:
+            self.body_bytes += size
+            if probe:
+                self.probes += 1
+            if skipped:
+                self.bodies_skipped += 1
+
+    def record_head_fallback(self):
+        with self._lock:
+            self.head_fallbacks += 1
+
+    def snapshot(self):
+        with self._lock:
+            avg_connect = (
+                self.connect_seconds / self.new_connections if self.new_connections else 0.0
+            )
+            saved = self.reused_requests * avg_connect
+            return {
+                "requests": self.requests,
+                "reused_requests": self.reused_requests,
+                "new_connections": self.new_connections,
+                "avg_handshake": avg_connect,
+                "handshake_seconds": self.connect_seconds,
+                "handshake_saved_seconds": saved,
+                "checks": self.checks,
+                "check_seconds": self.check_seconds,
+                "saved_ratio": saved / self.check_seconds if self.check_seconds else 0.0,
+                "evicted_pools": self.evicted_pools,
+                "body_bytes": self.body_bytes,
+                "probes": self.probes,
+                "bodies_skipped": self.bodies_skipped,
+                "head_fallbacks": self.head_fallbacks,
+            }
+
+
+class _TimedConnectionMixin:
+    pool_stats = None
+    dns_cache = None
+    # fase que começa quando o socket TCP fica pronto ("tls" nas conexões HTTPS)
+    after_connect_phase = None
+    _fresh_connection = False
+
+    def _new_conn(self):
+        if self.dns_cache is None:
+            # sem cache, a resolução acontece dentro da conexão e entra nela
+            _phase("connect")
+            sock = super()._new_conn()
+            _phase(self.after_connect_phase)
+            return sock
+        host = self._dns_host
+        _phase("dns")
+        try:
+            addresses = self.dns_cache.resolve(host.rstrip("."))
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        if not addresses:
+            raise NameResolutionError(self.host, self, socket.gaierror(f"sem endereços para {host}"))
+        # conecta ao endereço já resolvido; self.host (SNI, certificado e
+        # cabeçalho Host) volta ao nome original antes do handshake TLS
+        _phase("connect")
+        error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    _phase(self.after_connect_phase)
+                    return sock
+                except (ConnectTimeoutError, NewConnectionError) as e:
+                    error = e
+        finally:
+            self._dns_host = host
+        raise error
+
+    def connect(self):
+        t_start = time.perf_counter()
+        super().connect()
+        self._fresh_connection = True
+        self.pool_stats.record_connect(time.perf_counter() - t_start)
+
+    def request(self, *args, **kwargs):
+        self.pool_stats.record_request(reused=not self.is_closed and not self._fresh_connection)
+        if self.is_closed:
+            # conecta antes do pedido (o http.client faria isso dentro dele)
+            # para a espera pelo primeiro byte não incluir a conexão
+            self.connect()
+        _phase("ttfb")
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            self._fresh_connection = False
+
+    def getresponse(self):
+        response = super().getresponse()
+        _phase("body")
+        return response
+
+
+def _timed_pool_classes(stats, dns_cache=None):
+    attrs = {"pool_stats": stats, "dns_cache": dns_cache}
+    http_conn = type("TimedHTTPConnection", (_TimedConnectionMixin, HTTPConnection), attrs)
+    https_conn = type(
+        "TimedHTTPSConnection", (_TimedConnectionMixin, HTTPSConnection), {**attrs, "after_connect_phase": "tls"}
+    )
+    return {
+        "http": type("TimedHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": http_conn}),
+        "https": type("TimedHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": https_conn}),
+    }
+
+
+class _PooledAdapter(HTTPAdapter):
+    def __init__(self, stats, dns_cache=None, **kwargs):
+        self._pool_classes = _timed_pool_classes(stats, dns_cache)
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._pool_classes
+
+
+class SessionPool:
+    """
+    Camada de sessões HTTP com keep-alive compartilhada entre as threads worker.
+    Cada thread usa sua própria requests.Session (estado de cookies isolado),
+    mas todas montam o mesmo adapter, que mantém até pool_size conexões por host.
+    Pools de hosts sem uso há mais de idle_timeout segundos são fechados. Com
+    dns_cache (monitor/dns_cache.py), as conexões novas resolvem o host por ele.
+    """
+
+    def __init__(
+        self,
+        pool_size=DEFAULT_POOL_SIZE,
+        idle_timeout=DEFAULT_IDLE_TIMEOUT,
+        max_hosts=DEFAULT_MAX_HOSTS,
+        dns_cache=None,
+    ):
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.dns_cache = dns_cache
+        self.stats = PoolStats()
+        self.adapter = _PooledAdapter(self.stats, dns_cache, pool_connections=max_hosts, pool_maxsize=pool_size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self._last_eviction = time.monotonic()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            self._local.session = session
+        return session
+
+    def _touch(self, url):
+        parts = urlsplit(url)
+        now = time.monotonic()
+        with self._lock:
+            self._last_used[(parts.scheme, parts.hostname)] = now
+            evict = now - self._last_eviction >= self.idle_timeout / 2
+            if evict:
+                self._last_eviction = now
+        if evict:
+            self.evict_idle(now)
+
+    def get(self, url, timeout=10, timing=None, **kwargs):
+        """
+        GET pela sessão da thread. As fases da checagem (monitor/phases.py)
+        vão para `timing` (um PhaseTimer, preenchido mesmo se o GET falhar)
+        e ficam em response.timing.
+        """
+        self._touch(url)
+        timer = _current.timer = timing if timing is not None else PhaseTimer()
+        t_start = time.perf_counter()
+        try:
+            response = self._session().get(url, timeout=timeout, **kwargs)
+            if not kwargs.get("stream"):
+                self.stats.record_body(len(response.content))
+            timer.end()
+            response.timing = timer.result()
+            return response
+        except BaseException:
+            timer.fail()
+            raise
+        finally:
+            _current.timer = None
+            self.stats.record_check(time.perf_counter() - t_start)
+
+    def probe(self, url, method="stream", timeout=10, max_bytes=0, timing=None):
+        """
+        Checagem que não baixa o corpo inteiro. "head" faz HEAD seguindo
+        redirecionamentos (e cai para "stream" se o servidor responder 405/501);
+        "stream" faz GET com stream=True, lê no máximo max_bytes do corpo
+        (disponíveis em response.content) e fecha a conexão logo após os
+        cabeçalhos; "get" é o get() normal, para quem precisa do corpo.
+        `timing` como em get().
+        """
+        if method == "get":
+            return self.get(url, timeout=timeout, timing=timing)
+        if method not in PROBE_METHODS:
+            raise ValueError(f"método de sondagem desconhecido: {method!r}")
+        self._touch(url)
+        timer = _current.timer = timing if timing is not None else PhaseTimer()
+        t_start = time.perf_counter()
+        session = self._session()
+        try:
+            if method == "head":
+                response = session.head(url, timeout=timeout, allow_redirects=True)
+                if response.status_code not in (405, 501):
+                    self.stats.record_body(0, probe=True, skipped=True)
+                    timer.end()
+                    response.timing = timer.result()
+                    return response
+                self.stats.record_head_fallback()
+            response = self._finish_stream(session.get(url, timeout=timeout, stream=True), max_bytes)
+            timer.end()
+            response.timing = timer.result()
+            return response
+        except BaseException:
+            timer.fail()
+            raise
+        finally:
+            _current.timer = None
+            self.stats.record_check(time.perf_counter() - t_start)
+
+    def _finish_stream(self, response, max_bytes):
+        length = response.headers.get("content-length", "")
+        if length.isdigit() and int(length) <= PROBE_DRAIN_LIMIT:
+            # corpo pequeno: lê tudo e a conexão volta para o pool
+            self.stats.record_body(len(response.content), probe=True)
+            return response
+        try:
+            data = next(response.iter_content(max_bytes), b"") if max_bytes else b""
+        finally:
+            response.close()
+        response._content = data or b""
+        self.stats.record_body(len(response._content), probe=True, skipped=True)
+        return response
+
+    def evict_idle(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle_hosts = {
+                host_key for host_key, last_used in self._last_used.items()
+                if now - last_used > self.idle_timeout
+            }
+            for host_key in idle_hosts:
+                del self._last_used[host_key]
+        if not idle_hosts:
+            return 0
+        pools = self.adapter.poolmanager.pools
+        evicted = 0
+        for pool_key in pools.keys():
+            if (pool_key.key_scheme, pool_key.key_host) in idle_hosts:
+                pools.pop(pool_key, None)
+                evicted += 1
+        self.stats.record_eviction(evicted)
+        return evicted
+
+    def format_stats(self):
+        s = self.stats.snapshot()
+        return (
+            f"Conexões HTTP: {s['new_connections']} novas, {s['reused_requests']} reutilizadas | "
+            f"handshake economizado ~{s['handshake_saved_seconds']:.3f}s "
+            f"de {s['check_seconds']:.3f}s em checagens ({s['saved_ratio'] * 100:.1f}%)"
+            + (
+                f" | corpos: {s['body_bytes'] / 1024:.1f}KB lidos, "
+                f"{s['bodies_skipped']}/{s['probes']} sondagens sem baixar o corpo"
+                if s["probes"] else ""
+            )
+        )
+
+    def close(self):
+        self.adapter.close()
@@ -0,0 +1,149 @@
+import math
+import threading
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class QuantileSketch:
+    """
+    Sketch de quantis com erro relativo limitado (estilo DDSketch): cada
+    amostra cai no balde ceil(log(v) / log(gamma)), então add() é O(1) e a
+    memória fica limitada pelo número de baldes entre min_value e max_value
+    (~900 com 1% de erro entre 0.1ms e 10000s), não pelo número de amostras.
+    """
+
+    __slots__ = ("_log_gamma", "_gamma", "min_value", "max_value", "buckets", "zero_count", "count", "total", "max")
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-4, max_value=1e4):
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.min_value = min_value
+        self.max_value = max_value
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value < self.min_value:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(min(value, self.max_value)) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = max(0, math.ceil(q * self.count) - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return min(2 * self._gamma ** index / (self._gamma + 1), self.max)
+        return self.max
+
+    def merge(self, other):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def cumulative(self, bounds):
+        """Amostras <= cada limite de `bounds` (crescentes), como os baldes de um histograma do Prometheus."""
+        counts = [self.zero_count] * len(bounds)
+        for index, count in self.buckets.items():
+            upper = self._gamma ** index
+            for i, bound in enumerate(bounds):
+                if upper <= bound:
+                    counts[i] += count
+        return counts
+
+    def copy(self):
+        other = QuantileSketch.__new__(QuantileSketch)
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        other.buckets = dict(self.buckets)
+        return other
+
+    def summary(self):
+        if self.count == 0:
+            return None
+        result = {f"p{round(q * 100)}": self.quantile(q) for q in QUANTILES}
+        result["max"] = self.max
+        result["mean"] = self.total / self.count
+        result["count"] = self.count
+        return result
+
+
+class LatencyStats:
+    """
+    Sketches por métrica ("http", "wait"...) para cada site e cada categoria.
+    record() é chamado pelos workers; summary()/snapshot() podem ser lidos de
+    qualquer thread.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self._lock = threading.Lock()
+        self._by_site = {}
+        self._by_category = {}
+
+    def _sketch(self, table, metric, key):
+        sketch = table.get((metric, key))
+        if sketch is None:
+            sketch = table[(metric, key)] = QuantileSketch(self.relative_accuracy)
+        return sketch
+
+    def record(self, metric, value, site=None, category=None):
+        with self._lock:
+            if site is not None:
+                self._sketch(self._by_site, metric, site).add(value)
+            if category is not None:
+                self._sketch(self._by_category, metric, category).add(value)
+
+    def summary(self, metric, site=None, category=None):
+        """p50/p90/p99/max/mean/count de um site ou categoria; None sem amostras."""
+        with self._lock:
+            if site is not None:
+                sketch = self._by_site.get((metric, site))
+            else:
+                sketch = self._by_category.get((metric, category))
+            return sketch.summary() if sketch is not None else None
+
+    def sketches(self, metric, scope="categories"):
+        """Cópias dos sketches de uma métrica ({site ou categoria: sketch}), para ler sem segurar o lock."""
+        table = self._by_site if scope == "sites" else self._by_category
+        with self._lock:
+            return {key: sketch.copy() for (name, key), sketch in table.items() if name == metric}
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for scope, table in (("sites", self._by_site), ("categories", self._by_category)):
+                for (metric, key), sketch in table.items():
+                    result.setdefault(metric, {"sites": {}, "categories": {}})[scope][key] = sketch.summary()
+            return result
+
+
+def format_summary(summary):
+    if summary is None:
+        return "sem amostras"
+    return (
+        f"p50 {summary['p50'] * 1000:.0f}ms | p90 {summary['p90'] * 1000:.0f}ms | "
+        f"p99 {summary['p99'] * 1000:.0f}ms | máx {summary['max'] * 1000:.0f}ms ({summary['count']})"
+    )
+
+
+def format_compact(summary):
+    if summary is None:
+        return ""
+    return f"[p50 {summary['p50'] * 1000:.0f}ms p99 {summary['p99'] * 1000:.0f}ms]"
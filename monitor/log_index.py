@@ -0,0 +1,267 @@
+"""
+Índice esparso para os logs em texto (general.log): um arquivo ao lado do log
+("<log>.idx") com uma linha por bloco de ~block_bytes do log — offsets de
+início e fim, menor e maior horário de chegada e os ids dos sites que
+aparecem no bloco — e uma linha por site novo (id e nome). O índice é montado
+enquanto o log é escrito (LogIndexWriter.add para cada linha gravada) e só
+guarda blocos completos; o trecho final ainda sem bloco (menos de
+block_bytes) é varrido nas consultas.
+
+Uma consulta por site e intervalo lê só o índice (uma linha a cada
+block_bytes do log) e os blocos que podem conter o site no intervalo, com um
+seek para cada sequência de blocos, e filtra as linhas desses blocos:
+
+    python -m monitor.log_index logs/general.log --site https://httpbin.org/status/500 --start "2024-05-01 10:00" --end "2024-05-01 11:00"
+    python -m monitor.log_index logs/general.log --build
+
+Os horários nas linhas ficam em hora local com milissegundos, como em
+LogEntry.__str__ do site-manager.py, e são comparados como texto.
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+BLOCK_BYTES = 64 * 1024
+_TIME_PREFIX = "Arrival: "
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+_SITE_MARK = " | Site: "
+_MESSAGE_MARK = " | Message: "
+
+
+def format_time(ts):
+    """Horário no formato das linhas do general.log (comparável como texto)."""
+    return datetime.datetime.fromtimestamp(ts).strftime(_TIME_FORMAT)[:-3]
+
+
+def parse_line(line):
+    """(horário em texto, site) de uma linha do general.log; None se a linha não tem o formato."""
+    if not line.startswith(_TIME_PREFIX):
+        return None
+    start = line.find(_SITE_MARK)
+    if start < 0:
+        return None
+    start += len(_SITE_MARK)
+    end = line.find(_MESSAGE_MARK, start)
+    return line[len(_TIME_PREFIX):len(_TIME_PREFIX) + 23], line[start:end if end >= 0 else len(line)].rstrip("\n")
+
+
+def _text_to_ts(text):
+    return datetime.datetime.strptime(text, _TIME_FORMAT).timestamp()
+
+
+class LogIndexWriter:
+    """
+    Mantém o índice de um log enquanto ele é escrito: add() para cada linha,
+    na ordem em que foi gravada. Se o log já tem conteúdo, reaproveita o
+    índice existente e indexa o que faltar; reset() quando o log for
+    truncado ou rotacionado.
+    """
+
+    def __init__(self, log_path, block_bytes=BLOCK_BYTES, index_path=None):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + ".idx"
+        self.block_bytes = block_bytes
+        self.site_ids = {}
+        self.blocks_written = 0
+        self._file = None
+        self._reset_block(0)
+        if os.path.exists(log_path) and os.path.getsize(log_path):
+            self._catch_up()
+        else:
+            self.reset()
+
+    def _reset_block(self, offset):
+        self._block_start = offset
+        self._offset = offset
+        self._min_ts = None
+        self._max_ts = None
+        self._block_sites = set()
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.index_path, "a", encoding="utf-8")
+        return self._file
+
+    def _catch_up(self):
+        index = LogIndex(self.log_path, self.index_path) if os.path.exists(self.index_path) else None
+        if index is not None and index.indexed_end > os.path.getsize(self.log_path):
+            index = None  # índice de um log que já foi truncado ou rotacionado
+            self.reset()
+        if index is not None:
+            self.site_ids = dict(index.site_ids)
+            self.blocks_written = len(index.blocks)
+        self._reset_block(index.indexed_end if index is not None else 0)
+        with open(self.log_path, "rb") as f:
+            f.seek(self._offset)
+            for raw in f:
+                parsed = parse_line(raw.decode("utf-8", "replace"))
+                if parsed is None:
+                    self._offset += len(raw)
+                    continue
+                self.add(_text_to_ts(parsed[0]), parsed[1], len(raw))
+
+    def add(self, ts, site, nbytes):
+        """Registra uma linha de nbytes bytes com horário de chegada ts (timestamp) do site."""
+        site_id = self.site_ids.get(site)
+        if site_id is None:
+            site_id = self.site_ids[site] = len(self.site_ids)
+            self._open().write(f"S\t{site_id}\t{site}\n")
+        self._block_sites.add(site_id)
+        if self._min_ts is None or ts < self._min_ts:
+            self._min_ts = ts
+        if self._max_ts is None or ts > self._max_ts:
+            self._max_ts = ts
+        self._offset += nbytes
+        if self._offset - self._block_start >= self.block_bytes:
+            self._close_block()
+
+    def _close_block(self):
+        ids = ",".join(map(str, sorted(self._block_sites)))
+        f = self._open()
+        f.write(f"B\t{self._block_start}\t{self._offset}\t{self._min_ts!r}\t{self._max_ts!r}\t{ids}\n")
+        f.flush()
+        self.blocks_written += 1
+        self._reset_block(self._offset)
+
+    def reset(self):
+        """O log foi truncado ou rotacionado: recomeça o índice vazio."""
+        self.close()
+        open(self.index_path, "w").close()
+        self.site_ids = {}
+        self.blocks_written = 0
+        self._reset_block(0)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class LogIndex:
+    """Leitura do índice e consultas por site e intervalo."""
+
+    def __init__(self, log_path, index_path=None):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + ".idx"
+        self.site_ids = {}
+        self.blocks = []
+        self.blocks_read = 0
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # linha sendo escrita agora
+                if line[0] == "S":
+                    _, site_id, site = line.rstrip("\n").split("\t", 2)
+                    self.site_ids[site] = int(site_id)
+                elif line[0] == "B":
+                    # os ids ficam em texto (",1,5,9,") e só são consultados nos blocos do intervalo
+                    _, block_start, block_end, min_ts, max_ts, ids = line.rstrip("\n").split("\t", 5)
+                    self.blocks.append((int(block_start), int(block_end), float(min_ts), float(max_ts), f",{ids},"))
+
+    @property
+    def indexed_end(self):
+        return self.blocks[-1][1] if self.blocks else 0
+
+    def _ranges(self, site_id, start, end):
+        """Trechos (início, fim) do log a ler: blocos candidatos contíguos viram um só trecho."""
+        ranges = []
+        needle = f",{site_id},"
+        for block_start, block_end, min_ts, max_ts, ids in self.blocks:
+            # as linhas guardam o horário truncado em milissegundos
+            if (start is not None and max_ts < start - 0.001) or (end is not None and min_ts >= end):
+                continue
+            if site_id is not None and needle not in ids:
+                continue
+            self.blocks_read += 1
+            if ranges and ranges[-1][1] == block_start:
+                ranges[-1][1] = block_end
+            else:
+                ranges.append([block_start, block_end])
+        ranges.append([self.indexed_end, None])
+        return ranges
+
+    def query(self, site=None, start=None, end=None):
+        """Linhas do site (ou de todos) com start <= chegada < end (timestamps), na ordem do arquivo."""
+        site_id = None if site is None else self.site_ids.get(site, -1)
+        with open(self.log_path, "rb") as f:
+            for range_start, range_end in self._ranges(site_id, start, end):
+                f.seek(range_start)
+                yield from _filter(_read_range(f, range_start, range_end), site, start, end)
+
+
+def _read_range(f, position, end):
+    for raw in f:
+        if end is not None and position >= end:
+            return
+        position += len(raw)
+        yield raw
+
+
+def _filter(lines, site, start, end):
+    """Linhas (bytes) do site no intervalo, decodificadas."""
+    needle = (_SITE_MARK + site + _MESSAGE_MARK).encode("utf-8") if site is not None else None
+    start_text = format_time(start) if start is not None else None
+    end_text = format_time(end) if end is not None else None
+    for raw in lines:
+        if needle is not None and needle not in raw:
+            continue
+        line = raw.decode("utf-8", "replace")
+        parsed = parse_line(line)
+        if parsed is None:
+            continue
+        text, line_site = parsed
+        if site is not None and line_site != site:
+            continue
+        if (start_text is not None and text < start_text) or (end_text is not None and text >= end_text):
+            continue
+        yield line
+
+
+def scan(log_path, site=None, start=None, end=None):
+    """Mesma consulta de LogIndex.query lendo o arquivo inteiro (o grep de sempre)."""
+    with open(log_path, "rb") as f:
+        yield from _filter(f, site, start, end)
+
+
+def _parse_time(value):
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"horário inválido: {value} (use AAAA-MM-DD [HH:MM[:SS]])")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consulta o general.log pelo índice esparso (<log>.idx).")
+    parser.add_argument("log")
+    parser.add_argument("--site")
+    parser.add_argument("--start", type=_parse_time, help="AAAA-MM-DD [HH:MM[:SS]], hora local")
+    parser.add_argument("--end", type=_parse_time)
+    parser.add_argument("--since", type=float, help="segundos atrás (no lugar de --start)")
+    parser.add_argument("--build", action="store_true", help="monta ou completa o índice de um log existente")
+    parser.add_argument("--stats", action="store_true", help="mostra no stderr quantos blocos foram lidos")
+    args = parser.parse_args(argv)
+
+    if args.build:
+        writer = LogIndexWriter(args.log)
+        writer.close()
+        print(f"{writer.index_path}: {writer.blocks_written} blocos, {len(writer.site_ids)} sites")
+        return
+    if not os.path.exists(args.log + ".idx"):
+        parser.error(f"{args.log}.idx não existe; rode com --build")
+    start = time.time() - args.since if args.since is not None else args.start
+    index = LogIndex(args.log)
+    lines = 0
+    for line in index.query(args.site, start, args.end):
+        sys.stdout.write(line)
+        lines += 1
+    if args.stats:
+        print(f"{lines} linhas; {index.blocks_read}/{len(index.blocks)} blocos lidos "
+              f"+ {os.path.getsize(args.log) - index.indexed_end} bytes sem índice", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
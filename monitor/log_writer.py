@@ -0,0 +1,87 @@
+import os
+import time
+
+FSYNC_POLICIES = ("never", "flush", "shutdown")
+
+
+class BatchedLogWriter:
+    """
+    Escritor com group commit: mantém o arquivo aberto, acumula linhas (str)
+    ou registros (bytes) em memória e grava cada lote com uma única chamada write.
+
+    O lote é gravado quando acumula flush_every linhas ou quando a linha mais
+    antiga pendente passa de flush_interval segundos (0 desativa cada critério;
+    com os dois desativados só grava no close). fsync pode ser "never",
+    "flush" (após cada gravação) ou "shutdown" (apenas no close).
+    """
+
+    def __init__(self, path, file_lock, flush_every=256, flush_interval=0.2, fsync="never"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync inválida: {fsync}")
+        self.path = path
+        self.file_lock = file_lock
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._file = None
+        self._pending = []
+        self._oldest_pending = None
+
+        self.entries_written = 0
+        self.batches_written = 0
+
+    def _ensure_open(self):
+        if self._file is None:
+            self._file = open(self.path, "ab", buffering=0)
+        return self._file
+
+    def append(self, lines):
+        if not lines:
+            return
+        if not self._pending:
+            self._oldest_pending = time.monotonic()
+        self._pending.extend(lines)
+        if self.flush_every and len(self._pending) >= self.flush_every:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def time_until_flush(self):
+        """Segundos até o próximo flush por tempo, ou None se não há nada pendente."""
+        if not self._pending or not self.flush_interval:
+            return None
+        return max(0.0, self._oldest_pending + self.flush_interval - time.monotonic())
+
+    def flush_if_due(self):
+        remaining = self.time_until_flush()
+        if remaining is not None and remaining <= 0:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        if isinstance(self._pending[0], bytes):
+            data = b"".join(self._pending)
+        else:
+            data = "".join(self._pending).encode("utf-8")
+        count = len(self._pending)
+        self._pending = []
+        self._oldest_pending = None
+        with self.file_lock:
+            f = self._ensure_open()
+            view = memoryview(data)
+            while view:
+                view = view[f.write(view):]
+            if self.fsync == "flush":
+                os.fsync(f.fileno())
+        self.entries_written += count
+        self.batches_written += 1
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            with self.file_lock:
+                if self.fsync != "never":
+                    os.fsync(self._file.fileno())
+                self._file.close()
+            self._file = None
@@ -0,0 +1,153 @@
+"""
+Endpoint HTTP local com as métricas do monitor no formato texto do
+Prometheus (GET /metrics).
+
+O texto é montado por uma thread de fundo a cada `refresh` segundos, chamando
+`collect(out)` com um MetricsText; a requisição só devolve os bytes do último
+instantâneo. Assim um scrape custa o mesmo com 10 ou 10.000 sites e nunca
+disputa os locks do caminho de checagem — quem os toma, por pouco tempo, é a
+thread de fundo. Os valores podem estar até `refresh` segundos atrasados.
+"""
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# limites (segundos) dos histogramas de latência
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class MetricsText:
+    """Acumula famílias e amostras no formato de exposição texto do Prometheus."""
+
+    def __init__(self):
+        self._lines = []
+
+    def family(self, name, kind, help_text):
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name, value, labels=None):
+        if labels:
+            label_str = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            self._lines.append(f"{name}{{{label_str}}} {_format_value(value)}")
+        else:
+            self._lines.append(f"{name} {_format_value(value)}")
+
+    def histogram(self, name, sketch, labels=None, bounds=LATENCY_BUCKETS):
+        """Amostras _bucket/_sum/_count de um QuantileSketch (baldes com o erro relativo do sketch)."""
+        labels = labels or {}
+        for bound, count in zip(bounds, sketch.cumulative(bounds)):
+            self.sample(f"{name}_bucket", count, {**labels, "le": _format_value(float(bound))})
+        self.sample(f"{name}_bucket", sketch.count, {**labels, "le": "+Inf"})
+        self.sample(f"{name}_sum", sketch.total, labels)
+        self.sample(f"{name}_count", sketch.count, labels)
+
+    def render(self):
+        return ("\n".join(self._lines) + "\n").encode("utf-8")
+
+
+class MetricsEndpoint:
+    """
+    Servidor HTTP (em thread daemon) que responde /metrics com o último
+    instantâneo montado pela thread de fundo. port=0 escolhe uma porta livre.
+    """
+
+    def __init__(self, collect, host="127.0.0.1", port=9108, refresh=5.0):
+        self.collect = collect
+        self.refresh = refresh
+        self.body = b""
+        self.builds = 0
+        self.build_errors = 0
+        self.last_build_seconds = 0.0
+        self.scrapes = 0
+        self._stop_event = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._threads = []
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def _handler_class(self):
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = endpoint.body
+                endpoint.scrapes += 1
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def build(self):
+        """Monta um instantâneo novo e troca a referência servida (atribuição atômica)."""
+        started = time.perf_counter()
+        out = MetricsText()
+        try:
+            self.collect(out)
+        except Exception as e:
+            self.build_errors += 1
+            print(f"Erro ao montar as métricas: {e}")
+            return
+        out.family("site_monitor_metrics_build_seconds", "gauge", "Tempo para montar o instantâneo anterior.")
+        out.sample("site_monitor_metrics_build_seconds", self.last_build_seconds)
+        out.family("site_monitor_metrics_snapshot_timestamp_seconds", "gauge", "Quando este instantâneo foi montado.")
+        out.sample("site_monitor_metrics_snapshot_timestamp_seconds", time.time())
+        self.body = out.render()
+        self.builds += 1
+        self.last_build_seconds = time.perf_counter() - started
+
+    def _builder(self):
+        while not self._stop_event.wait(self.refresh):
+            self.build()
+
+    def start(self):
+        self.build()
+        for target in (self._server.serve_forever, self._builder):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop_event.set()
+        self._server.shutdown()
+        self._server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def format_stats(self):
+        return (
+            f"Métricas: {self.url} | {self.scrapes} scrapes | instantâneo a cada {self.refresh:g}s "
+            f"em {self.last_build_seconds * 1000:.1f}ms ({len(self.body) / 1024:.0f} KiB)"
+        )
@@ -0,0 +1,89 @@
+"""
+Tempo de cada fase de uma checagem HTTP: resolução DNS, conexão TCP,
+handshake TLS, espera pelo primeiro byte (envio do pedido até os cabeçalhos
+da resposta) e leitura do corpo. Em checagens que falham, a fase em andamento
+entra com o tempo que durou até a falha e fica marcada em `failed`; fases não
+alcançadas (ou puladas, como DNS/conexão/TLS numa conexão reutilizada) ficam
+None. Com redirecionamentos, as fases de todos os saltos são somadas.
+"""
+import time
+from collections import namedtuple
+
+from monitor.latency import format_summary
+
+PHASES = ("dns", "connect", "tls", "ttfb", "body")
+PHASE_LABELS = {"dns": "DNS", "connect": "conexão", "tls": "TLS", "ttfb": "1º byte", "body": "corpo"}
+
+PhaseTimings = namedtuple("PhaseTimings", PHASES + ("failed",), defaults=(None,) * (len(PHASES) + 1))
+
+
+class PhaseTimer:
+    """Cronômetro de uma checagem: begin(fase) encerra a fase anterior e abre a próxima."""
+
+    __slots__ = ("durations", "failed", "_phase", "_started", "_clock")
+
+    def __init__(self, clock=time.perf_counter):
+        self.durations = {}
+        self.failed = None
+        self._phase = None
+        self._started = 0.0
+        self._clock = clock
+
+    def begin(self, phase):
+        now = self._clock()
+        self._close(now)
+        self._phase = phase
+        self._started = now
+
+    def end(self):
+        self._close(self._clock())
+
+    def fail(self):
+        """A checagem falhou: guarda o tempo parcial da fase em andamento."""
+        if self._phase is not None and self.failed is None:
+            self.failed = self._phase
+        self.end()
+
+    def _close(self, now):
+        if self._phase is not None:
+            self.durations[self._phase] = self.durations.get(self._phase, 0.0) + (now - self._started)
+            self._phase = None
+
+    def result(self):
+        return PhaseTimings(*(self.durations.get(phase) for phase in PHASES), failed=self.failed)
+
+
+def phase_total(timings):
+    return sum(value for value in timings[:len(PHASES)] if value is not None)
+
+
+def record_phases(stats, timings, site=None, category=None):
+    """Soma as fases de uma checagem às estatísticas (LatencyStats) do site e da categoria."""
+    if timings is None:
+        return
+    for phase, value in zip(PHASES, timings):
+        if value is not None:
+            stats.record(phase, value, site=site, category=category)
+
+
+def format_phases(timings):
+    """Uma linha curta com as fases de uma checagem."""
+    if timings is None:
+        return ""
+    parts = [
+        f"{PHASE_LABELS[phase]} {value * 1000:.0f}ms"
+        for phase, value in zip(PHASES, timings) if value is not None
+    ]
+    if timings.failed is not None:
+        parts.append(f"falhou em {PHASE_LABELS[timings.failed]}")
+    return " | ".join(parts)
+
+
+def format_phase_breakdown(stats, category):
+    """p50 de cada fase de uma categoria, para o rodapé."""
+    parts = []
+    for phase in PHASES:
+        summary = stats.summary(phase, category=category)
+        if summary is not None:
+            parts.append(f"{PHASE_LABELS[phase]} {summary['p50'] * 1000:.0f}ms")
+    return "Fases (p50): " + " | ".join(parts) if parts else f"Fases: {format_summary(None)}"
@@ -0,0 +1,180 @@
+import threading
+import time
+
+from monitor.latency import QuantileSketch, format_summary
+
+LEVEL_NAMES = {0: "falhando", 1: "atenção", 2: "saudável"}
+
+
+class _SiteState:
+    __slots__ = ("checks", "failure_streak", "last_status", "last_check", "fast_latency", "slow_latency", "queued_at", "level")
+
+    def __init__(self):
+        self.checks = 0
+        self.failure_streak = 0
+        self.last_status = None
+        self.last_check = None
+        self.fast_latency = None
+        self.slow_latency = None
+        self.queued_at = None
+        self.level = 1
+
+
+class AgingPriorityScheduler:
+    """
+    Pontua cada site pelo histórico: sequência de falhas, tendência de
+    latência (média móvel rápida sobre a lenta) e tempo desde a última
+    checagem. Na fila, a prioridade efetiva é score + aging_rate * espera;
+    como aging_rate * agora é comum a todos, a ordem equivale à chave fixa
+    -(score - aging_rate * enfileirado_em), que vai direto para a
+    PriorityQueue do WorkerPool. aging_rate = max_score() / max_wait: um
+    site que já esperou max_wait segundos passa à frente de qualquer site
+    recém-enfileirado, então sites saudáveis nunca ficam sem vez.
+
+    Também mede a espera na fila por nível (0 falhando, 1 atenção, 2 saudável).
+    """
+
+    def __init__(
+        self,
+        interval,
+        max_wait=None,
+        failure_weight=4.0,
+        max_streak=5,
+        trend_weight=4.0,
+        warning_score=2.0,
+        new_site_score=5.0,
+        staleness_weight=1.0,
+        fast_alpha=0.5,
+        slow_alpha=0.1,
+        clock=time.time,
+    ):
+        self.failure_weight = failure_weight
+        self.max_streak = max_streak
+        self.trend_weight = trend_weight
+        self.warning_score = warning_score
+        self.new_site_score = new_site_score
+        self.staleness_weight = staleness_weight
+        self.fast_alpha = fast_alpha
+        self.slow_alpha = slow_alpha
+        self.clock = clock
+        self.set_interval(interval, max_wait)
+        self._lock = threading.Lock()
+        self._sites = {}
+        self._wait_by_level = {level: QuantileSketch() for level in LEVEL_NAMES}
+
+    def set_interval(self, interval, max_wait=None):
+        """Intervalo de rechecagem; max_wait padrão de dois intervalos."""
+        self.interval = interval
+        self.max_wait = max_wait if max_wait is not None else 2 * interval
+        self.aging_rate = self.max_score() / self.max_wait
+
+    def max_score(self):
+        return max(
+            self.new_site_score,
+            self.failure_weight * self.max_streak + self.trend_weight * 2.0
+            + self.warning_score + self.staleness_weight * 10.0,
+        )
+
+    def _state(self, site):
+        state = self._sites.get(site)
+        if state is None:
+            state = self._sites[site] = _SiteState()
+        return state
+
+    @staticmethod
+    def is_failure(status):
+        return not isinstance(status, int) or status < 0 or 500 <= status < 600
+
+    def _trend(self, state):
+        if not state.slow_latency:
+            return 0.0
+        return min(max(state.fast_latency / state.slow_latency - 1.0, 0.0), 2.0)
+
+    def _score(self, state, now):
+        if state.checks == 0:
+            return self.new_site_score
+        score = self.failure_weight * min(state.failure_streak, self.max_streak)
+        score += self.trend_weight * self._trend(state)
+        if isinstance(state.last_status, int) and 400 <= state.last_status < 500:
+            score += self.warning_score
+        score += self.staleness_weight * min((now - state.last_check) / self.interval, 10.0)
+        return score
+
+    def _level(self, state):
+        if state.checks and state.failure_streak > 0:
+            return 0
+        if (
+            state.checks == 0
+            or (isinstance(state.last_status, int) and 400 <= state.last_status < 500)
+            or self._trend(state) > 0.5
+        ):
+            return 1
+        return 2
+
+    def score(self, site, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            return self._score(self._state(site), now)
+
+    def level(self, site):
+        with self._lock:
+            return self._level(self._state(site))
+
+    def priority(self, site, now=None):
+        """(chave para a PriorityQueue, nível) de um site enfileirado agora."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            state = self._state(site)
+            return -(self._score(state, now) - self.aging_rate * now), self._level(state)
+
+    def mark_queued(self, site, now, level):
+        """Marca o site como enfileirado antes do submit; devolve a marca anterior para unmark_queued."""
+        with self._lock:
+            state = self._state(site)
+            previous = (state.queued_at, state.level)
+            state.queued_at = now
+            state.level = level
+            return previous
+
+    def unmark_queued(self, site, previous):
+        """O submit recusou o site (ainda pendente): volta a marca da submissão que está na fila."""
+        with self._lock:
+            state = self._state(site)
+            state.queued_at, state.level = previous
+
+    def record_start(self, site, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            state = self._state(site)
+            if state.queued_at is None:
+                return None
+            wait = max(0.0, now - state.queued_at)
+            self._wait_by_level[state.level].add(wait)
+            state.queued_at = None
+            return wait
+
+    def record_result(self, site, status, latency=None, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            state = self._state(site)
+            state.checks += 1
+            state.last_status = status
+            state.last_check = now
+            state.failure_streak = state.failure_streak + 1 if self.is_failure(status) else 0
+            if latency is not None:
+                if state.fast_latency is None:
+                    state.fast_latency = state.slow_latency = latency
+                else:
+                    state.fast_latency += self.fast_alpha * (latency - state.fast_latency)
+                    state.slow_latency += self.slow_alpha * (latency - state.slow_latency)
+
+    def wait_stats(self):
+        with self._lock:
+            return {level: sketch.summary() for level, sketch in self._wait_by_level.items()}
+
+    def format_wait_stats(self):
+        stats = self.wait_stats()
+        return [
+            f"  - P{level} {LEVEL_NAMES[level]:<9}: {format_summary(stats[level])}"
+            for level in sorted(stats)
+        ]
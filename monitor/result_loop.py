@@ -0,0 +1,33 @@
+"""
+Consumo dos resultados das checagens guiado por eventos: o loop principal
+bloqueia na fila de resultados até chegar o primeiro item ou vencer o próximo
+prazo (próximo ciclo de checagens ou redesenho da tela pendente), em vez de
+acordar a cada 100-500 ms para ver se há algo.
+"""
+import queue
+import time
+
+
+def drain_results(results, deadline=None):
+    """
+    Espera até `deadline` (em time.time()) pelo primeiro item de `results` e
+    devolve ele e todos os que já estiverem na fila; [] se o prazo venceu.
+    deadline=None espera sem limite; um prazo já vencido só esvazia a fila.
+    """
+    timeout = None if deadline is None else max(0.0, deadline - time.time())
+    try:
+        items = [results.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+    while True:
+        try:
+            items.append(results.get_nowait())
+        except queue.Empty:
+            return items
+
+
+def next_deadline(next_cycle, last_update, update_interval, screen_dirty):
+    """Próximo instante em que o loop precisa acordar mesmo sem resultados."""
+    if screen_dirty:
+        return min(next_cycle, last_update + update_interval)
+    return next_cycle
@@ -0,0 +1,202 @@
+"""
+Rotação de logs por tamanho e/ou idade com compressão em segundo plano.
+
+Quem escreve avisa o LogRotator de cada gravação (note_write, com o número de
+bytes); ao passar de max_bytes, ou quando o segmento atual tem mais de max_age
+segundos, o arquivo é renomeado para "<arquivo>.AAAAMMDD-HHMMSS-ffffff" — só
+um rename, então a thread escritora não espera — e o próximo open em modo "a"
+cria um arquivo novo. A compressão (gzip, ou zstd se o pacote zstandard
+estiver instalado) e a retenção (no máximo `keep` segmentos e/ou
+`max_total_bytes` somando os segmentos) rodam numa única thread de fundo do
+processo. O segmento só é comprimido `settle` segundos depois do rename, para
+que escritas de quem ainda estava com o arquivo antigo aberto entrem nele.
+
+RotatingLogHandler é o mesmo mecanismo como handler do módulo logging.
+"""
+import datetime
+import glob
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = (None, "gzip", "zstd")
+_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+_CHUNK = 1 << 20
+
+
+def _compress(path, compression):
+    target = path + _SUFFIXES[compression]
+    tmp = target + ".tmp"
+    with open(path, "rb") as src:
+        if compression == "gzip":
+            with gzip.open(tmp, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, _CHUNK)
+        else:
+            with open(tmp, "wb") as raw:
+                with zstandard.ZstdCompressor().stream_writer(raw) as dst:
+                    shutil.copyfileobj(src, dst, _CHUNK)
+    os.replace(tmp, target)
+    os.remove(path)
+    return target
+
+
+class _Compressor:
+    """Thread de fundo (uma por processo) que comprime segmentos e aplica a retenção."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, rotator, segment):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="LogCompressor", daemon=True)
+                self._thread.start()
+        self._queue.put((time.monotonic() + rotator.settle, rotator, segment))
+
+    def _run(self):
+        try:
+            # no Linux a prioridade vale por thread: a compressão só usa CPU ociosa
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+        while True:
+            due, rotator, segment = self._queue.get()
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                if rotator.compression is not None and os.path.exists(segment):
+                    _compress(segment, rotator.compression)
+                    rotator.compressed += 1
+                rotator.apply_retention()
+            except OSError as e:
+                print(f"Erro ao comprimir {segment}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def wait(self):
+        """Espera os segmentos já rotacionados serem comprimidos (testes e benchmarks)."""
+        self._queue.join()
+
+
+COMPRESSOR = _Compressor()
+
+
+class LogRotator:
+    def __init__(
+        self,
+        path,
+        max_bytes=64 * 1024 * 1024,
+        max_age=None,
+        keep=10,
+        max_total_bytes=None,
+        compression="gzip",
+        settle=1.0,
+    ):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Compressão inválida: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("Compressão zstd requer o pacote zstandard")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.keep = keep
+        self.max_total_bytes = max_total_bytes
+        self.compression = compression
+        self.settle = settle
+        self._lock = threading.Lock()
+        self._size = os.path.getsize(path) if os.path.exists(path) else 0
+        self._opened = time.monotonic()
+
+        self.rotations = 0
+        self.compressed = 0
+        self.removed = 0
+
+    def note_write(self, nbytes):
+        """Conta uma gravação e rotaciona se passou do limite; True se rotacionou."""
+        with self._lock:
+            self._size += nbytes
+            if not self._due():
+                return False
+            self._rotate()
+            return True
+
+    def _due(self):
+        if self.max_bytes and self._size >= self.max_bytes:
+            return True
+        return self.max_age is not None and self._size and time.monotonic() - self._opened >= self.max_age
+
+    def _rotate(self):
+        segment = f"{self.path}.{datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        try:
+            os.rename(self.path, segment)
+        except FileNotFoundError:
+            segment = None
+        except OSError as e:
+            print(f"Erro ao rotacionar {self.path}: {e}")
+            return
+        self._size = 0
+        self._opened = time.monotonic()
+        if segment is not None:
+            self.rotations += 1
+            self._compress_later(segment)
+
+    def _compress_later(self, segment):
+        COMPRESSOR.submit(self, segment)
+
+    def segments(self):
+        """Segmentos rotacionados (comprimidos ou não), do mais antigo ao mais novo."""
+        return sorted(path for path in glob.glob(glob.escape(self.path) + ".*-*") if not path.endswith(".tmp"))
+
+    def apply_retention(self):
+        segments = self.segments()
+        sizes = {path: os.path.getsize(path) for path in segments}
+        total = sum(sizes.values())
+        while segments and (
+            (self.keep is not None and len(segments) > self.keep)
+            or (self.max_total_bytes is not None and total > self.max_total_bytes)
+        ):
+            oldest = segments.pop(0)
+            os.remove(oldest)
+            total -= sizes[oldest]
+            self.removed += 1
+
+    def format_stats(self):
+        return (
+            f"Rotação de {os.path.basename(self.path)}: {self.rotations} segmentos, "
+            f"{self.compressed} comprimidos, {self.removed} removidos pela retenção"
+        )
+
+
+class RotatingLogHandler(logging.FileHandler):
+    """FileHandler que rotaciona com um LogRotator; o rename acontece sob o lock do handler."""
+
+    def __init__(self, rotator, mode="a", encoding="utf-8"):
+        self.rotator = rotator
+        super().__init__(rotator.path, mode=mode, encoding=encoding)
+        rotator._size = os.path.getsize(rotator.path)
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self.stream.flush()
+            # o limite é em bytes: mensagens com acentos ocupam mais que len(msg)
+            if self.rotator.note_write(len(msg.encode(self.encoding or "utf-8"))):
+                self.stream.close()
+                self.stream = self._open()
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,151 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+LAG_EWMA_ALPHA = 0.2
+# site recusado pelo submit (a checagem anterior ainda não liberou a chave no
+# despacho): volta ao heap e é tentado de novo depois deste intervalo
+REFUSED_RETRY_DELAY = 0.005
+
+
+class SiteScheduler:
+    """
+    Agendador por site baseado em um heap de timers (próximo vencimento por site).
+    Um site só volta ao heap quando a checagem anterior termina, então nunca há
+    mais de uma checagem em andamento por site. O atraso de agendamento (lag) é
+    medido entre o vencimento e o início efetivo da checagem no worker.
+    """
+
+    def __init__(self, submit, check, default_interval, intervals=None, clock=time.monotonic):
+        self._submit = submit
+        self._check = check
+        self.default_interval = default_interval
+        self._intervals = dict(intervals or {})
+        self._clock = clock
+        self._heap = []
+        self._seq = itertools.count()
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._run = self._wrap_async(check) if asyncio.iscoroutinefunction(check) else self._wrap_sync(check)
+
+        self.dispatched = 0
+        self.overruns = 0
+        self.refused = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.recent_lag = 0.0
+
+    def add(self, site, interval=None, due=None):
+        with self._lock:
+            if interval is not None:
+                self._intervals[site] = interval
+            heapq.heappush(self._heap, (self._clock() if due is None else due, next(self._seq), site))
+        self._wakeup.set()
+
+    def interval_for(self, site):
+        return self._intervals.get(site, self.default_interval)
+
+    def set_interval(self, site, interval):
+        with self._lock:
+            self._intervals[site] = interval
+
+    def in_flight_count(self):
+        with self._lock:
+            return len(self._in_flight)
+
+    def _record_lag(self, lag):
+        with self._lock:
+            self.dispatched += 1
+            self.last_lag = lag
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+            self.recent_lag += LAG_EWMA_ALPHA * (lag - self.recent_lag)
+
+    def _complete(self, site, due):
+        now = self._clock()
+        with self._lock:
+            self._in_flight.discard(site)
+            next_due = due + self.interval_for(site)
+            if next_due < now:
+                self.overruns += 1
+                next_due = now
+            heapq.heappush(self._heap, (next_due, next(self._seq), site))
+        self._wakeup.set()
+
+    def _wrap_sync(self, check):
+        def run(site, due):
+            self._record_lag(self._clock() - due)
+            try:
+                return check(site)
+            finally:
+                self._complete(site, due)
+        return run
+
+    def _wrap_async(self, check):
+        async def run(site, due):
+            self._record_lag(self._clock() - due)
+            try:
+                return await check(site)
+            finally:
+                self._complete(site, due)
+        return run
+
+    def run_pending(self):
+        """Despacha os sites vencidos e retorna quantos segundos faltam para o próximo."""
+        now = self._clock()
+        due_sites = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due, _, site = heapq.heappop(self._heap)
+                self._in_flight.add(site)
+                due_sites.append((site, due))
+            next_due = self._heap[0][0] if self._heap else None
+
+        refused = []
+        for site, due in due_sites:
+            try:
+                accepted = self._submit(self._run, site, due)
+            except RuntimeError:
+                with self._lock:
+                    self._in_flight.discard(site)
+                raise
+            if accepted is False:
+                refused.append((site, due))
+
+        if refused:
+            # o _complete da checagem anterior roda antes de o despacho liberar a
+            # chave; o site mantém o vencimento original para o lag contar a espera
+            with self._lock:
+                for site, due in refused:
+                    self._in_flight.discard(site)
+                    heapq.heappush(self._heap, (due, next(self._seq), site))
+                self.refused += len(refused)
+            return REFUSED_RETRY_DELAY if next_due is None else min(REFUSED_RETRY_DELAY, max(0.0, next_due - now))
+
+        return None if next_due is None else max(0.0, next_due - now)
+
+    def wait(self, timeout):
+        """Dorme até o timeout ou até uma checagem terminar / um site ser adicionado."""
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+    def wakeup(self):
+        self._wakeup.set()
+
+    def lag_stats(self):
+        with self._lock:
+            return {
+                "dispatched": self.dispatched,
+                "in_flight": len(self._in_flight),
+                "scheduled": len(self._heap),
+                "overruns": self.overruns,
+                "refused": self.refused,
+                "last_lag": self.last_lag,
+                "recent_lag": self.recent_lag,
+                "avg_lag": self.total_lag / self.dispatched if self.dispatched else 0.0,
+                "max_lag": self.max_lag,
+            }
@@ -0,0 +1,239 @@
+import os
+import re
+import shutil
+import sys
+import time
+
+_ANSI_RE = re.compile(r"\033\[[0-9;]*[A-Za-z]")
+
+CLEAR = "\033[H\033[2J"
+ERASE_LINE = "\033[K"
+ERASE_BELOW = "\033[J"
+RESET = "\033[0m"
+
+
+def _fit(line, width):
+    """Corta a linha em `width` colunas visíveis, sem contar as sequências ANSI."""
+    if len(line) <= width:
+        return line
+    if "\033" not in line:
+        return line[:width]
+    out = []
+    visible = 0
+    pos = 0
+    for match in _ANSI_RE.finditer(line):
+        text = line[pos:match.start()]
+        if visible + len(text) >= width:
+            out.append(text[:width - visible])
+            return "".join(out) + RESET
+        out.append(text)
+        visible += len(text)
+        out.append(match.group())
+        pos = match.end()
+    out.append(line[pos:pos + width - visible])
+    return "".join(out)
+
+
+class ScreenRenderer:
+    """
+    Desenha a tela do monitor com posicionamento de cursor ANSI, reescrevendo
+    só as linhas que mudaram desde o quadro anterior, em uma única escrita.
+
+    Quando a lista de sites não cabe no terminal, select_rows() pagina
+    (overflow="paginate", a página alterna a cada page_seconds) ou mostra um
+    resumo por categoria seguido apenas dos sites com problema
+    (overflow="summary"). Se um quadro passa de frame_budget_ms, o número de
+    linhas de sites por quadro é reduzido pela metade até voltar ao orçamento.
+
+    As estatísticas por subsistema do rodapé passam por fit_details(): só
+    entram as que cabem deixando min_site_rows linhas para os sites, e render()
+    mantém as últimas `pinned` linhas (atualização, Ctrl+C) mesmo quando o
+    quadro não cabe no terminal.
+    """
+
+    def __init__(
+        self,
+        stream=None,
+        overflow="paginate",
+        page_seconds=5.0,
+        frame_budget_ms=50.0,
+        full_redraw_every=60,
+        min_rows=10,
+        min_site_rows=10,
+    ):
+        if overflow not in ("paginate", "summary"):
+            raise ValueError(f"overflow inválido: {overflow}")
+        self.stream = stream if stream is not None else sys.stdout
+        self.overflow = overflow
+        self.page_seconds = page_seconds
+        self.frame_budget = frame_budget_ms / 1000.0
+        self.full_redraw_every = full_redraw_every
+        self.min_rows = min_rows
+        self.min_site_rows = min_site_rows
+        self.row_limit = None
+        self.interactive = hasattr(self.stream, "isatty") and self.stream.isatty()
+        if self.interactive and os.name == "nt":
+            os.system("")  # habilita o processamento de sequências VT no console do Windows
+
+        self._previous = []
+        self._size = None
+        self._frame_start = None
+        self._frames_since_full = 0
+
+        self.frames = 0
+        self.full_redraws = 0
+        self.over_budget = 0
+        self.last_frame_seconds = 0.0
+        self.max_frame_seconds = 0.0
+        self.total_frame_seconds = 0.0
+        self.last_lines_written = 0
+        self.last_bytes_written = 0
+
+    def begin_frame(self):
+        """Marca o início do quadro; o tempo de montagem das linhas entra na medição."""
+        self._frame_start = time.perf_counter()
+
+    def rows_available(self, reserved_lines):
+        _, height = self._size_now()
+        # uma linha para a paginação/resumo e uma para o cursor ao final
+        rows = max(1, min(self.min_site_rows, height - 2), height - reserved_lines - 2)
+        if self.row_limit is not None:
+            rows = min(rows, self.row_limit)
+        return rows
+
+    def fit_details(self, reserved_lines, details):
+        """
+        Linhas de detalhe do rodapé (em ordem de importância) que cabem deixando
+        min_site_rows linhas para os sites; as que sobram viram uma linha de aviso.
+        Fora de um terminal todas são mostradas.
+        """
+        if not self.interactive:
+            return details
+        _, height = self._size_now()
+        room = height - reserved_lines - 2 - self.min_site_rows
+        if len(details) <= room:
+            return details
+        if room <= 1:
+            return []
+        shown = details[:room - 1]
+        return shown + [f"(+{len(details) - len(shown)} linhas de estatísticas ocultas; aumente o terminal para vê-las)"]
+
+    def select_rows(self, items, available, category=None, ok_categories=("ok",)):
+        """Devolve (itens a desenhar, linha de paginação/resumo ou None)."""
+        total = len(items)
+        if total <= available:
+            return items, None
+
+        if self.overflow == "summary" and category is not None:
+            counts = {}
+            problems = []
+            for item in items:
+                name = category(item)
+                counts[name] = counts.get(name, 0) + 1
+                if name not in ok_categories and len(problems) < available:
+                    problems.append(item)
+            summary = " | ".join(f"{name}: {count}" for name, count in sorted(counts.items()))
+            hidden = total - len(problems)
+            return problems, f"Resumo de {total} sites: {summary} ({hidden} ocultos)"
+
+        pages = (total + available - 1) // available
+        page = int(time.monotonic() / self.page_seconds) % pages
+        start = page * available
+        end = min(start + available, total)
+        return (
+            items[start:end],
+            f"Página {page + 1}/{pages} (sites {start + 1}-{end} de {total}, alterna a cada {self.page_seconds:g}s)",
+        )
+
+    def invalidate(self):
+        """Força o redesenho completo no próximo quadro (ex.: algo foi impresso fora do renderizador)."""
+        self._previous = []
+        self._size = None
+
+    def render(self, lines, pinned=0):
+        if self._frame_start is None:
+            self._frame_start = time.perf_counter()
+        width, height = self._size_now()
+
+        if not self.interactive:
+            data = "\n".join(lines) + "\n\n"
+            written = len(lines)
+        else:
+            if len(lines) > height - 1:
+                # corta o meio do quadro e mantém as últimas `pinned` linhas
+                keep = min(pinned, height - 1)
+                lines = lines[:height - 1 - keep] + (lines[-keep:] if keep else [])
+            lines = [_fit(line, width) for line in lines]
+            full = (
+                not self._previous
+                or self._size != (width, height)
+                or self._frames_since_full >= self.full_redraw_every
+            )
+            out = []
+            if full:
+                out.append(CLEAR)
+                out.extend(f"{line}{ERASE_LINE}\n" for line in lines)
+                written = len(lines)
+                self._frames_since_full = 0
+                self.full_redraws += 1
+            else:
+                written = 0
+                previous = self._previous
+                for row, line in enumerate(lines):
+                    if row >= len(previous) or previous[row] != line:
+                        out.append(f"\033[{row + 1};1H{line}{ERASE_LINE}")
+                        written += 1
+                if len(lines) < len(previous):
+                    out.append(f"\033[{len(lines) + 1};1H{ERASE_BELOW}")
+                self._frames_since_full += 1
+            # deixa o cursor logo abaixo do quadro para que saídas de erro não o corrompam
+            out.append(f"\033[{len(lines) + 1};1H")
+            data = "".join(out)
+            self._previous = lines
+            self._size = (width, height)
+
+        self.stream.write(data)
+        self.stream.flush()
+        self._finish_frame(written, len(data))
+
+    def _size_now(self):
+        return shutil.get_terminal_size(fallback=(120, 40))
+
+    def _finish_frame(self, written, size):
+        elapsed = time.perf_counter() - self._frame_start
+        self._frame_start = None
+        self.frames += 1
+        self.last_frame_seconds = elapsed
+        self.total_frame_seconds += elapsed
+        self.max_frame_seconds = max(self.max_frame_seconds, elapsed)
+        self.last_lines_written = written
+        self.last_bytes_written = size
+
+        if elapsed > self.frame_budget:
+            self.over_budget += 1
+            current = self.row_limit if self.row_limit is not None else self._size_now()[1]
+            self.row_limit = max(self.min_rows, current // 2)
+        elif self.row_limit is not None and elapsed < self.frame_budget / 4:
+            self.row_limit *= 2
+            if self.row_limit >= self._size_now()[1]:
+                self.row_limit = None
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "full_redraws": self.full_redraws,
+            "over_budget": self.over_budget,
+            "last_frame_seconds": self.last_frame_seconds,
+            "avg_frame_seconds": self.total_frame_seconds / self.frames if self.frames else 0.0,
+            "max_frame_seconds": self.max_frame_seconds,
+            "last_lines_written": self.last_lines_written,
+            "last_bytes_written": self.last_bytes_written,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (
+            f"Tela: quadro {s['last_frame_seconds'] * 1000:.1f}ms (médio {s['avg_frame_seconds'] * 1000:.1f}ms, "
+            f"máx {s['max_frame_seconds'] * 1000:.1f}ms, orçamento {self.frame_budget * 1000:.0f}ms, "
+            f"{s['over_budget']} acima) | {s['last_lines_written']} linhas reescritas"
+        )
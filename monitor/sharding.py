@@ -0,0 +1,172 @@
+"""
+Divide a lista de sites entre vários processos (cada um com seu pool de
+checagem e seu GIL) e traz os resultados de volta ao processo pai por uma
+multiprocessing.Queue, em lotes.
+"""
+import logging
+import math
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+
+from monitor.dns_cache import host_of
+
+DEFAULT_FLUSH_INTERVAL = 0.05
+DEFAULT_MAX_BATCH = 512
+
+
+def split_sites(sites, shards, key=host_of):
+    """
+    Reparte os sites em `shards` listas mantendo os sites de um host juntos
+    (limite por host e cache de DNS continuam valendo); os hosts vão, do maior
+    para o menor, para o shard com menos sites. Um host com mais sites do que
+    a fatia de um shard é dividido, e aí o limite por host vale por processo.
+    """
+    shards = max(1, shards)
+    share = math.ceil(len(sites) / shards) or 1
+    groups = {}
+    for site in sites:
+        groups.setdefault(key(site) or site, []).append(site)
+    pieces = []
+    for group in groups.values():
+        pieces.extend(group[i:i + share] for i in range(0, len(group), share))
+    buckets = [[] for _ in range(shards)]
+    for piece in sorted(pieces, key=len, reverse=True):
+        min(buckets, key=len).extend(piece)
+    return [bucket for bucket in buckets if bucket]
+
+
+class ShardChannel:
+    """
+    Lado do processo filho: send() só enfileira localmente; uma thread envia
+    os itens acumulados ao pai a cada flush_interval (ou max_batch itens),
+    para não pagar um pickle + escrita no pipe por resultado.
+    """
+
+    def __init__(self, shard_id, results, flush_interval=DEFAULT_FLUSH_INTERVAL, max_batch=DEFAULT_MAX_BATCH):
+        self.shard_id = shard_id
+        self._results = results
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._local = queue.Queue()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"Shard-{shard_id}-sender", daemon=True)
+        self._thread.start()
+
+    def send(self, item):
+        self._local.put(("result", item))
+
+    def send_stats(self, stats):
+        self._local.put(("stats", stats))
+
+    def _run(self):
+        while not (self._closed.is_set() and self._local.empty()):
+            try:
+                batch = [self._local.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._local.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._results.put((self.shard_id, batch))
+
+    def close(self, timeout=5):
+        self._closed.set()
+        self._thread.join(timeout)
+        self._results.close()
+        self._results.join_thread()
+
+
+def _shard_main(target, shard_id, sites, results, stop_event, args):
+    # Ctrl+C chega ao grupo inteiro; quem encerra os filhos é o pai, via stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    channel = ShardChannel(shard_id, results)
+    try:
+        target(shard_id, sites, channel, stop_event, *args)
+    except Exception:
+        logging.exception(f"Shard {shard_id} terminou com erro")
+    finally:
+        channel.close()
+
+
+class ShardPool:
+    """
+    Lado do pai: sobe um processo por shard rodando
+    target(shard_id, sites, channel, stop_event, *args) e entrega os lotes
+    recebidos com poll(). Por padrão usa fork (os scripts não precisam ser
+    importáveis pelo filho); inicie antes de criar threads no pai.
+    """
+
+    def __init__(self, sites, processes, target, args=(), start_method="fork"):
+        available = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context(start_method if start_method in available else None)
+        self.shards = split_sites(sites, processes)
+        self.stop_event = self._ctx.Event()
+        self.results = self._ctx.Queue()
+        self._target = target
+        self._args = args
+        self._processes = []
+        self.batches = 0
+        self.items = 0
+
+    def start(self):
+        for shard_id, sites in enumerate(self.shards):
+            process = self._ctx.Process(
+                target=_shard_main,
+                args=(self._target, shard_id, sites, self.results, self.stop_event, self._args),
+                name=f"Shard-{shard_id}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def poll(self, timeout):
+        """Lista de (shard_id, tipo, item) recebidos até timeout segundos."""
+        received = []
+        try:
+            message = self.results.get(timeout=max(0.0, timeout))
+        except queue.Empty:
+            return received
+        while True:
+            shard_id, batch = message
+            self.batches += 1
+            self.items += len(batch)
+            received.extend((shard_id, kind, item) for kind, item in batch)
+            try:
+                message = self.results.get_nowait()
+            except queue.Empty:
+                return received
+
+    def alive(self):
+        return sum(1 for process in self._processes if process.is_alive())
+
+    def stop(self, timeout=5):
+        self.stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+                process.join(1)
+        self._processes = []
+
+
+def merge_stats(snapshots):
+    """Soma campo a campo (recursivamente) os dicionários de estatísticas dos shards."""
+    merged = {}
+    for snapshot in snapshots:
+        for name, value in snapshot.items():
+            if isinstance(value, dict):
+                merged[name] = merge_stats([merged.get(name, {}), value])
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[name] = merged.get(name, 0) + value
+    return merged
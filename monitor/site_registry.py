@@ -0,0 +1,39 @@
+import threading
+
+
+class SiteRegistry:
+    """
+    Interna URLs de sites em ids inteiros sequenciais, para que registros em
+    memória guardem um int em vez de uma cópia da string do site.
+    """
+
+    def __init__(self, sites=()):
+        self._ids = {}
+        self._names = []
+        self._lock = threading.Lock()
+        for site in sites:
+            self.intern(site)
+
+    def intern(self, site):
+        site_id = self._ids.get(site)
+        if site_id is not None:
+            return site_id
+        with self._lock:
+            site_id = self._ids.get(site)
+            if site_id is None:
+                site_id = len(self._names)
+                self._names.append(site)
+                self._ids[site] = site_id
+            return site_id
+
+    def name(self, site_id):
+        return self._names[site_id]
+
+    def get_id(self, site):
+        return self._ids.get(site)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(list(self._names))
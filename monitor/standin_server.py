@@ -0,0 +1,135 @@
+"""
+Servidor HTTP local no estilo httpbin, para medir as variantes sem depender
+de httpbin.org/uuidtools.com nem da rede:
+
+  /status/N              responde com o status N
+  /delay/S               espera S segundos e responde 200
+  /bytes/N               responde 200 com N bytes (página pesada)
+  /api/generate/v2|v4    devolve um UUID em JSON (como o uuidtools.com)
+  /blackhole             lê a requisição e nunca responde (timeout no cliente)
+
+Respostas 1xx, 204 e 304 saem sem corpo e sem Content-Length, como exige o
+HTTP/1.1; N ou S inválidos respondem 400.
+
+refused_url() devolve uma URL de uma porta local sem ninguém escutando
+(conexão recusada). Uso manual:
+
+    python -m monitor.standin_server --port 8080
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+import uuid
+
+
+async def _handle(reader, writer):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            method, path = head.split(b" ", 2)[:2]
+            path = path.decode()
+            keep_alive = b"connection: close" not in head.lower()
+            status, body = 200, b"ok"
+            parts = path.split("?", 1)[0].strip("/").split("/")
+            try:
+                if len(parts) == 2 and parts[0] == "status":
+                    status = int(parts[1])
+                    if not 100 <= status <= 599:
+                        raise ValueError(status)
+                elif len(parts) == 2 and parts[0] == "delay":
+                    await asyncio.sleep(float(parts[1]))
+                elif len(parts) == 2 and parts[0] == "bytes":
+                    body = b"x" * int(parts[1])
+                elif parts[:2] == ["api", "generate"]:
+                    body = json.dumps([str(uuid.uuid4())]).encode()
+                elif parts == ["blackhole"]:
+                    # espera o cliente desistir e fechar a conexão
+                    await reader.read()
+                    break
+            except ValueError:
+                status, body = 400, f"caminho inválido: {path}".encode()
+            if status < 200 or status in (204, 304):
+                # sem corpo: com keep-alive o cliente leria o "ok" como início da próxima resposta
+                length, payload = "", b""
+            else:
+                length = f"Content-Length: {len(body)}\r\n"
+                payload = b"" if method == b"HEAD" else body
+            writer.write(
+                f"HTTP/1.1 {status} X\r\n{length}"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except Exception:
+        pass
+    finally:
+        writer.close()
+
+
+def _serve(port, ready):
+    async def main():
+        server = await asyncio.start_server(_handle, "127.0.0.1", port, backlog=8192)
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def refused_url(path="/"):
+    """URL de uma porta que acabou de ser liberada: a conexão é recusada."""
+    return f"http://127.0.0.1:{free_port()}{path}"
+
+
+class LocalServer:
+    """Sobe o servidor em um processo separado; use como context manager."""
+
+    def __init__(self, port=0):
+        self.port = port or free_port()
+        self._ready = multiprocessing.Event()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.port, self._ready), daemon=True
+        )
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def __enter__(self):
+        self._process.start()
+        self._ready.wait(10)
+        time.sleep(0.1)
+        return self
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join(5)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor HTTP local para testes de carga.")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+    print(f"Servindo em http://127.0.0.1:{args.port} (Ctrl+C para sair)")
+    try:
+        _serve(args.port, None)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Codificação dos status das checagens em um inteiro de 16 bits.
+Códigos HTTP e os códigos negativos do fcfs/priority-manager (-1 a -4) são
+guardados como estão; os status textuais do site-manager.py recebem códigos
+a partir de 1000.
+"""
+
+STATUS_NAMES = {
+    1001: "Timeout",
+    1002: "Conn Error",
+    1003: "Req Error",
+    1004: "Failed",
+    1005: "Pending",
+    1006: "Checking...",
+    1007: "Aguardando 1ª checagem...",
+    1008: "Erro Desconhecido",
+}
+STATUS_CODES = {name: code for code, name in STATUS_NAMES.items()}
+UNKNOWN_STATUS = 1999
+
+
+def encode_status(status):
+    if isinstance(status, int) and -32768 <= status < 1000:
+        return status
+    return STATUS_CODES.get(status, UNKNOWN_STATUS)
+
+
+def decode_status(code):
+    if code < 1000:
+        return code
+    return STATUS_NAMES.get(code, "Unknown")
@@ -0,0 +1,261 @@
+"""
+Tabela de status por id de site em arrays de largura fixa: código de status
+(int16, monitor/status_codes.py), última latência e horário da última
+checagem (float64), as fases da última checagem (monitor/phases.py, NaN nas
+fases não medidas) e um número de sequência (uint32) por linha. As mensagens
+ficam em uma lista à parte.
+
+Cada linha é protegida por um seqlock: o escritor deixa a sequência ímpar
+enquanto grava e par ao terminar; o leitor relê a linha se a sequência mudou
+ou estava ímpar, então a tela pega instantâneos consistentes sem lock global.
+Com shared=True os arrays (e a lista de sites) ficam em memória compartilhada
+e outros processos podem ler a tabela:
+
+    python -m monitor.status_table <nome>
+"""
+import argparse
+import json
+import math
+import struct
+import threading
+import time
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+
+from monitor.phases import PHASES, PhaseTimings
+from monitor.site_registry import SiteRegistry
+from monitor.status_codes import decode_status, encode_status
+
+_MAGIC = b"STv2"
+_HEADER = struct.Struct("<4sII")
+_HEADER_SIZE = 16
+_WRITE_LOCKS = 16
+MAX_SPINS = 100
+
+StatusRow = namedtuple("StatusRow", ("status", "message", "latency", "checked_at", "seq"))
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _layout(capacity):
+    seq = _HEADER_SIZE
+    status = _align(seq + 4 * capacity)
+    latency = _align(status + 2 * capacity)
+    checked_at = latency + 8 * capacity
+    phases = checked_at + 8 * capacity
+    failed = phases + 8 * len(PHASES) * capacity
+    names = _align(failed + capacity)
+    return seq, status, latency, checked_at, phases, failed, names
+
+
+class StatusTable:
+    def __init__(self, sites, initial_status="Pending", shared=False, name=None):
+        sites = list(dict.fromkeys(sites))
+        self.registry = SiteRegistry(sites)
+        self.capacity = len(sites)
+        names = json.dumps(sites).encode()
+        size = _layout(self.capacity)[-1] + len(names)
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size) if shared else None
+        self._owner = shared
+        buf = self._shm.buf if shared else bytearray(size)
+        _HEADER.pack_into(buf, 0, _MAGIC, self.capacity, len(names))
+        buf[_layout(self.capacity)[-1]:size] = names
+        self._map(buf)
+        code = encode_status(initial_status)
+        for i in range(self.capacity):
+            self._status[i] = code
+            self._latency[i] = math.nan
+            self._failed[i] = -1
+        for i in range(len(self._phases)):
+            self._phases[i] = math.nan
+        self._messages = [""] * self.capacity
+        self._write_locks = [threading.Lock() for _ in range(_WRITE_LOCKS)]
+        self.writes = 0
+        self.read_retries = 0
+
+    def _map(self, buf):
+        seq, status, latency, checked_at, phases, failed, _ = _layout(self.capacity)
+        view = self._view = memoryview(buf)
+        self._seq = view[seq:seq + 4 * self.capacity].cast("I")
+        self._status = view[status:status + 2 * self.capacity].cast("h")
+        self._latency = view[latency:latency + 8 * self.capacity].cast("d")
+        self._checked_at = view[checked_at:checked_at + 8 * self.capacity].cast("d")
+        self._phases = view[phases:phases + 8 * len(PHASES) * self.capacity].cast("d")
+        self._failed = view[failed:failed + self.capacity].cast("b")
+
+    @classmethod
+    def attach(cls, name):
+        """Abre, só para leitura, a tabela compartilhada criada por outro processo (sem mensagens)."""
+        table = cls.__new__(cls)
+        table._shm = shared_memory.SharedMemory(name=name)
+        # quem criou a tabela é quem a remove; sem isto o resource_tracker
+        # removeria o segmento quando o leitor terminasse
+        resource_tracker.unregister(table._shm._name, "shared_memory")
+        table._owner = False
+        magic, capacity, names_len = _HEADER.unpack_from(table._shm.buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{name} não é uma tabela de status")
+        table.capacity = capacity
+        names_at = _layout(capacity)[-1]
+        table.registry = SiteRegistry(json.loads(bytes(table._shm.buf[names_at:names_at + names_len])))
+        table._map(table._shm.buf)
+        table._messages = None
+        table._write_locks = None
+        table.writes = 0
+        table.read_retries = 0
+        return table
+
+    @property
+    def name(self):
+        return self._shm.name if self._shm is not None else None
+
+    def set(self, site, status, message="", latency=None, checked_at=None, phases=None):
+        """
+        Grava a linha do site (um escritor por vez por linha; os leitores não
+        bloqueiam). latency=None grava NaN e phases=None (PhaseTimings) apaga
+        as fases: a linha nunca mistura o status de uma checagem com os tempos
+        de outra. checked_at=None mantém o horário da última checagem
+        concluída (usado no "Checking...").
+        """
+        i = self.registry.get_id(site)
+        if i is None:
+            raise KeyError(site)
+        with self._write_locks[i % _WRITE_LOCKS]:
+            seq = self._seq[i]
+            self._seq[i] = (seq + 1) & 0xFFFFFFFF
+            self._status[i] = encode_status(status)
+            self._latency[i] = math.nan if latency is None else latency
+            if checked_at is not None:
+                self._checked_at[i] = checked_at
+            base = i * len(PHASES)
+            for k in range(len(PHASES)):
+                value = phases[k] if phases is not None else None
+                self._phases[base + k] = math.nan if value is None else value
+            failed = phases.failed if phases is not None else None
+            self._failed[i] = PHASES.index(failed) if failed is not None else -1
+            self._messages[i] = message
+            self._seq[i] = (seq + 2) & 0xFFFFFFFF
+            self.writes += 1
+
+    def _read(self, i):
+        seq = 0
+        for _ in range(MAX_SPINS):
+            seq = self._seq[i]
+            if seq & 1:
+                self.read_retries += 1
+                time.sleep(0)
+                continue
+            row = StatusRow(
+                decode_status(self._status[i]),
+                self._messages[i] if self._messages is not None else "",
+                self._latency[i],
+                self._checked_at[i],
+                seq,
+            )
+            if self._seq[i] == seq:
+                return row
+            self.read_retries += 1
+        if self._write_locks is None:
+            # leitor de outro processo sem leitura consistente: o escritor
+            # morreu no meio da linha (ou não para de gravar nela)
+            return StatusRow("Unknown", "", math.nan, 0.0, seq)
+        # escritor preso no meio da linha: espera por ele
+        with self._write_locks[i % _WRITE_LOCKS]:
+            return self._read(i)
+
+    def phases(self, site):
+        """PhaseTimings da última checagem do site, ou None se não houver."""
+        i = self.registry.get_id(site)
+        if i is None:
+            raise KeyError(site)
+        base = i * len(PHASES)
+        for _ in range(MAX_SPINS):
+            seq = self._seq[i]
+            if seq & 1:
+                time.sleep(0)
+                continue
+            values = self._phases[base:base + len(PHASES)].tolist()
+            failed = self._failed[i]
+            if self._seq[i] == seq:
+                break
+        else:
+            return None
+        if all(math.isnan(value) for value in values) and failed < 0:
+            return None
+        return PhaseTimings(
+            *(None if math.isnan(value) else value for value in values),
+            failed=PHASES[failed] if failed >= 0 else None,
+        )
+
+    def get(self, site):
+        i = self.registry.get_id(site)
+        if i is None:
+            raise KeyError(site)
+        return self._read(i)
+
+    def snapshot(self):
+        """
+        Lista de (site, StatusRow), cada linha consistente. Copia os arrays
+        inteiros de uma vez e só relê, uma a uma, as linhas cuja sequência
+        mudou (ou estava ímpar) durante a cópia.
+        """
+        before = self._seq.tolist()
+        statuses = self._status.tolist()
+        latencies = self._latency.tolist()
+        checked = self._checked_at.tolist()
+        messages = list(self._messages) if self._messages is not None else [""] * self.capacity
+        after = self._seq.tolist()
+        decoded = {code: decode_status(code) for code in set(statuses)}
+        rows = list(map(StatusRow, map(decoded.__getitem__, statuses), messages, latencies, checked, before))
+        if before != after:
+            for i, seq in enumerate(before):
+                if seq != after[i]:
+                    self.read_retries += 1
+                    rows[i] = self._read(i)
+        for i, seq in enumerate(before):
+            if seq & 1 and seq == after[i]:
+                self.read_retries += 1
+                rows[i] = self._read(i)
+        return list(zip(self.registry, rows))
+
+    def __len__(self):
+        return self.capacity
+
+    def stats(self):
+        return {
+            "sites": self.capacity,
+            "writes": self.writes,
+            "read_retries": self.read_retries,
+            "bytes": _layout(self.capacity)[-1],
+            "shared": self.name,
+        }
+
+    def close(self):
+        if self._shm is None:
+            return
+        for view in (self._seq, self._status, self._latency, self._checked_at, self._phases, self._failed, self._view):
+            view.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mostra uma tabela de status em memória compartilhada.")
+    parser.add_argument("name")
+    args = parser.parse_args(argv)
+    table = StatusTable.attach(args.name)
+    try:
+        for site, row in table.snapshot():
+            checked = time.strftime("%H:%M:%S", time.localtime(row.checked_at)) if row.checked_at else "-"
+            latency = f"{row.latency:.3f}s" if not math.isnan(row.latency) else "-"
+            print(f"{site:<40} {row.status!s:<12} {latency:>9} {checked}")
+    finally:
+        table.close()
+
+
+if __name__ == "__main__":
+    main()
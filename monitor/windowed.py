@@ -0,0 +1,71 @@
+import collections
+import threading
+import time
+
+
+class SlidingWindowStats:
+    """
+    Contagem e soma por chave em baldes de tempo fixos (bucket_seconds),
+    guardados em um anel limitado a horizon_seconds. add() é O(1): soma no
+    balde atual ou abre um novo e descarta os que saíram do horizonte.
+    window() soma só os baldes dentro da janela pedida, sem cópias.
+
+    Só os baldes que receberam amostras são guardados, então uma chave com
+    poucas amostras (um site checado a cada 10s) ocupa poucos baldes.
+    """
+
+    def __init__(self, bucket_seconds=1.0, horizon_seconds=900.0, clock=time.time):
+        self.bucket_seconds = bucket_seconds
+        self.horizon_buckets = int(horizon_seconds / bucket_seconds)
+        self.clock = clock
+        self._rings = {}
+        self._lock = threading.Lock()
+
+    def add(self, key, value, now=None):
+        bucket = int((self.clock() if now is None else now) / self.bucket_seconds)
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                ring = self._rings[key] = collections.deque(maxlen=self.horizon_buckets)
+            if ring and ring[-1][0] == bucket:
+                last = ring[-1]
+                last[1] += 1
+                last[2] += value
+            else:
+                ring.append([bucket, 1, value])
+            oldest = bucket - self.horizon_buckets
+            while ring[0][0] <= oldest:
+                ring.popleft()
+
+    def window(self, key, seconds, now=None):
+        """(contagem, soma) das amostras da chave nos últimos `seconds`."""
+        first = int((self.clock() if now is None else now) / self.bucket_seconds) - int(seconds / self.bucket_seconds) + 1
+        count = 0
+        total = 0.0
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                return 0, 0.0
+            for bucket, bucket_count, bucket_total in reversed(ring):
+                if bucket < first:
+                    break
+                count += bucket_count
+                total += bucket_total
+        return count, total
+
+    def average(self, key, seconds, now=None):
+        count, total = self.window(key, seconds, now)
+        return total / count if count else None
+
+    def keys(self):
+        with self._lock:
+            return list(self._rings)
+
+
+def format_windows(stats, key, windows):
+    parts = []
+    for seconds in windows:
+        count, total = stats.window(key, seconds)
+        label = f"{seconds // 60:g}min" if seconds >= 60 else f"{seconds:g}s"
+        parts.append(f"{label} {total / count:.3f}s ({count})" if count else f"{label} N/A")
+    return " | ".join(parts)
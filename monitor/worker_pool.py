@@ -0,0 +1,105 @@
+import itertools
+import logging
+import queue
+import threading
+
+_STOP = object()
+
+
+class WorkerPool:
+    """
+    Pool fixo de threads worker que consome uma fila compartilhada.
+    Com ordering="fifo" as tarefas rodam na ordem de chegada (FCFS); com
+    ordering="priority" os workers sempre pegam a tarefa de menor prioridade
+    da PriorityQueue, preservando a ordem de despacho até a execução.
+    Cada chave (site) fica no máximo uma vez na fila ou em execução.
+    """
+
+    def __init__(self, max_workers, ordering="fifo", name_prefix="Worker"):
+        if ordering not in ("fifo", "priority"):
+            raise ValueError(f"ordering inválido: {ordering}")
+        self.max_workers = max_workers
+        self.ordering = ordering
+        self.name_prefix = name_prefix
+        self._queue = queue.PriorityQueue() if ordering == "priority" else queue.Queue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._threads = []
+
+        self.threads_created = 0
+        self.tasks_run = 0
+        self.skipped_in_flight = 0
+        self.active = 0
+        self.peak_active = 0
+
+    def start(self):
+        with self._lock:
+            while len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f"{self.name_prefix}-{len(self._threads) + 1}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                self.threads_created += 1
+                thread.start()
+
+    def submit(self, key, fn, *args, priority=0):
+        """Enfileira fn(*args); retorna False se a chave ainda está na fila ou rodando."""
+        with self._lock:
+            if key in self._pending:
+                self.skipped_in_flight += 1
+                return False
+            self._pending.add(key)
+        self._queue.put((priority, next(self._seq), key, fn, args))
+        return True
+
+    def _worker(self):
+        while True:
+            priority, _, key, fn, args = self._queue.get()
+            if fn is _STOP:
+                break
+            with self._lock:
+                self.active += 1
+                self.peak_active = max(self.peak_active, self.active)
+            try:
+                fn(*args)
+            except Exception:
+                logging.exception(f"Erro não tratado na tarefa {key}")
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.tasks_run += 1
+                    self._pending.discard(key)
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def shutdown(self, wait=True):
+        for _ in self._threads:
+            self._queue.put((float("inf"), next(self._seq), None, _STOP, ()))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": len(self._threads),
+                "threads_created": self.threads_created,
+                "active": self.active,
+                "peak_active": self.peak_active,
+                "queued": self._queue.qsize(),
+                "tasks_run": self.tasks_run,
+                "skipped_in_flight": self.skipped_in_flight,
+            }
+
+    def format_stats(self):
+        s = self.stats()
+        return (
+            f"Workers: {s['workers']} threads ({s['threads_created']} criadas) | "
+            f"{s['active']} em andamento (pico {s['peak_active']}) | fila {s['queued']} | "
+            f"{s['skipped_in_flight']} reenvios evitados"
+        )
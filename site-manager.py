@@ -4,34 +4,183 @@ import threading
 from concurrent.futures import ThreadPoolExecutor
 import time
 import os
+import sys
 import datetime
+import math
+
+from monitor.adaptive import AdaptiveIntervals
+from monitor.async_engine import (
+    AsyncCheckEngine,
+    CheckConnectionError,
+    CheckError,
+    CheckTimeout,
+    probe,
+)
+from monitor.binlog import BinaryLogDecoder, BinaryLogEncoder
+from monitor.dns_cache import DnsCache
+from monitor.handoff import SegmentLog
+from monitor.history import HistoryStore
+from monitor.host_dispatch import HostDispatcher, pass_through_submit
+from monitor.http_pool import SessionPool
+from monitor.latency import QUANTILES, LatencyStats, format_compact, format_summary
+from monitor.log_index import LogIndexWriter
+from monitor.metrics import MetricsEndpoint
+from monitor.phases import PHASES, PhaseTimer, format_phase_breakdown, format_phases, record_phases
+from monitor.log_writer import BatchedLogWriter
+from monitor.rotation import LogRotator
+from monitor.scheduler import SiteScheduler
+from monitor.screen import ScreenRenderer
+from monitor.sharding import ShardPool, merge_stats
+from monitor.status_table import StatusTable
+from monitor.site_registry import SiteRegistry
 
 LOG_DIR = "logs"
 SUCCESS_LOG_FILE = os.path.join(LOG_DIR, "success.log")
 WARNING_LOG_FILE = os.path.join(LOG_DIR, "warning.log")
 ERROR_LOG_FILE = os.path.join(LOG_DIR, "error.log")
 GENERAL_LOG_FILE = os.path.join(LOG_DIR, "general.log")
+# Histórico em SQLite (monitor/history.py), alimentado pelas threads
+# escritoras e mantido entre execuções; None desliga. Retenção em segundos
+# dos resultados brutos e dos rollups de 1 minuto e 1 hora.
+HISTORY_DB = os.path.join(LOG_DIR, "history.db")
+HISTORY_RETENTION = {"raw": 24 * 3600, "1m": 7 * 24 * 3600, "1h": 365 * 24 * 3600}
+
+# Rotação do general.log (monitor/rotation.py): por tamanho e/ou idade em
+# segundos, com compressão ("gzip", "zstd" ou None) em segundo plano e
+# retenção por número de segmentos e/ou bytes.
+LOG_ROTATE_MAX_BYTES = 64 * 1024 * 1024
+LOG_ROTATE_MAX_AGE = None
+LOG_ROTATE_KEEP = 10
+LOG_ROTATE_MAX_TOTAL_BYTES = None
+LOG_ROTATE_COMPRESSION = "gzip"
 
 PRIORITY_SCHEDULER_INTERVAL = 5
 UPDATE_INTERVAL = 1
+CHECK_INTERVAL = 2.0
+# Intervalo adaptativo: sites estáveis dobram o intervalo a cada 3 checagens
+# iguais até ADAPTIVE_MAX_INTERVAL e voltam ao intervalo base em mudança de
+# status ou anomalia de latência (monitor/adaptive.py).
+ADAPTIVE_INTERVALS = True
+ADAPTIVE_MAX_INTERVAL = 60.0
+
+# "threads" usa um ThreadPoolExecutor com requests; "asyncio" roda todas as
+# checagens em um único event loop (monitor/async_engine.py).
+CHECK_ENGINE = "threads"
+ASYNC_MAX_CONCURRENCY = 1000
+
+# Com CHECK_PROCESSES > 1 os sites são divididos entre processos filhos (cada
+# um com seu pool de checagem e seu GIL, monitor/sharding.py); o processo pai
+# recebe os resultados, grava os logs e desenha a tela. 0 = um por núcleo.
+CHECK_PROCESSES = 1
+
+HTTP_POOL_SIZE = 10
+HTTP_POOL_IDLE_TIMEOUT = 30.0
+MAX_CHECKS_PER_HOST = 4
+
+DNS_CACHE_TTL = 300.0
+DNS_NEGATIVE_TTL = 30.0
+
+PROBE_METHOD = "stream"
+PROBE_MAX_BYTES = 0
+
+# "batched" grava os logs por categoria em lotes com o arquivo aberto
+# (monitor/log_writer.py); "fcfs" abre/fecha o arquivo a cada entrada.
+LOG_WRITER_MODE = "batched"
+LOG_FLUSH_EVERY = 256
+LOG_FLUSH_INTERVAL_MS = 200
+LOG_FSYNC = "never"
+LOG_MAX_BATCH = 1024
+# stop() espera até SHUTDOWN_TIMEOUT segundos as escritoras esvaziarem as filas
+SHUTDOWN_TIMEOUT = 5.0
+
+# "text" grava os logs por categoria no formato timestamp|status|site|mensagem;
+# "binary" usa o formato compacto de monitor/binlog.py.
+LOG_FORMAT = "text"
+
+# "segments" entrega os LogEntry dos escritores ao agendador prioritário por
+# segmentos em memória (monitor/handoff.py); "files" relê e trunca os logs.
+HANDOFF_MODE = "segments"
+
+# Tela: com mais sites do que linhas no terminal, "paginate" alterna páginas e
+# "summary" mostra contagens por categoria e só os sites com problema.
+SCREEN_OVERFLOW = "paginate"
+SCREEN_FRAME_BUDGET_MS = 50
+
+# Status dos sites em arrays por id de site com seqlock por linha
+# (monitor/status_table.py); com True a tabela fica em memória compartilhada e
+# pode ser lida de outro processo com "python -m monitor.status_table <nome>".
+STATUS_TABLE_SHARED = False
+
+# Endpoint Prometheus local em http://METRICS_HOST:METRICS_PORT/metrics
+# (monitor/metrics.py), remontado em segundo plano a cada
+# METRICS_REFRESH_SECONDS. None desliga; 0 escolhe uma porta livre.
+METRICS_PORT = None
+METRICS_HOST = "127.0.0.1"
+METRICS_REFRESH_SECONDS = 5.0
+
+SITE_REGISTRY = SiteRegistry()
+
 
 class LogEntry:
-    def __init__(self, site, status, message, arrival_time):
-        self.site = site
+    """
+    Resultado de uma checagem. Usa __slots__, guarda o site como id interno
+    (SITE_REGISTRY) e os horários como timestamps float; a mensagem pode ser
+    um modelo ("Online - {0:.3f}s") formatado com value apenas quando lida.
+    """
+
+    __slots__ = ("site_id", "status", "_message", "_value", "arrival_ts", "priority_process_ts", "fcfs_write_ts")
+
+    def __init__(self, site, status, message, arrival_time, value=None):
+        self.site_id = SITE_REGISTRY.intern(site)
         self.status = status
-        self.message = message
-        self.arrival_time = arrival_time
+        self._message = message
+        self._value = value
+        self.arrival_ts = arrival_time.timestamp() if isinstance(arrival_time, datetime.datetime) else arrival_time
+
+        self.priority_process_ts = None
+        self.fcfs_write_ts = None
+
+    @property
+    def site(self):
+        return SITE_REGISTRY.name(self.site_id)
+
+    @property
+    def message(self):
+        if self._value is None:
+            return self._message
+        return self._message.format(self._value)
+
+    @property
+    def arrival_time(self):
+        return datetime.datetime.fromtimestamp(self.arrival_ts)
 
-        self.priority_process_time = None
+    @property
+    def priority_process_time(self):
+        return datetime.datetime.fromtimestamp(self.priority_process_ts) if self.priority_process_ts is not None else None
+
+    @property
+    def fcfs_write_time(self):
+        return datetime.datetime.fromtimestamp(self.fcfs_write_ts) if self.fcfs_write_ts is not None else None
 
     def __str__(self):
         arrival_str = self.arrival_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-        priority_process_str = self.priority_process_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3] if self.priority_process_time else "N/A"
+        priority_process_str = self.priority_process_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3] if self.priority_process_ts is not None else "N/A"
         return f"Arrival: {arrival_str} | Priority_Process: {priority_process_str} | Status: {self.status} | Site: {self.site} | Message: {self.message}"
 
     def to_file_str(self):
-        arrival_timestamp = self.arrival_time.timestamp()
-        return f"{arrival_timestamp}|{self.status}|{self.site}|{self.message}"
+        return f"{self.arrival_ts}|{self.status}|{self.site}|{self.message}"
+
+    def to_binary(self, encoder):
+        return encoder.encode(self.arrival_ts, self.status, self.site, self.message)
+
+    def to_history_row(self, category):
+        """(site, ts, status, latência, categoria) para o HistoryStore; a latência é o value das respostas HTTP."""
+        return (self.site, self.arrival_ts, self.status, self._value, category)
+
+    @classmethod
+    def from_record(cls, record):
+        arrival_timestamp, status, site, message = record
+        return cls(site, status, message, arrival_timestamp)
 
     @classmethod
     def from_file_str(cls, line):
@@ -39,21 +188,30 @@ class LogEntry:
             parts = line.strip().split('|', 3)
             if len(parts) == 4:
                 arrival_timestamp, status_str, site, message = parts
-                arrival_time = datetime.datetime.fromtimestamp(float(arrival_timestamp))
                 try:
                     status = int(status_str)
                 except ValueError:
                     status = status_str
-                return cls(site, status, message, arrival_time)
+                return cls(site, status, message, float(arrival_timestamp))
         except Exception as e:
             print(f"Erro ao parsear linha de log: {line.strip()} - {e}")
         return None
 
 
 class SiteManager:
-    def __init__(self, sites):
+    def __init__(self, sites, check_intervals=None, probe_methods=None, shard=None):
         self.sites = sites
-        self.status_dict = {site: {"status": "Pending", "message": ""} for site in sites}
+        self.check_intervals = check_intervals or {}
+        self.probe_methods = probe_methods or {}
+        self.shard = shard
+        self.shard_pool = None
+        self.shard_stats = {}
+        self.threads = []
+        self.scheduler = None
+        self.dispatcher = None
+        self.metrics = None
+        self.history = None
+        self.status_table = StatusTable(sites, shared=STATUS_TABLE_SHARED and shard is None)
         self.last_update = 0
 
         self.success_queue = queue.Queue()
@@ -67,6 +225,12 @@ class SiteManager:
 
         self._stop_event = threading.Event()
 
+        self.dns = DnsCache(ttl=DNS_CACHE_TTL, negative_ttl=DNS_NEGATIVE_TTL)
+        self.http = SessionPool(pool_size=HTTP_POOL_SIZE, idle_timeout=HTTP_POOL_IDLE_TIMEOUT, dns_cache=self.dns)
+        self.latency = LatencyStats()
+        self.adaptive = AdaptiveIntervals(CHECK_INTERVAL, ADAPTIVE_MAX_INTERVAL)
+        self.screen = ScreenRenderer(overflow=SCREEN_OVERFLOW, frame_budget_ms=SCREEN_FRAME_BUDGET_MS)
+
         self.current_run_stats = {
             "success": {"total_wait": 0, "count": 0},
             "warning": {"total_wait": 0, "count": 0},
@@ -81,7 +245,16 @@ class SiteManager:
         }
         self.avg_waiting_times_overall = {"success": 0, "warning": 0, "error": 0}
 
-        self._setup_logging()
+        self.handoffs = {category: SegmentLog() for category in ("success", "warning", "error")}
+        self.handoff_offsets = {category: 0 for category in self.handoffs}
+        self._binary_decoders = {}
+        self.priority_cycle_stats = {"cycle_seconds": 0.0, "entries": 0, "lock_hold_seconds": 0.0}
+        self.general_rotator = None
+        self.general_index = None
+
+        if shard is None:
+            # nos processos filhos quem grava os logs é o pai
+            self._setup_logging()
 
     def _setup_logging(self):
         os.makedirs(LOG_DIR, exist_ok=True)
@@ -98,90 +271,257 @@ class SiteManager:
                 print(f"Arquivo de log limpo: {log_file}")
             except IOError as e:
                 print(f"Erro ao limpar arquivo {log_file}: {e}")
+        self.general_rotator = LogRotator(
+            GENERAL_LOG_FILE,
+            max_bytes=LOG_ROTATE_MAX_BYTES,
+            max_age=LOG_ROTATE_MAX_AGE,
+            keep=LOG_ROTATE_KEEP,
+            max_total_bytes=LOG_ROTATE_MAX_TOTAL_BYTES,
+            compression=LOG_ROTATE_COMPRESSION,
+        )
+        self.general_index = LogIndexWriter(GENERAL_LOG_FILE)
+
+
+    def _publish_response(self, site, status_code, elapsed_time, arrival_ts, phases=None):
+        if 200 <= status_code < 300:
+            template = "Online - {0:.3f}s"
+            target_queue = self.success_queue
+            category = "success"
+        elif 400 <= status_code < 500:
+            template = sys.intern(f"Client Error ({status_code}) - {{0:.3f}}s")
+            target_queue = self.warning_queue
+            category = "warning"
+        elif 500 <= status_code < 600:
+            template = sys.intern(f"Server Error ({status_code}) - {{0:.3f}}s")
+            target_queue = self.error_queue
+            category = "error"
+        else:
+            template = sys.intern(f"Unknown status ({status_code}) - {{0:.3f}}s")
+            target_queue = self.warning_queue
+            category = "warning"
+        self.latency.record("http", elapsed_time, site=site, category=category)
+        record_phases(self.latency, phases, site=site, category=category)
+        log_entry = LogEntry(site, status_code, template, arrival_ts, value=elapsed_time)
+        target_queue.put(log_entry)
+        return log_entry.message
+
+    def _publish_failure(self, site, status_code, message, arrival_ts, phases=None):
+        record_phases(self.latency, phases, site=site, category="error")
+        self.error_queue.put(LogEntry(site, status_code, message, arrival_ts))
+        return message
+
+    def _set_final_status(self, site, status_code, message, elapsed_time=None, phases=None):
+        if status_code is not None:
+             self.status_table.set(
+                 site, status_code, message, latency=elapsed_time, checked_at=time.time(), phases=phases
+             )
+        else:
+             self.status_table.set(site, "Failed", "Check Failed", checked_at=time.time())
+        self._observe_interval(site, status_code, elapsed_time)
+
+    def _observe_interval(self, site, status_code, elapsed_time):
+        if ADAPTIVE_INTERVALS and self.scheduler is not None:
+            base = self.check_intervals.get(site, CHECK_INTERVAL)
+            self.scheduler.set_interval(site, self.adaptive.observe(site, status_code, elapsed_time, base=base))
+
+    def _apply_result(self, site, arrival_ts, status_code, elapsed_time, failure, phases=None):
+        """Publica o resultado de uma checagem (local ou vinda de um shard) e atualiza o status."""
+        message = ""
+        try:
+            if failure is None:
+                message = self._publish_response(site, status_code, elapsed_time, arrival_ts, phases)
+            else:
+                message = self._publish_failure(site, status_code, failure, arrival_ts, phases)
+        finally:
+            self._set_final_status(site, status_code, message, elapsed_time, phases)
+
+    def _probe_site(self, site):
+        """(status_code, elapsed_time, mensagem de falha ou None, PhaseTimings) de uma checagem."""
+        timer = PhaseTimer()
+        try:
+            response = self.http.probe(
+                site, self.probe_methods.get(site, PROBE_METHOD), timeout=10, max_bytes=PROBE_MAX_BYTES,
+                timing=timer,
+            )
+        except requests.exceptions.Timeout:
+            return "Timeout", None, "Connection Timeout", timer.result()
+        except requests.exceptions.ConnectionError:
+            return "Conn Error", None, "Connection Error", timer.result()
+        except requests.exceptions.RequestException as e:
+            return "Req Error", None, f"Request Error: {type(e).__name__}", timer.result()
+        return response.status_code, response.elapsed.total_seconds(), None, response.timing
 
+    async def _probe_site_async(self, site):
+        timer = PhaseTimer()
+        try:
+            response = await probe(
+                site, self.probe_methods.get(site, PROBE_METHOD), timeout=10, max_bytes=PROBE_MAX_BYTES,
+                dns_cache=self.dns, timing=timer,
+            )
+        except CheckTimeout:
+            return "Timeout", None, "Connection Timeout", timer.result()
+        except CheckConnectionError:
+            return "Conn Error", None, "Connection Error", timer.result()
+        except CheckError as e:
+            return "Req Error", None, f"Request Error: {e.kind}", timer.result()
+        return response.status_code, response.elapsed, None, response.timing
 
     def check_status(self, site):
         if self._stop_event.is_set():
             return
 
-        arrival_time = datetime.datetime.now()
-        status_code = None
-        message = ""
+        arrival_ts = time.time()
+        self.status_table.set(site, "Checking...")
+        try:
+            result = self._probe_site(site)
+        except Exception:
+            self._set_final_status(site, None, "")
+            raise
+        self._apply_result(site, arrival_ts, *result)
+
+    async def check_status_async(self, site):
+        """Mesmo contrato de check_status, executado no event loop do AsyncCheckEngine."""
+        if self._stop_event.is_set():
+            return
 
+        arrival_ts = time.time()
+        self.status_table.set(site, "Checking...")
         try:
-            self.status_dict[site] = {"status": "Checking...", "message": ""}
-            response = requests.get(site, timeout=10)
-            status_code = response.status_code
-            elapsed_time = response.elapsed.total_seconds()
-
-            if 200 <= status_code < 300:
-                message = f"Online - {elapsed_time:.3f}s"
-                log_entry = LogEntry(site, status_code, message, arrival_time)
-                self.success_queue.put(log_entry)
-            elif 400 <= status_code < 500:
-                message = f"Client Error ({status_code}) - {elapsed_time:.3f}s"
-                log_entry = LogEntry(site, status_code, message, arrival_time)
-                self.warning_queue.put(log_entry)
-            elif 500 <= status_code < 600:
-                message = f"Server Error ({status_code}) - {elapsed_time:.3f}s"
-                log_entry = LogEntry(site, status_code, message, arrival_time)
-                self.error_queue.put(log_entry)
-            else:
-                message = f"Unknown status ({status_code}) - {elapsed_time:.3f}s"
-                log_entry = LogEntry(site, status_code, message, arrival_time)
-                self.warning_queue.put(log_entry)
+            result = await self._probe_site_async(site)
+        except Exception:
+            self._set_final_status(site, None, "")
+            raise
+        self._apply_result(site, arrival_ts, *result)
+
+    def _shard_check(self, site):
+        """check_status dos processos filhos: o resultado vai para o pai, que publica."""
+        if self._stop_event.is_set():
+            return
+        arrival_ts = time.time()
+        status_code, elapsed_time, failure, phases = self._probe_site(site)
+        self.shard.send((site, arrival_ts, status_code, elapsed_time, failure, phases))
+        self._observe_interval(site, status_code, elapsed_time)
 
-        except requests.exceptions.Timeout:
-            status_code = "Timeout"
-            message = "Connection Timeout"
-            log_entry = LogEntry(site, status_code, message, arrival_time)
-            self.error_queue.put(log_entry)
-        except requests.exceptions.ConnectionError:
-            status_code = "Conn Error"
-            message = "Connection Error"
-            log_entry = LogEntry(site, status_code, message, arrival_time)
-            self.error_queue.put(log_entry)
-        except requests.exceptions.RequestException as e:
-            status_code = "Req Error"
-            message = f"Request Error: {type(e).__name__}"
-            log_entry = LogEntry(site, status_code, message, arrival_time)
-            self.error_queue.put(log_entry)
-        finally:
-            if status_code is not None:
-                 self.status_dict[site] = {"status": status_code, "message": message}
-            else:
-                 self.status_dict[site] = {"status": "Failed", "message": "Check Failed"}
+    async def _shard_check_async(self, site):
+        if self._stop_event.is_set():
+            return
+        arrival_ts = time.time()
+        status_code, elapsed_time, failure, phases = await self._probe_site_async(site)
+        self.shard.send((site, arrival_ts, status_code, elapsed_time, failure, phases))
+        self._observe_interval(site, status_code, elapsed_time)
 
 
-    def _fcfs_log_writer(self, log_queue, log_file, file_lock, category_name):
+    def _fcfs_log_writer(self, log_queue, log_file, file_lock, category_name, handoff=None):
         print(f"Iniciando thread escritora FCFS para: {category_name}")
-        while not self._stop_event.is_set():
-            try:
-                log_entry = log_queue.get(timeout=0.5)
+        encoder = BinaryLogEncoder() if LOG_FORMAT == "binary" else None
 
-                log_entry.fcfs_write_time = datetime.datetime.now()
+        def write_entry(log_entry):
+            log_entry.fcfs_write_ts = time.time()
 
-                with file_lock:
-                    try:
+            with file_lock:
+                try:
+                    if encoder is not None:
+                        with open(log_file, 'ab') as f:
+                            f.write(log_entry.to_binary(encoder))
+                    else:
                         with open(log_file, 'a') as f:
                             f.write(log_entry.to_file_str() + '\n')
-                    except IOError as e:
-                        print(f"Erro ao escrever em {log_file}: {e}")
+                except IOError as e:
+                    print(f"Erro ao escrever em {log_file}: {e}")
 
-                log_queue.task_done()
+            if handoff is not None:
+                handoff.append(log_entry)
+            if self.history is not None:
+                self.history.add_many([log_entry.to_history_row(category_name.lower())])
+            log_queue.task_done()
 
+        while not self._stop_event.is_set():
+            try:
+                write_entry(log_queue.get(timeout=0.5))
             except queue.Empty:
                 continue
             except Exception as e:
                 print(f"Erro na thread escritora FCFS ({category_name}): {e}")
 
+        # parada: grava o que as checagens já entregaram
+        for log_entry in _drain(log_queue):
+            write_entry(log_entry)
         print(f"Parando thread escritora FCFS para: {category_name}")
 
 
+    def _batched_log_writer(self, log_queue, log_file, file_lock, category_name, handoff=None):
+        print(f"Iniciando thread escritora em lote para: {category_name}")
+        writer = BatchedLogWriter(
+            log_file,
+            file_lock,
+            flush_every=LOG_FLUSH_EVERY,
+            flush_interval=LOG_FLUSH_INTERVAL_MS / 1000,
+            fsync=LOG_FSYNC,
+        )
+        encoder = BinaryLogEncoder() if LOG_FORMAT == "binary" else None
+
+        def write_batch(batch):
+            write_ts = time.time()
+            lines = []
+            for log_entry in batch:
+                log_entry.fcfs_write_ts = write_ts
+                if encoder is not None:
+                    lines.append(log_entry.to_binary(encoder))
+                else:
+                    lines.append(log_entry.to_file_str() + '\n')
+            try:
+                try:
+                    writer.append(lines)
+                except IOError as e:
+                    print(f"Erro ao escrever em {log_file}: {e}")
+
+                if handoff is not None:
+                    handoff.append_many(batch)
+                if self.history is not None:
+                    category = category_name.lower()
+                    self.history.add_many([log_entry.to_history_row(category) for log_entry in batch])
+            finally:
+                for _ in batch:
+                    log_queue.task_done()
+
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    timeout = writer.time_until_flush()
+                    try:
+                        batch = [log_queue.get(timeout=0.5 if timeout is None else min(timeout, 0.5))]
+                    except queue.Empty:
+                        writer.flush_if_due()
+                        continue
+
+                    while len(batch) < LOG_MAX_BATCH:
+                        try:
+                            batch.append(log_queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    write_batch(batch)
+                except Exception as e:
+                    # um erro (disco cheio, EIO, handoff) perde só este lote; a thread continua
+                    print(f"Erro na thread escritora em lote ({category_name}): {e}")
+
+            # parada: o que ainda está na fila entra no flush final do close()
+            try:
+                write_batch(list(_drain(log_queue)))
+            except Exception as e:
+                print(f"Erro na thread escritora em lote ({category_name}): {e}")
+        finally:
+            try:
+                writer.close()
+            except IOError as e:
+                print(f"Erro ao fechar {log_file}: {e}")
+
+        print(f"Parando thread escritora em lote para: {category_name} ({writer.entries_written} entradas em {writer.batches_written} lotes)")
+
+
     def _priority_scheduler(self):
         """
         Função alvo para a thread do agendador prioritário.
-        Periodicamente lê logs dos arquivos de status baseado em prioridade,
+        Periodicamente consome os logs de status baseado em prioridade,
         calcula tempo de espera, e escreve no log geral.
         """
         while not self._stop_event.is_set():
@@ -189,102 +529,151 @@ class SiteManager:
                 self._stop_event.wait(PRIORITY_SCHEDULER_INTERVAL)
                 if self._stop_event.is_set(): break
 
+                self._priority_cycle()
 
-                processed_logs = []
-
-                self.current_run_stats = {
-                    "success": {"total_wait": 0, "count": 0},
-                    "warning": {"total_wait": 0, "count": 0},
-                    "error": {"total_wait": 0, "count": 0},
-                }
+            except Exception as e:
+                print(f"Erro no loop do Agendador Prioritário: {e}")
+                time.sleep(1)
 
-                log_sources = [
-                    ("error", ERROR_LOG_FILE, self.error_lock),
-                    ("warning", WARNING_LOG_FILE, self.warning_lock),
-                    ("success", SUCCESS_LOG_FILE, self.success_lock),
-                ]
+    def _read_and_truncate(self, log_file, file_lock):
+        entries = []
+        lock_hold = 0.0
+        with file_lock:
+            t_locked = time.perf_counter()
+            try:
+                if not os.path.exists(log_file):
+                    return entries, 0.0
+
+                if LOG_FORMAT == "binary":
+                    with open(log_file, 'r+b') as f:
+                        data = f.read()
+                        f.seek(0)
+                        f.truncate()
+
+                    decoder = self._binary_decoders.setdefault(log_file, BinaryLogDecoder())
+                    entries = [LogEntry.from_record(record) for record in decoder.feed(data)]
+                else:
+                    with open(log_file, 'r+') as f:
+                        lines = f.readlines()
+                        f.seek(0)
+                        f.truncate()
+
+                        for line in lines:
+                            log_entry = LogEntry.from_file_str(line)
+                            if log_entry:
+                                entries.append(log_entry)
 
-                for category, log_file, file_lock in log_sources:
-                    lines_to_keep = []
-                    processed_category_logs = []
+            except IOError as e:
+                print(f"Erro de I/O ao acessar {log_file}: {e}")
+            except Exception as e:
+                print(f"Erro inesperado ao processar {log_file}: {e}")
+            lock_hold = time.perf_counter() - t_locked
+        return entries, lock_hold
 
-                    with file_lock:
-                        try:
-                            if not os.path.exists(log_file):
-                                continue
+    def _priority_cycle(self):
+        t_cycle_start = time.perf_counter()
+        processed_logs = []
+        max_lock_hold = 0.0
 
-                            with open(log_file, 'r+') as f:
-                                lines = f.readlines()
-                                f.seek(0)
-                                f.truncate()
+        self.current_run_stats = {
+            "success": {"total_wait": 0, "count": 0},
+            "warning": {"total_wait": 0, "count": 0},
+            "error": {"total_wait": 0, "count": 0},
+        }
 
-                                processing_time = datetime.datetime.now()
+        log_sources = [
+            ("error", ERROR_LOG_FILE, self.error_lock),
+            ("warning", WARNING_LOG_FILE, self.warning_lock),
+            ("success", SUCCESS_LOG_FILE, self.success_lock),
+        ]
 
-                                for line in lines:
-                                    log_entry = LogEntry.from_file_str(line)
-                                    if log_entry:
-                                        log_entry.priority_process_time = processing_time
-                                        wait_time = (log_entry.priority_process_time - log_entry.arrival_time).total_seconds()
+        for category, log_file, file_lock in log_sources:
+            if HANDOFF_MODE == "segments":
+                handoff = self.handoffs[category]
+                entries, self.handoff_offsets[category] = handoff.read_since(self.handoff_offsets[category])
+                lock_hold = handoff.last_read_lock_hold
+            else:
+                entries, lock_hold = self._read_and_truncate(log_file, file_lock)
+            max_lock_hold = max(max_lock_hold, lock_hold)
 
-                                        self.current_run_stats[category]["total_wait"] += wait_time
-                                        self.current_run_stats[category]["count"] += 1
+            processing_ts = time.time()
+            for log_entry in entries:
+                log_entry.priority_process_ts = processing_ts
+                wait_time = processing_ts - log_entry.arrival_ts
 
-                                        self.overall_stats[category]["total_wait"] += wait_time
-                                        self.overall_stats[category]["count"] += 1
+                self.current_run_stats[category]["total_wait"] += wait_time
+                self.current_run_stats[category]["count"] += 1
 
-                                        processed_category_logs.append(log_entry)
-                                    else:
-                                        lines_to_keep.append(line)
+                self.overall_stats[category]["total_wait"] += wait_time
+                self.overall_stats[category]["count"] += 1
 
-                        except IOError as e:
-                            print(f"Erro de I/O ao acessar {log_file}: {e}")
-                        except Exception as e:
-                            print(f"Erro inesperado ao processar {log_file}: {e}")
+                self.latency.record("wait", wait_time, site=log_entry.site, category=category)
 
-                    processed_logs.extend(processed_category_logs)
-                   
+            processed_logs.extend(entries)
 
-                if processed_logs:
-                    with self.general_lock:
-                        try:
-                            with open(GENERAL_LOG_FILE, 'a') as f:
-                                for log in processed_logs:
-                                    f.write(str(log) + '\n')
-                        except IOError as e:
-                            print(f"Erro ao escrever em {GENERAL_LOG_FILE}: {e}")
-
-                for category in self.avg_waiting_times_last_cycle:
-                    count = self.current_run_stats[category]["count"]
-                    total_wait = self.current_run_stats[category]["total_wait"]
-                    if count > 0:
-                        self.avg_waiting_times_last_cycle[category] = total_wait / count
-                    else:
-                        self.avg_waiting_times_last_cycle[category] = 0
+        if processed_logs:
+            with self.general_lock:
+                try:
+                    written = 0
+                    with open(GENERAL_LOG_FILE, 'ab') as f:
+                        for log in processed_logs:
+                            line = (str(log) + '\n').encode('utf-8')
+                            written += f.write(line)
+                            self.general_index.add(log.arrival_ts, log.site, len(line))
+                    if self.general_rotator.note_write(written):
+                        self.general_index.reset()
+                except IOError as e:
+                    print(f"Erro ao escrever em {GENERAL_LOG_FILE}: {e}")
+
+        for category in self.avg_waiting_times_last_cycle:
+            count = self.current_run_stats[category]["count"]
+            total_wait = self.current_run_stats[category]["total_wait"]
+            if count > 0:
+                self.avg_waiting_times_last_cycle[category] = total_wait / count
+            else:
+                self.avg_waiting_times_last_cycle[category] = 0
 
-                for category in self.avg_waiting_times_overall:
-                    count = self.overall_stats[category]["count"]
-                    total_wait = self.overall_stats[category]["total_wait"]
-                    if count > 0:
-                        self.avg_waiting_times_overall[category] = total_wait / count
-                    else:
-                        self.avg_waiting_times_overall[category] = 0
+        for category in self.avg_waiting_times_overall:
+            count = self.overall_stats[category]["count"]
+            total_wait = self.overall_stats[category]["total_wait"]
+            if count > 0:
+                self.avg_waiting_times_overall[category] = total_wait / count
+            else:
+                self.avg_waiting_times_overall[category] = 0
 
-            except Exception as e:
-                print(f"Erro no loop do Agendador Prioritário: {e}")
-                time.sleep(1)
+        self.priority_cycle_stats = {
+            "cycle_seconds": time.perf_counter() - t_cycle_start,
+            "entries": len(processed_logs),
+            "lock_hold_seconds": max_lock_hold,
+        }
 
 
 
-    def run_checks(self, num_threads=4):
+    def run_checks(self, num_threads=4, engine=CHECK_ENGINE, processes=CHECK_PROCESSES):
         self.threads = []
-
+        processes = processes or os.cpu_count() or 1
+        if processes > 1:
+            # fork antes de existir qualquer thread no pai
+            self.shard_pool = ShardPool(
+                self.sites,
+                processes,
+                _run_shard,
+                args=(self.check_intervals, self.probe_methods, math.ceil(num_threads / processes), engine),
+            )
+            self.shard_pool.start()
+
+        if HISTORY_DB is not None:
+            self.history = HistoryStore(HISTORY_DB, retention=HISTORY_RETENTION)
+
+        use_segments = HANDOFF_MODE == "segments"
         writer_threads_config = [
-            (self.success_queue, SUCCESS_LOG_FILE, self.success_lock, "Success"),
-            (self.warning_queue, WARNING_LOG_FILE, self.warning_lock, "Warning"),
-            (self.error_queue, ERROR_LOG_FILE, self.error_lock, "Error"),
+            (self.success_queue, SUCCESS_LOG_FILE, self.success_lock, "Success", self.handoffs["success"] if use_segments else None),
+            (self.warning_queue, WARNING_LOG_FILE, self.warning_lock, "Warning", self.handoffs["warning"] if use_segments else None),
+            (self.error_queue, ERROR_LOG_FILE, self.error_lock, "Error", self.handoffs["error"] if use_segments else None),
         ]
-        for q, f, lock, name in writer_threads_config:
-            thread = threading.Thread(target=self._fcfs_log_writer, args=(q, f, lock, name), daemon=True)
+        writer_target = self._batched_log_writer if LOG_WRITER_MODE == "batched" else self._fcfs_log_writer
+        for q, f, lock, name, handoff in writer_threads_config:
+            thread = threading.Thread(target=writer_target, args=(q, f, lock, name, handoff), daemon=True)
             thread.start()
             self.threads.append(thread)
 
@@ -292,66 +681,301 @@ class SiteManager:
         scheduler_thread.start()
         self.threads.append(scheduler_thread)
 
-        with ThreadPoolExecutor(max_workers=num_threads) as executor:
-            print(f"Iniciando verificações de site com {num_threads} threads worker...")
-            while not self._stop_event.is_set():
-                futures = [executor.submit(self.check_status, site) for site in self.sites]
+        if METRICS_PORT is not None:
+            self.metrics = MetricsEndpoint(
+                self._collect_metrics, host=METRICS_HOST, port=METRICS_PORT, refresh=METRICS_REFRESH_SECONDS
+            )
+            self.metrics.start()
+            print(f"Métricas Prometheus em {self.metrics.url}")
 
-                wait_interval = 2.0
-                self._stop_event.wait(wait_interval)
+        try:
+            if self.shard_pool is not None:
+                print(f"Iniciando verificações de site em {len(self.shard_pool.shards)} processos ({engine})...")
+                self._shard_loop()
+            else:
+                self._run_engine(num_threads, engine, self.check_status, self.check_status_async)
+        finally:
+            if self.metrics is not None:
+                self.metrics.stop()
+            self.status_table.close()
+
+    def run_shard(self, num_threads, engine, stop_event):
+        """Laço de checagem de um processo filho (ver _run_shard)."""
+        self._stop_event = stop_event
+        self._run_engine(num_threads, engine, self._shard_check, self._shard_check_async)
+
+    def _run_engine(self, num_threads, engine, check, check_async):
+        if engine == "asyncio":
+            async_engine = AsyncCheckEngine(max_concurrency=ASYNC_MAX_CONCURRENCY)
+            async_engine.start()
+            print(f"Iniciando verificações de site com motor asyncio (até {ASYNC_MAX_CONCURRENCY} simultâneas)...")
+            try:
+                self._check_loop(async_engine.submit, check_async)
+            finally:
+                async_engine.stop()
+        else:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                print(f"Iniciando verificações de site com {num_threads} threads worker...")
+                self._check_loop(executor.submit, check)
+
+    def _shard_loop(self):
+        while not self._stop_event.is_set():
+            timeout = UPDATE_INTERVAL - (time.time() - self.last_update)
+            for shard_id, kind, item in self.shard_pool.poll(timeout):
+                if kind == "result":
+                    self._apply_result(*item)
+                else:
+                    self.shard_stats[shard_id] = item
+
+            current_time = time.time()
+            if current_time - self.last_update >= UPDATE_INTERVAL:
+                self.update_screen()
+                self.last_update = current_time
+
+    def _check_loop(self, submit, check):
+        self.dispatcher = HostDispatcher(pass_through_submit(submit), MAX_CHECKS_PER_HOST)
+        self.scheduler = SiteScheduler(self.dispatcher.submit_call, check, CHECK_INTERVAL, self.check_intervals)
+        self.dns.prefetch(self.sites, wait=True)
+        for site in self.sites:
+            self.scheduler.add(site)
 
-                current_time = time.time()
-                if current_time - self.last_update >= UPDATE_INTERVAL:
+        while not self._stop_event.is_set():
+            next_due_in = self.scheduler.run_pending()
+
+            current_time = time.time()
+            if current_time - self.last_update >= UPDATE_INTERVAL:
+                self.dns.prefetch(self.sites)
+                if self.shard is not None:
+                    self.shard.send_stats(self._shard_snapshot())
+                else:
                     self.update_screen()
-                    self.last_update = current_time
+                self.last_update = current_time
+
+            next_screen_in = UPDATE_INTERVAL - (time.time() - self.last_update)
+            timeout = next_screen_in if next_due_in is None else min(next_due_in, next_screen_in)
+            self.scheduler.wait(max(0.0, timeout))
 
     def stop(self):
         print("\nEnviando sinal de parada para as threads...")
         self._stop_event.set()
+        if self.scheduler is not None:
+            self.scheduler.wakeup()
+        if self.shard_pool is not None:
+            self.shard_pool.stop()
+        self.http.close()
+        # as escritoras gravam o que restou na fila e fazem o flush/fsync final
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+        for thread in self.threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                print(f"Thread {thread.name} não terminou em {SHUTDOWN_TIMEOUT:.0f}s")
+        if self.history is not None:
+            self.history.close()
+
+    def _shard_snapshot(self):
+        return {
+            "http": self.http.stats.snapshot(),
+            "dns": self.dns.stats(),
+            "adaptive": self.adaptive.stats(),
+            "lag": self.scheduler.lag_stats(),
+        }
+
+    def _collect_metrics(self, out):
+        """Métricas do endpoint Prometheus; roda na thread de fundo do MetricsEndpoint."""
+        rows = self.status_table.snapshot()
+        out.family("site_monitor_up", "gauge", "1 se a última checagem do site respondeu 2xx.")
+        for site, row in rows:
+            out.sample("site_monitor_up", isinstance(row.status, int) and 200 <= row.status < 300, {"site": site})
+        out.family("site_monitor_status", "gauge", "Último status do site (código HTTP ou tipo de falha) no rótulo status.")
+        for site, row in rows:
+            out.sample("site_monitor_status", 1, {"site": site, "status": row.status})
+        out.family("site_monitor_last_check_timestamp_seconds", "gauge", "Fim da última checagem do site.")
+        for site, row in rows:
+            if row.checked_at:
+                out.sample("site_monitor_last_check_timestamp_seconds", row.checked_at, {"site": site})
+        out.family("site_monitor_last_latency_seconds", "gauge", "Tempo de resposta HTTP da última checagem do site.")
+        for site, row in rows:
+            if not math.isnan(row.latency):
+                out.sample("site_monitor_last_latency_seconds", row.latency, {"site": site})
+
+        out.family("site_monitor_site_latency_seconds", "summary", "Quantis do tempo de resposta HTTP por site.")
+        for site, sketch in self.latency.sketches("http", scope="sites").items():
+            for q in QUANTILES:
+                out.sample("site_monitor_site_latency_seconds", sketch.quantile(q), {"site": site, "quantile": q})
+            out.sample("site_monitor_site_latency_seconds_sum", sketch.total, {"site": site})
+            out.sample("site_monitor_site_latency_seconds_count", sketch.count, {"site": site})
+        out.family("site_monitor_http_latency_seconds", "histogram", "Tempo de resposta HTTP por categoria.")
+        for category, sketch in self.latency.sketches("http").items():
+            out.histogram("site_monitor_http_latency_seconds", sketch, {"category": category})
+        out.family("site_monitor_phase_seconds", "histogram", "Tempo de cada fase das checagens por categoria.")
+        for phase in PHASES:
+            for category, sketch in self.latency.sketches(phase).items():
+                out.histogram("site_monitor_phase_seconds", sketch, {"phase": phase, "category": category})
+
+        out.family("site_monitor_log_queue_depth", "gauge", "Entradas esperando a thread escritora de cada categoria.")
+        for name, log_queue in (
+            ("success_queue", self.success_queue), ("warning_queue", self.warning_queue), ("error_queue", self.error_queue)
+        ):
+            out.sample("site_monitor_log_queue_depth", log_queue.qsize(), {"queue": name})
+
+        out.family("site_monitor_scheduler_wait_seconds", "histogram", "Espera entre a checagem e o agendador prioritário.")
+        for category, sketch in self.latency.sketches("wait").items():
+            out.histogram("site_monitor_scheduler_wait_seconds", sketch, {"category": category})
+        out.family("site_monitor_scheduler_wait_avg_seconds", "gauge", "Espera média até o agendador prioritário.")
+        for category in ("success", "warning", "error"):
+            out.sample("site_monitor_scheduler_wait_avg_seconds", self.avg_waiting_times_last_cycle[category], {"category": category, "window": "cycle"})
+            out.sample("site_monitor_scheduler_wait_avg_seconds", self.avg_waiting_times_overall[category], {"category": category, "window": "overall"})
+        out.family("site_monitor_scheduler_processed_total", "counter", "Entradas processadas pelo agendador prioritário.")
+        for category in ("success", "warning", "error"):
+            out.sample("site_monitor_scheduler_processed_total", self.overall_stats[category]["count"], {"category": category})
+        cycle = self.priority_cycle_stats
+        out.family("site_monitor_priority_cycle_seconds", "gauge", "Duração do último ciclo do agendador prioritário.")
+        out.sample("site_monitor_priority_cycle_seconds", cycle["cycle_seconds"])
+
+        if self.scheduler is not None:
+            lag = self.scheduler.lag_stats()
+        else:
+            lag = merge_stats(list(self.shard_stats.values())).get("lag", {})
+        if lag:
+            out.family("site_monitor_check_lag_seconds", "gauge", "Atraso entre o horário previsto e o disparo das checagens.")
+            for stat in ("recent_lag", "avg_lag", "max_lag"):
+                out.sample("site_monitor_check_lag_seconds", lag.get(stat, 0.0), {"stat": stat[:-4]})
+            out.family("site_monitor_checks_dispatched_total", "counter", "Checagens disparadas pelo agendador.")
+            out.sample("site_monitor_checks_dispatched_total", lag.get("dispatched", 0))
+            out.family("site_monitor_checks_in_flight", "gauge", "Checagens em andamento.")
+            out.sample("site_monitor_checks_in_flight", lag.get("in_flight", 0))
+
+    def _format_shard_stats(self):
+        merged = merge_stats(self.shard_stats.values())
+        http, dns = merged.get("http", {}), merged.get("dns", {})
+        adaptive, lag = merged.get("adaptive", {}), merged.get("lag", {})
+        return [
+            f"Processos: {self.shard_pool.alive()}/{len(self.shard_pool.shards)} shards | "
+            f"{lag.get('dispatched', 0)} checagens, {lag.get('in_flight', 0)} em andamento | "
+            f"{self.shard_pool.items} itens recebidos em {self.shard_pool.batches} lotes",
+            f"- Conexões HTTP: {http.get('new_connections', 0)} novas, {http.get('reused_requests', 0)} reutilizadas | "
+            f"DNS: {dns.get('avoided', 0)}/{dns.get('lookups', 0)} consultas evitadas | "
+            f"intervalos adaptativos: ~{adaptive.get('saved', 0):.0f} checagens economizadas",
+        ]
 
 
+    def _site_category(self, item):
+        status = item[1].status
+        if isinstance(status, int) and 200 <= status < 300:
+            return "ok"
+        if status in ["Timeout", "Conn Error", "Req Error"] or (isinstance(status, int) and 500 <= status < 600):
+            return "erro"
+        if isinstance(status, int) and 400 <= status < 500:
+            return "aviso"
+        return "pendente"
+
+    def _format_site_row(self, item):
+        site, row = item
+        status = row.status
+        if isinstance(status, int) and 200 <= status < 300:
+            status_str = f"\033[92m{status}\033[0m"
+        elif status in ["Timeout", "Conn Error", "Req Error"] or (isinstance(status, int) and 500 <= status < 600):
+            status_str = f"\033[91m{status}\033[0m"
+        elif isinstance(status, int) and 400 <= status < 500:
+            status_str = f"\033[93m{status}\033[0m"
+        else:
+            status_str = f"\033[94m{status}\033[0m"
+        if status in ["Timeout", "Conn Error", "Req Error"]:
+            # falhas não têm latência HTTP: mostra até onde a checagem chegou
+            return f"- {site:<35}: {status_str:<18} ({row.message}) [{format_phases(self.status_table.phases(site))}]"
+        return f"- {site:<35}: {status_str:<18} ({row.message}) {format_compact(self.latency.summary('http', site=site))}"
+
     def update_screen(self):
-        os.system("cls" if os.name == "nt" else "clear")
-        print("-" * 70)
-        print("          Monitor de Site com Simulação de Log")
-        print("-" * 70)
-        print(f"Diretório de Logs: {LOG_DIR}")
-        print("-" * 70)
-
-        print("Status dos Sites:")
-        for site, data in self.status_dict.items():
-            status = data["status"]
-            message = data["message"]
-
-            if isinstance(status, int) and 200 <= status < 300:
-                status_str = f"\033[92m{status}\033[0m"
-            elif status in ["Timeout", "Conn Error", "Req Error"] or (isinstance(status, int) and 500 <= status < 600):
-                status_str = f"\033[91m{status}\033[0m"
-            elif isinstance(status, int) and 400 <= status < 500:
-                status_str = f"\033[93m{status}\033[0m"
-            else:
-                status_str = f"\033[94m{status}\033[0m"
+        self.screen.begin_frame()
+        header = [
+            "-" * 70,
+            "          Monitor de Site com Simulação de Log",
+            "-" * 70,
+            f"Diretório de Logs: {LOG_DIR}",
+        ]
+        if self.status_table.name:
+            header.append(f"Tabela de status compartilhada: {self.status_table.name}")
+        header += [
+            "-" * 70,
+            "Status dos Sites:",
+        ]
 
-            print(f"- {site:<35}: {status_str:<18} ({message})")
+        footer = ["-" * 70]
+        footer.append("Tempo Médio de Espera no Agendamento Prioritário (último ciclo | geral):")
+        for category, label in (("error", "Erros   "), ("warning", "Avisos  "), ("success", "Sucesso ")):
+            footer.append(
+                f"- {label}: {self.avg_waiting_times_last_cycle[category]:.3f}s ({self.current_run_stats[category]['count']} no ciclo) | "
+                f"{self.avg_waiting_times_overall[category]:.3f}s ({self.overall_stats[category]['count']} no total)"
+            )
+
+        # estatísticas por subsistema, da mais útil para a menos: só entram as que cabem no terminal
+        details = ["-" * 70, "Percentis (HTTP | espera até o agendador prioritário):"]
+        for category, label in (("error", "Erros   "), ("warning", "Avisos  "), ("success", "Sucesso ")):
+            details.append(f"- {label}: HTTP {format_summary(self.latency.summary('http', category=category))}")
+            details.append(f"  {'':<8}  Espera {format_summary(self.latency.summary('wait', category=category))}")
+            details.append(f"  {'':<8}  {format_phase_breakdown(self.latency, category)}")
+
+        cycle = self.priority_cycle_stats
+        details.append(
+            f"Ciclo do agendador prioritário ({HANDOFF_MODE}): {cycle['cycle_seconds'] * 1000:.1f}ms "
+            f"para {cycle['entries']} entradas | lock {cycle['lock_hold_seconds'] * 1000:.3f}ms"
+        )
+
+        details.append("-" * 70)
+        if self.shard_pool is not None:
+            details.extend(self._format_shard_stats())
+        if self.scheduler is not None:
+            lag = self.scheduler.lag_stats()
+            details.append(
+                f"Agendador: {lag['in_flight']} em andamento, {lag['overruns']} checagens além do intervalo | "
+                f"atraso recente {lag['recent_lag'] * 1000:.1f}ms, médio {lag['avg_lag'] * 1000:.1f}ms, máx {lag['max_lag'] * 1000:.1f}ms"
+            )
+        if self.shard_pool is None:
+            if ADAPTIVE_INTERVALS:
+                details.append(self.adaptive.format_stats())
+            details.append(self.http.format_stats())
+            details.append(self.dns.format_stats())
+        if self.dispatcher is not None:
+            details.append(self.dispatcher.format_stats())
+        if self.general_rotator is not None and self.general_rotator.rotations:
+            details.append(self.general_rotator.format_stats())
+        if self.history is not None:
+            details.append(self.history.format_stats())
+        if self.metrics is not None:
+            details.append(self.metrics.format_stats())
+        details.append(self.screen.format_stats())
+
+        tail = [
+            "-" * 70,
+            f"Última atualização da tela: {time.strftime('%H:%M:%S')}",
+            "Pressione Ctrl+C para sair.",
+            "-" * 70,
+        ]
+        footer += self.screen.fit_details(len(header) + len(footer) + len(tail), details) + tail
 
-        print("-" * 70)
+        items = self.status_table.snapshot()
+        visible, overflow_line = self.screen.select_rows(
+            items, self.screen.rows_available(len(header) + len(footer)), category=self._site_category
+        )
+        lines = header + [self._format_site_row(item) for item in visible]
+        if overflow_line:
+            lines.append(overflow_line)
+        self.screen.render(lines + footer, pinned=len(tail))
 
-        print("Tempo Médio de Espera (Agendamento Prioritário - Último Ciclo):")
-        print(f"- Erros   : {self.avg_waiting_times_last_cycle['error']:.3f}s (Processados no ciclo: {self.current_run_stats['error']['count']})")
-        print(f"- Avisos  : {self.avg_waiting_times_last_cycle['warning']:.3f}s (Processados no ciclo: {self.current_run_stats['warning']['count']})")
-        print(f"- Sucesso : {self.avg_waiting_times_last_cycle['success']:.3f}s (Processados no ciclo: {self.current_run_stats['success']['count']})")
 
-        print("-" * 70)
+def _drain(log_queue):
+    """Entradas que já estão na fila, sem esperar por novas."""
+    while True:
+        try:
+            yield log_queue.get_nowait()
+        except queue.Empty:
+            return
 
-        print("Tempo Médio de Espera (Agendamento Prioritário - Geral):")
-        print(f"- Erros   : {self.avg_waiting_times_overall['error']:.3f}s (Total processado: {self.overall_stats['error']['count']})")
-        print(f"- Avisos  : {self.avg_waiting_times_overall['warning']:.3f}s (Total processado: {self.overall_stats['warning']['count']})")
-        print(f"- Sucesso : {self.avg_waiting_times_overall['success']:.3f}s (Total processado: {self.overall_stats['success']['count']})")
 
-        print("-" * 70)
-        print(f"Última atualização da tela: {time.strftime('%H:%M:%S')}")
-        print("Pressione Ctrl+C para sair.")
-        print("-" * 70)
+def _run_shard(shard_id, sites, channel, stop_event, check_intervals, probe_methods, num_threads, engine):
+    """Alvo dos processos filhos do ShardPool: checa só os sites do shard."""
+    manager = SiteManager(sites, check_intervals=check_intervals, probe_methods=probe_methods, shard=channel)
+    manager.run_shard(num_threads, engine, stop_event)
 
 
 if __name__ == "__main__":
@@ -371,11 +995,20 @@ if __name__ == "__main__":
         "http://httpbin.org/delay/4"
     ]
 
-    manager = SiteManager(sites_to_check)
+    check_intervals = {
+        "https://httpbin.org/delay/3": 5.0,
+        "http://httpbin.org/delay/4": 6.0,
+    }
+
+    probe_methods = {
+        "https://www.google.com": "head",
+    }
+
+    manager = SiteManager(sites_to_check, check_intervals=check_intervals, probe_methods=probe_methods)
 
     try:
         num_workers = len(sites_to_check)
-        manager.run_checks(num_threads=num_workers)
+        manager.run_checks(num_threads=num_workers, engine=CHECK_ENGINE)
     except KeyboardInterrupt:
         print("\nCtrl+C detectado. Iniciando desligamento...")
         manager.stop()
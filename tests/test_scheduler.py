@@ -0,0 +1,64 @@
+import threading
+
+from monitor.host_dispatch import HostDispatcher
+from monitor.scheduler import SiteScheduler
+
+SITE = "https://httpbin.org/status/200"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _LoopOnWakeup(threading.Event):
+    """Roda o laço do agendador no instante em que _complete o acorda (antes do despacho liberar a chave)."""
+
+    def __init__(self):
+        super().__init__()
+        self.scheduler = None
+
+    def set(self):
+        super().set()
+        if self.scheduler is not None:
+            self.scheduler.run_pending()
+
+
+def _setup(interval):
+    jobs = []
+    dispatcher = HostDispatcher(lambda key, fn, *args, priority=0: jobs.append((fn, args)), max_per_host=None)
+    clock = _Clock()
+    checks = []
+    scheduler = SiteScheduler(dispatcher.submit_call, checks.append, interval, clock=clock)
+    scheduler.add(SITE)
+    return jobs, dispatcher, clock, checks, scheduler
+
+
+def _run_jobs(jobs):
+    while jobs:
+        fn, args = jobs.pop(0)
+        fn(*args)
+
+
+def test_site_refused_by_dispatcher_goes_back_to_heap():
+    jobs, dispatcher, clock, checks, scheduler = _setup(interval=0)
+    scheduler._wakeup = wakeup = _LoopOnWakeup()
+    scheduler.run_pending()
+    wakeup.scheduler = scheduler
+    _run_jobs(jobs)
+    wakeup.scheduler = None
+
+    stats = scheduler.lag_stats()
+    assert checks == [SITE]
+    assert stats["in_flight"] == 0 and stats["scheduled"] == 1
+    assert stats["refused"] == 1
+    assert dispatcher.in_flight() == 0
+
+    # a chave já foi liberada: o próximo ciclo do laço despacha o site de novo
+    scheduler.run_pending()
+    _run_jobs(jobs)
+    assert checks == [SITE, SITE]
+
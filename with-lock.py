@@ -3,7 +3,30 @@ import threading
 import queue
 from concurrent.futures import ThreadPoolExecutor
 import time
-import os
+
+from monitor.adaptive import AdaptiveIntervals
+from monitor.dns_cache import DnsCache
+from monitor.http_pool import SessionPool
+from monitor.result_loop import drain_results, next_deadline
+from monitor.screen import ScreenRenderer
+
+CYCLE_INTERVAL = 0.5
+
+# Sites estáveis saem do ciclo de 0.5s e passam a ser checados a cada 1, 2,
+# 4... segundos até ADAPTIVE_MAX_INTERVAL; qualquer mudança volta para 0.5s.
+ADAPTIVE_INTERVALS = True
+ADAPTIVE_BASE_INTERVAL = CYCLE_INTERVAL
+ADAPTIVE_MAX_INTERVAL = 30.0
+
+PROBE_METHOD = "stream"
+PROBE_MAX_BYTES = 0
+PROBE_METHODS = {
+    "https://www.uuidtools.com/api/generate/v2": "get",
+    "https://www.uuidtools.com/api/generate/v4": "get",
+}
+
+DNS_CACHE_TTL = 300.0
+DNS_NEGATIVE_TTL = 30.0
 
 
 class SiteManager:
@@ -13,10 +36,16 @@ class SiteManager:
         self.lock = threading.Lock()
         self.status_dict = {}
         self.last_update = 0
+        self.dns = DnsCache(ttl=DNS_CACHE_TTL, negative_ttl=DNS_NEGATIVE_TTL)
+        self.http = SessionPool(dns_cache=self.dns)
+        self.screen = ScreenRenderer()
+        self.adaptive = AdaptiveIntervals(ADAPTIVE_BASE_INTERVAL, ADAPTIVE_MAX_INTERVAL)
 
     def check_status(self, site):
         try:
-            response = requests.get(site, timeout=5)
+            response = self.http.probe(
+                site, PROBE_METHODS.get(site, PROBE_METHOD), timeout=5, max_bytes=PROBE_MAX_BYTES
+            )
             status = response.status_code
             if 200 <= status < 300:
                 if site == "https://www.uuidtools.com/api/generate/v2":
@@ -39,6 +68,11 @@ class SiteManager:
         except requests.exceptions.RequestException as e:
             message = f"Connection Error "
             status = -1
+            elapsed = None
+        else:
+            elapsed = response.elapsed.total_seconds()
+        if ADAPTIVE_INTERVALS:
+            self.adaptive.observe(site, status, elapsed)
 
         with self.lock:
             self.results.put((site, status, message))
@@ -47,52 +81,72 @@ class SiteManager:
         with ThreadPoolExecutor(max_workers=num_threads) as executor:
             for site in self.sites:
                 self.status_dict[site] = {"status": "Checking...", "message": ""}
+            self.dns.prefetch(self.sites, wait=True)
 
+            next_cycle = time.time()
+            screen_dirty = True
             while True:
-                with self.lock:
-                    self.results = queue.Queue()
-
-                for site in self.sites:
-                    executor.submit(self.check_status, site)
-
-                time.sleep(0.5)
-
-                with self.lock:
-                    while not self.results.empty():
-                        site, status, message = self.results.get()
-                        self.status_dict[site] = {
-                            "status": status,
-                            "message": message,
-                        }
-
-                if time.time() - self.last_update >= update_interval:
+                if time.time() >= next_cycle:
+                    with self.lock:
+                        stale, self.results = self.results, queue.Queue()
+                    if self._apply_results(drain_results(stale, 0)):
+                        screen_dirty = True
+
+                    self.dns.prefetch(self.sites)
+                    for site in self.sites:
+                        if not ADAPTIVE_INTERVALS or self.adaptive.is_due(site):
+                            executor.submit(self.check_status, site)
+                    next_cycle = time.time() + CYCLE_INTERVAL
+
+                deadline = next_deadline(next_cycle, self.last_update, update_interval, screen_dirty)
+                if self._apply_results(drain_results(self.results, deadline)):
+                    screen_dirty = True
+
+                if screen_dirty and time.time() - self.last_update >= update_interval:
                     self.update_screen()
                     self.last_update = time.time()
+                    screen_dirty = False
 
-    def update_screen(self):
-        os.system("cls" if os.name == "nt" else "clear")
-        print("-" * 40)
-        print("          Site Manager")
-        print("-" * 40)
-
-        for site, data in self.status_dict.items():
-            status = data["status"]
-            message = data["message"]
-
-            if isinstance(status, int) and 200 <= status < 300:
-                status_str = f"\033[92m{status}\033[0m"
-            elif status == -1:
-                status_str = f"\033[91mError\033[0m"
-            elif isinstance(status, int) and 400 <= status < 600:
-                status_str = f"\033[93m{status}\033[0m"
-            else:
-                status_str = str(status)
-
-            print(f"- {site:<30}: {status_str:<8} ({message})")
+    def _apply_results(self, items):
+        with self.lock:
+            for site, status, message in items:
+                self.status_dict[site] = {
+                    "status": status,
+                    "message": message,
+                }
+        return len(items)
+
+    def _format_site_row(self, item):
+        site, data = item
+        status = data["status"]
+        if isinstance(status, int) and 200 <= status < 300:
+            status_str = f"\033[92m{status}\033[0m"
+        elif status == -1:
+            status_str = f"\033[91mError\033[0m"
+        elif isinstance(status, int) and 400 <= status < 600:
+            status_str = f"\033[93m{status}\033[0m"
+        else:
+            status_str = str(status)
+        return f"- {site:<30}: {status_str:<8} ({data['message']})"
 
-        print("-" * 40)
-        print(f"Last update: {time.strftime('%H:%M:%S')}")
-        print("Press Ctrl+C to exit.")
+    def update_screen(self):
+        self.screen.begin_frame()
+        header = ["-" * 40, "          Site Manager", "-" * 40]
+        footer = ["-" * 40, self.http.format_stats(), self.dns.format_stats()]
+        if ADAPTIVE_INTERVALS:
+            footer.append(self.adaptive.format_stats())
+        footer += [
+            self.screen.format_stats(),
+            f"Last update: {time.strftime('%H:%M:%S')}",
+            "Press Ctrl+C to exit.",
+        ]
+        visible, overflow_line = self.screen.select_rows(
+            list(self.status_dict.items()), self.screen.rows_available(len(header) + len(footer))
+        )
+        lines = header + [self._format_site_row(item) for item in visible]
+        if overflow_line:
+            lines.append(overflow_line)
+        self.screen.render(lines + footer)
 
 
 if __name__ == "__main__":
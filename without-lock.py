@@ -5,6 +5,12 @@ import time
 import os
 import threading
 
+from monitor.dns_cache import DnsCache
+from monitor.http_pool import SessionPool
+from monitor.result_loop import drain_results, next_deadline
+from monitor.rotation import LogRotator
+from monitor.screen import ScreenRenderer
+
 CUSTOM_UNSAFE_LOG_FILENAME = "logs/without_lock.txt"
 CUSTOM_LOG_DIR = os.path.dirname(CUSTOM_UNSAFE_LOG_FILENAME)
 if CUSTOM_LOG_DIR and not os.path.exists(CUSTOM_LOG_DIR):
@@ -12,6 +18,34 @@ if CUSTOM_LOG_DIR and not os.path.exists(CUSTOM_LOG_DIR):
 if os.path.exists(CUSTOM_UNSAFE_LOG_FILENAME):
     os.remove(CUSTOM_UNSAFE_LOG_FILENAME)
 
+LOG_ROTATE_MAX_BYTES = 64 * 1024 * 1024
+LOG_ROTATE_MAX_AGE = None
+LOG_ROTATE_KEEP = 10
+LOG_ROTATE_MAX_TOTAL_BYTES = None
+LOG_ROTATE_COMPRESSION = "gzip"
+
+LOG_ROTATOR = LogRotator(
+    CUSTOM_UNSAFE_LOG_FILENAME,
+    max_bytes=LOG_ROTATE_MAX_BYTES,
+    max_age=LOG_ROTATE_MAX_AGE,
+    keep=LOG_ROTATE_KEEP,
+    max_total_bytes=LOG_ROTATE_MAX_TOTAL_BYTES,
+    compression=LOG_ROTATE_COMPRESSION,
+)
+
+# Todos os sites são reenviados a cada CYCLE_INTERVAL segundos.
+CYCLE_INTERVAL = 1.0
+
+PROBE_METHOD = "stream"
+PROBE_MAX_BYTES = 0
+PROBE_METHODS = {
+    "https://www.uuidtools.com/api/generate/v2": "get",
+    "https://www.uuidtools.com/api/generate/v4": "get",
+}
+
+DNS_CACHE_TTL = 300.0
+DNS_NEGATIVE_TTL = 30.0
+
 
 class SiteManager:
     def __init__(self, sites):
@@ -19,6 +53,9 @@ class SiteManager:
         self.results = queue.Queue()
         self.status_dict = {}
         self.last_update = 0
+        self.dns = DnsCache(ttl=DNS_CACHE_TTL, negative_ttl=DNS_NEGATIVE_TTL)
+        self.http = SessionPool(dns_cache=self.dns)
+        self.screen = ScreenRenderer()
         print(
             f"TERMINAL: SiteManager (No Lock Version, No Logging Module) inicializado com {len(sites)} sites."
         )
@@ -28,9 +65,10 @@ class SiteManager:
 
         try:
             with open(CUSTOM_UNSAFE_LOG_FILENAME, "a", encoding="utf-8") as f_unsafe:
-                f_unsafe.write(
+                written = f_unsafe.write(
                     f"{time.strftime('%Y-%m-%d %H:%M:%S,%03d')} - [{thread_name}] - INICIANDO Checagem: {site}\n"
                 )
+            LOG_ROTATOR.note_write(written)
         except Exception as e_write:
             print(
                 f"TERMINAL ERRO DE ESCRITA (INÍCIO CUSTOM LOG): [{thread_name}] para {site}: {e_write}"
@@ -41,7 +79,9 @@ class SiteManager:
         http_response_time_info = ""
 
         try:
-            response = requests.get(site, timeout=5)
+            response = self.http.probe(
+                site, PROBE_METHODS.get(site, PROBE_METHOD), timeout=5, max_bytes=PROBE_MAX_BYTES
+            )
             status_val = response.status_code
             elapsed_http_time = response.elapsed.total_seconds()
             http_response_time_info = f"{elapsed_http_time:.2f}s"
@@ -80,10 +120,11 @@ class SiteManager:
 
         try:
             with open(CUSTOM_UNSAFE_LOG_FILENAME, "a", encoding="utf-8") as f_unsafe:
-                f_unsafe.write(
+                written = f_unsafe.write(
                     f"{time.strftime('%Y-%m-%d %H:%M:%S,%03d')} - [{thread_name}] - CONCLUÍDO {site} - "
                 )
-                f_unsafe.write(f"Status: {status_val} - Mensagem: {message}\n")
+                written += f_unsafe.write(f"Status: {status_val} - Mensagem: {message}\n")
+            LOG_ROTATOR.note_write(written)
         except Exception as e_write:
             print(
                 f"TERMINAL ERRO DE ESCRITA (FIM CUSTOM LOG): [{thread_name}] para {site}: {e_write}"
@@ -95,56 +136,69 @@ class SiteManager:
         with ThreadPoolExecutor(max_workers=num_threads) as executor:
             for site in self.sites:
                 self.status_dict[site] = {"status": "Checking...", "message": ""}
+            self.dns.prefetch(self.sites, wait=True)
 
+            next_cycle = time.time()
+            screen_dirty = True
             while True:
-                self.results = queue.Queue()
-
-                for site in self.sites:
-                    executor.submit(self.check_status, site)
-
-                time.sleep(0.5)
-
-                results_this_cycle = 0
-                while not self.results.empty():
-                    try:
-                        site, status_val, message = self.results.get_nowait()
-                        self.status_dict[site] = {
-                            "status": status_val,
-                            "message": message,
-                        }
-                        results_this_cycle += 1
-                        self.results.task_done()
-                    except queue.Empty:
-                        break
-
-                if time.time() - self.last_update >= update_interval:
+                if time.time() >= next_cycle:
+                    stale, self.results = self.results, queue.Queue()
+                    if self._apply_results(drain_results(stale, 0)):
+                        screen_dirty = True
+
+                    self.dns.prefetch(self.sites)
+                    for site in self.sites:
+                        executor.submit(self.check_status, site)
+                    next_cycle = time.time() + CYCLE_INTERVAL
+
+                deadline = next_deadline(next_cycle, self.last_update, update_interval, screen_dirty)
+                if self._apply_results(drain_results(self.results, deadline)):
+                    screen_dirty = True
+
+                if screen_dirty and time.time() - self.last_update >= update_interval:
                     self.update_screen()
                     self.last_update = time.time()
-
-                time.sleep(update_interval / 2 if update_interval > 0.2 else 0.1)
+                    screen_dirty = False
+
+    def _apply_results(self, items):
+        for site, status_val, message in items:
+            self.status_dict[site] = {
+                "status": status_val,
+                "message": message,
+            }
+        return len(items)
+
+    def _format_site_row(self, item):
+        site, data = item
+        status = data["status"]
+        status_str = str(status)
+        if isinstance(status, int) and 200 <= status < 300:
+            status_str = f"\033[92m{status}\033[0m"
+        elif status == -1 or status == -2 or status == -3 or status == -4:
+            status_str = f"\033[91mError ({status})\033[0m"
+        elif isinstance(status, int) and 400 <= status < 600:
+            status_str = f"\033[93m{status}\033[0m"
+        return f"- {site:<30}: {status_str:<15} ({data['message']})"
 
     def update_screen(self):
-        os.system("cls" if os.name == "nt" else "clear")
-        print("-" * 40)
-        print("          Site Manager (SEM LOCKS + UNSAFE WRITE)")
-        print("-" * 40)
-
-        for site, data in self.status_dict.items():
-            status = data["status"]
-            message = data["message"]
-            status_str = str(status)
-            if isinstance(status, int) and 200 <= status < 300:
-                status_str = f"\033[92m{status}\033[0m"
-            elif status == -1 or status == -2 or status == -3 or status == -4:
-                status_str = f"\033[91mError ({status})\033[0m"
-            elif isinstance(status, int) and 400 <= status < 600:
-                status_str = f"\033[93m{status}\033[0m"
-
-            print(f"- {site:<30}: {status_str:<15} ({message})")
-
-        print("-" * 40)
-        print(f"Last update: {time.strftime('%H:%M:%S')}")
-        print("Press Ctrl+C to exit.")
+        self.screen.begin_frame()
+        header = ["-" * 40, "          Site Manager (SEM LOCKS + UNSAFE WRITE)", "-" * 40]
+        footer = [
+            "-" * 40,
+            self.http.format_stats(),
+            self.dns.format_stats(),
+            self.screen.format_stats(),
+            *([LOG_ROTATOR.format_stats()] if LOG_ROTATOR.rotations else []),
+            f"Last update: {time.strftime('%H:%M:%S')}",
+            "Press Ctrl+C to exit.",
+        ]
+        visible, overflow_line = self.screen.select_rows(
+            list(self.status_dict.items()), self.screen.rows_available(len(header) + len(footer))
+        )
+        lines = header + [self._format_site_row(item) for item in visible]
+        if overflow_line:
+            lines.append(overflow_line)
+        self.screen.render(lines + footer)
 
 
 if __name__ == "__main__":